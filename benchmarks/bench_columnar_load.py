@@ -0,0 +1,64 @@
+"""
+Холодная загрузка и запросы к колоночному снимку вакансий (ColumnarVacancyStorage)
+в сравнении с JSON Lines.
+
+    python -m benchmarks.bench_columnar_load --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.models import Vacancy
+from src.storage import ColumnarVacancyStorage, JSONLVacancyStorage
+
+WORDS = ["Python", "Java", "Go", "Django", "PostgreSQL", "Kafka", "Docker", "Kubernetes", "React", "Ёлка"]
+
+
+def make_vacancies(rows: int):
+    for i in range(rows):
+        yield Vacancy(
+            title=f"{WORDS[i % len(WORDS)]} developer {i}",
+            link=f"https://hh.ru/vacancy/{i}",
+            salary={"from": 50_000 + i % 300_000, "to": None if i % 3 else 100_000 + i % 300_000,
+                    "currency": "USD" if i % 50 == 0 else "RUR"},
+            description=f"Разработка сервисов на {WORDS[(i * 7) % len(WORDS)]}",
+            requirements=f"{WORDS[(i * 3) % len(WORDS)]}, SQL",
+            hh_id=str(i),
+            employer_hh_id=str(i % 1000),
+        )
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<45} {time.perf_counter() - start:8.3f} с")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keyword", default="kafka")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        columnar = ColumnarVacancyStorage(os.path.join(directory, "vacancies.vcol"))
+        jsonl = JSONLVacancyStorage(os.path.join(directory, "vacancies.jsonl"))
+        vacancies = list(make_vacancies(args.rows))
+        timed("Запись снимка", lambda: columnar.add_vacancies(vacancies))
+        timed("Запись JSONL", lambda: jsonl.add_vacancies(vacancies))
+        del vacancies
+        print(f"Размер: снимок {os.path.getsize(columnar.file_path) / 2 ** 20:.1f} МБ, "
+              f"JSONL {os.path.getsize(jsonl.file_path) / 2 ** 20:.1f} МБ")
+
+        criteria = {"keyword": args.keyword, "min_salary": 200_000}
+        found = timed(f"Снимок: {criteria}", lambda: len(columnar.get_vacancies(criteria)))
+        timed("Снимок: проекция title + salary_mid", lambda: columnar.read_columns(["title", "salary_mid"], criteria))
+        timed("Снимок: статистика зарплат (get_batch)", lambda: columnar.get_batch({"currency": "USD"}).salary_stats())
+        timed(f"JSONL: {criteria}", lambda: len(jsonl.get_vacancies(criteria)))
+        print(f"Найдено вакансий: {found}")
+
+
+if __name__ == "__main__":
+    main()
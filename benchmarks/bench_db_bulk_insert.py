@@ -0,0 +1,74 @@
+"""
+Сравнение построчной и пакетной записи вакансий в PostgreSQL.
+
+Запуск (нужен локальный PostgreSQL, параметры берутся из окружения / .env):
+
+    python -m benchmarks.bench_db_bulk_insert --rows 2000 --batch-size 500
+"""
+import argparse
+import os
+import time
+
+from src.bd_sql.db import DatabaseVacancyStorage
+from src.models.vacancy import Vacancy
+
+BENCH_EMPLOYER_ID = "bench-employer"
+
+
+def make_vacancies(count: int, prefix: str):
+    return [
+        Vacancy(
+            title=f"Python developer {i}",
+            link=f"https://hh.ru/vacancy/{prefix}{i}",
+            salary={"from": 100_000 + i, "to": 150_000 + i, "currency": "RUR"},
+            description="Разработка backend-сервисов",
+            requirements="Python, PostgreSQL",
+            hh_id=f"{prefix}{i}",
+            employer_hh_id=BENCH_EMPLOYER_ID,
+        )
+        for i in range(count)
+    ]
+
+
+def cleanup(db: DatabaseVacancyStorage) -> None:
+    with db._connect() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM employers WHERE hh_id = %s", (BENCH_EMPLOYER_ID,))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = DatabaseVacancyStorage(
+        os.getenv("DB_NAME", "hh_vacancies"),
+        os.getenv("DB_USER", "postgres"),
+        os.getenv("DB_PASSWORD", ""),
+        os.getenv("DB_HOST", "127.0.0.1"),
+    )
+    cleanup(db)
+    db.add_employer({"id": BENCH_EMPLOYER_ID, "name": "Benchmark"})
+    try:
+        rows = make_vacancies(args.rows, "bench-single-")
+        start = time.perf_counter()
+        for vacancy in rows:
+            db.add_vacancy(vacancy)
+        single = time.perf_counter() - start
+
+        rows = make_vacancies(args.rows, "bench-bulk-")
+        start = time.perf_counter()
+        db.add_vacancies(rows, batch_size=args.batch_size)
+        bulk = time.perf_counter() - start
+
+        print(f"add_vacancy:   {args.rows} строк за {single:.2f} с, {args.rows / single:,.0f} строк/с")
+        print(f"add_vacancies: {args.rows} строк за {bulk:.2f} с, {args.rows / bulk:,.0f} строк/с "
+              f"(x{single / bulk:.1f})")
+    finally:
+        cleanup(db)
+
+
+if __name__ == "__main__":
+    main()
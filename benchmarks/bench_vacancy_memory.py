@@ -0,0 +1,74 @@
+"""
+Память, занимаемая вакансиями: прежнее представление (__dict__ + вложенный словарь
+зарплаты) против текущего Vacancy (__slots__ + плоская зарплата).
+
+Строки (название, ссылка, описание) у обоих представлений общие и в сравнении
+не учитываются — измеряются только сами объекты.
+
+    python -m benchmarks.bench_vacancy_memory --rows 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from src.models.vacancy import Vacancy
+
+
+class DictVacancy:
+    """Прежнее представление вакансии: атрибуты в __dict__, зарплата — словарем."""
+
+    def __init__(self, title, link, salary, description, requirements, hh_id=None, employer_hh_id=None):
+        self.title = title
+        self.link = link
+        self.salary = salary
+        self.description = description
+        self.requirements = requirements
+        self.hh_id = hh_id
+        self.employer_hh_id = employer_hh_id
+
+
+TITLE = "Python developer"
+DESCRIPTION = "Разработка backend-сервисов"
+REQUIREMENTS = "Python, PostgreSQL"
+
+
+def make_dict_vacancies(rows: int):
+    return [
+        DictVacancy(TITLE, "https://hh.ru/vacancy/", {"from": 100_000 + i, "to": 150_000, "currency": "RUR"},
+                    DESCRIPTION, REQUIREMENTS)
+        for i in range(rows)
+    ]
+
+
+def make_slot_vacancies(rows: int):
+    return [
+        Vacancy.from_row((TITLE, "https://hh.ru/vacancy/", 100_000 + i, 150_000, "RUR",
+                          DESCRIPTION, REQUIREMENTS))
+        for i in range(rows)
+    ]
+
+
+def measure(factory, rows: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    vacancies = factory(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del vacancies
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    legacy = measure(make_dict_vacancies, args.rows)
+    compact = measure(make_slot_vacancies, args.rows)
+    print(f"__dict__ + словарь зарплаты: {legacy / 2 ** 20:8.1f} МБ, {legacy / args.rows:6.0f} байт/вакансия")
+    print(f"__slots__ + плоская зарплата: {compact / 2 ** 20:8.1f} МБ, {compact / args.rows:6.0f} байт/вакансия "
+          f"({compact / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
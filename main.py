@@ -1,58 +1,28 @@
 import json
 import os
-import time
+from functools import lru_cache
 import requests
+from src.api.employers import COMPANIES, resolve_company_ids
+from src.api.http_client import get_http_client
 from src.bd_sql.db import DatabaseVacancyStorage
-from src.models.vacancy import Vacancy
+from src.bd_sql.pipeline import VacancyIngestionPipeline
+from src.bd_sql.sync_state import DatabaseSyncState
 
 # --- Константы ---
-COMPANIES = [
-    "Альфа-Банк",
-    "ВТБ",
-    "X5 Group",
-    "Газпромбанк",
-    "Газпром нефть",
-    "Яндекс",
-    "Ozon",
-    "Аэрофлот",
-    "МТС",
-    "Сбер",
-    "Иви",
-    "AGIMA",
-    "RealWeb"
-]
-BASE_URL = "https://api.hh.ru/employers"
 JSON_FILE = "company_ids.json"
 
 
 # --- Базовые функции работы с БД ---
+@lru_cache(maxsize=None)
 def get_db():
+    """Одно долгоживущее хранилище на процесс: пул соединений и проверка схемы создаются один раз"""
     return DatabaseVacancyStorage("hh_vacancies", "stayer", "1q2w3e4r5t", "127.0.0.1")
 
 
 # --- HH API методы ---
 def get_company_ids():
-    """Получает ID работодателей по именам и сохраняет в JSON"""
-    company_ids = {}
-    for company in COMPANIES:
-        try:
-            response = requests.get(BASE_URL, params={"text": company, "per_page": 1}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("items"):
-                employer = data["items"][0]
-                company_ids[company] = employer["id"]
-            else:
-                company_ids[company] = None
-            print(f"{company}: {company_ids[company]}")
-        except requests.RequestException as e:
-            print(f"Ошибка при запросе {company}: {e}")
-            company_ids[company] = None
-        time.sleep(1)
-
-    with open(JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump(company_ids, f, ensure_ascii=False, indent=4)
-    print(f"✅ Сохранено в {JSON_FILE}")
+    """Получает ID работодателей по именам (параллельно) и сохраняет в JSON"""
+    resolve_company_ids(COMPANIES, JSON_FILE)
 
 
 def save_employers_to_db():
@@ -66,12 +36,11 @@ def save_employers_to_db():
 
     companies = [int(cid) for cid in company_ids.values() if cid]
     db = get_db()
+    client = get_http_client()
 
     for emp_id in companies:
         try:
-            response = requests.get(f"https://api.hh.ru/employers/{emp_id}", timeout=10)
-            response.raise_for_status()
-            employer = response.json()
+            employer = client.get_json(f"https://api.hh.ru/employers/{emp_id}")
             db.add_employer(employer, source_id=1)
             print(f"✅ Добавлен: {employer.get('name')} (ID {emp_id})")
         except requests.RequestException as e:
@@ -80,44 +49,6 @@ def save_employers_to_db():
             print(f"Ошибка при добавлении работодателя {emp_id}: {db_error}")
 
 
-def get_vacancies_for_employer(emp_id):
-    """Получает все вакансии работодателя по API HH"""
-    vacancies = []
-    page = 0
-    while True:
-        try:
-            response = requests.get(
-                "https://api.hh.ru/vacancies",
-                params={"employer_id": emp_id, "page": page, "per_page": 100},
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            for item in data.get("items", []):
-                vacancy = Vacancy(
-                    hh_id=item.get("id"),
-                    title=item.get("name"),
-                    link=item.get("alternate_url"),
-                    salary=item.get("salary"),
-                    description=item.get("snippet", {}).get("responsibility", ""),
-                    requirements=item.get("snippet", {}).get("requirement", ""),
-                    employer_hh_id=item.get("employer", {}).get("id")  # ✅ добавлено
-                )
-                vacancies.append(vacancy)
-
-            if page >= data.get("pages", 1) - 1:
-                break
-            page += 1
-            time.sleep(0.3)  # Пауза для API
-
-        except requests.RequestException as e:
-            print(f"Ошибка при загрузке вакансий для {emp_id}: {e}")
-            break
-
-    return vacancies
-
-
 def save_vacancies_by_multiple_companies():
     """Добавляет вакансии в БД для выбранных или всех компаний из JSON"""
     if not os.path.exists(JSON_FILE):
@@ -146,9 +77,7 @@ def save_vacancies_by_multiple_companies():
         print("Неверный ввод!")
         return
 
-    db = get_db()
-    total_vacancies = 0
-
+    employer_ids = []
     for idx in selected_indexes:
         if idx < 1 or idx > len(company_list):
             print(f"Пропущен неверный номер: {idx}")
@@ -156,23 +85,27 @@ def save_vacancies_by_multiple_companies():
 
         selected_company = company_list[idx - 1]
         emp_id = companies[selected_company]
-        print(f"\n▶ Загружаем вакансии для {selected_company} (ID {emp_id})")
-
-        vacancies = get_vacancies_for_employer(emp_id)
-        print(f"   Найдено вакансий: {len(vacancies)}")
-
-        count = 0
-        for vac in vacancies:
-            try:
-                db.add_vacancy(vac)
-                count += 1
-            except Exception as e:
-                print(f"   ❌ Ошибка добавления вакансии {vac.title}: {e}")
-
-        total_vacancies += count
-        print(f"   ✅ Загружено {count} вакансий для {selected_company}")
-
-    print(f"\n✅ Всего добавлено вакансий: {total_vacancies}")
+        if not emp_id:
+            print(f"Пропущена компания без ID: {selected_company}")
+            continue
+        print(f"▶ Загружаем вакансии для {selected_company} (ID {emp_id})")
+        employer_ids.append(emp_id)
+
+    # По умолчанию — полная загрузка; инкрементальная (только вакансии новее прошлого запуска)
+    # и удаление снятых с HH вакансий включаются явно
+    incremental = input("Загрузить только новые вакансии с прошлого запуска? (y/n) [n]: ").strip().lower() == "y"
+    expire = incremental and input(
+        "Удалить из БД вакансии, снятые с публикации на HH? (y/n) [n]: ").strip().lower() == "y"
+    pipeline = VacancyIngestionPipeline(
+        get_db(),
+        load_employers=False,
+        on_progress=lambda stats: print(f"   Записано {stats.written} вакансий, в очереди {stats.queue_depth}"),
+        sync_state=DatabaseSyncState(get_db().pool) if incremental else None,
+        expire=expire
+    )
+    stats = pipeline.run_sync(employer_ids)
+    print(f"\n✅ Всего добавлено вакансий: {stats.written} ({stats.vacancies_per_second:.1f} вак/с), "
+          f"удалено исчезнувших: {stats.expired}")
 
 
 # --- Отчеты из БД ---
@@ -184,32 +117,52 @@ def show_companies_and_counts():
         print(f"{company}: {count}")
 
 
-def show_all_vacancies():
+def show_all_vacancies(page_size=50):
     db = get_db()
-    vacancies = db.get_all_vacancies()
-    for v in vacancies:
-        print(f"{v[0]} | {v[1]} | {v[2]}-{v[3]} {v[4]}")
+    after = None
+    while True:
+        vacancies, after = db.get_vacancies_page(limit=page_size, after=after)
+        for v in vacancies:
+            print(f"{v[0]} | {v[1]} | {v[2]}-{v[3]} {v[4]}")
+        if after is None or input("Показать еще? (y/n): ").strip().lower() != "y":
+            break
 
 
 def show_avg_salary():
     db = get_db()
-    avg = db.get_avg_salary()
-    print(f"\nСредняя зарплата: {avg if avg else 'Нет данных'}")
+    stats = db.get_salary_stats()
+    if not stats:
+        print("\nСредняя зарплата: Нет данных")
+        return
+    print(f"\nСредняя зарплата: {stats['avg']}")
+    print(f"Медиана: {stats['p50']}, p75: {stats['p75']}, p90: {stats['p90']} "
+          f"(вакансий с зарплатой: {stats['vacancies_with_salary']})")
 
 
 def show_vacancies_above_avg():
+    threshold = input("Порог: avg, p50, p75 или p90 [avg]: ").strip().lower() or "avg"
     db = get_db()
-    vacancies = db.get_vacancies_with_higher_salary()
+    try:
+        vacancies = db.get_vacancies_with_higher_salary(threshold)
+    except ValueError as e:
+        print(e)
+        return
     for v in vacancies:
         print(f"{v[0]} | {v[1]} | {v[2]}-{v[3]} {v[4]}")
 
 
-def show_vacancies_by_keyword():
+def show_vacancies_by_keyword(page_size=20):
     keyword = input("Введите ключевое слово: ")
     db = get_db()
-    vacancies = db.get_vacancies_with_keyword(keyword)
-    for v in vacancies:
-        print(f"{v[0]} | {v[1]} | {v[2]}-{v[3]} {v[4]}")
+    mode = db.keyword_search_mode(keyword)  # один режим для всех страниц
+    offset = 0
+    while True:
+        vacancies = db.get_vacancies_with_keyword(keyword, limit=page_size, offset=offset, mode=mode)
+        for v in vacancies:
+            print(f"{v[0]} | {v[1]} | {v[2]}-{v[3]} {v[4]}")
+        if len(vacancies) < page_size or input("Показать еще? (y/n): ").strip().lower() != "y":
+            break
+        offset += page_size
 
 
 # --- Главное меню ---
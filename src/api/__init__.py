@@ -1,4 +1,10 @@
 from .base import VacancyAPI
 from .hh_api import HHVacancyAPI
+from .http_client import HTTPClient, OfflineCacheMiss, get_http_client
+from .response_cache import ResponseCache
+from .rate_limiter import (RateLimiter, NoRateLimiter, IntervalRateLimiter, TokenBucketRateLimiter,
+                           AdaptiveRateLimiter, get_rate_limiter)
 
-__all__ = ['VacancyAPI', 'HHVacancyAPI']
+__all__ = ['VacancyAPI', 'HHVacancyAPI', 'HTTPClient', 'OfflineCacheMiss', 'ResponseCache', 'get_http_client',
+           'RateLimiter', 'NoRateLimiter', 'IntervalRateLimiter', 'TokenBucketRateLimiter',
+           'AdaptiveRateLimiter', 'get_rate_limiter']
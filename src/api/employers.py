@@ -0,0 +1,167 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from .http_client import HTTPClient, get_http_client
+from .rate_limiter import RateLimiter, TokenBucketRateLimiter
+
+EMPLOYERS_URL = "https://api.hh.ru/employers"
+JSON_FILE = "company_ids.json"
+
+# Компании по умолчанию для меню и скриптов загрузки
+COMPANIES = [
+    "Альфа-Банк",
+    "ВТБ",
+    "X5 Group",
+    "Газпромбанк",
+    "Газпром нефть",
+    "Яндекс",
+    "Ozon",
+    "Аэрофлот",
+    "МТС",
+    "Сбер",
+    "Иви",
+    "AGIMA",
+    "RealWeb"
+]
+
+
+def load_company_names(file_path: str) -> List[str]:
+    """
+    Читает названия компаний из файла: JSON (список названий или словарь «название: ID»)
+    либо текст — по одному названию в строке, строки с # пропускаются.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.endswith(".json"):
+            return list(json.load(f))
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_company_ids(file_path: str = JSON_FILE) -> Dict[str, Optional[str]]:
+    """Содержимое company_ids.json (пустой словарь, если файла нет)."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_company_ids(company_ids: Dict[str, Optional[str]], file_path: str = JSON_FILE) -> None:
+    """Атомарно записывает company_ids.json (временный файл + os.replace)."""
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(company_ids, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, file_path)
+
+
+class EmployerIdResolver:
+    """
+    Параллельный поиск ID работодателей HH по названиям.
+
+    Запросы к /employers выполняются пулом из `max_workers` потоков под общим
+    ограничителем частоты (вместо пауз между запросами): по умолчанию это
+    адаптивный ограничитель HTTP-клиента, который на 429/503 снижает скорость
+    и повторяет запрос с учетом Retry-After. Результаты дописываются в JSON-файл
+    по мере получения, так что прерванный запуск не теряет найденные ID.
+    """
+
+    def __init__(
+            self,
+            client: Optional[HTTPClient] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            max_workers: int = 8,
+            base_url: str = EMPLOYERS_URL
+    ):
+        self.client = client or get_http_client()
+        self.rate_limiter = rate_limiter or self.client.rate_limiter or TokenBucketRateLimiter(rate=10, capacity=10)
+        self.max_workers = max_workers
+        self.base_url = base_url
+
+    def resolve_one(self, company: str) -> Optional[str]:
+        """ID первого работодателя в выдаче по названию (None, если не найден)."""
+        params = {"text": company, "per_page": 1}
+        data = self.client.get_cached_json(self.base_url, params)
+        if data is None:
+            self.rate_limiter.acquire()
+            data = self.client.get_json(self.base_url, params=params,
+                                        acquired=self.rate_limiter is self.client.rate_limiter)
+        if not isinstance(data, dict):
+            raise ValueError(f"ожидался объект JSON, получено: {type(data).__name__}")
+        items = data.get("items") or []
+        return str(items[0]["id"]) if items else None
+
+    def resolve(
+            self,
+            companies: Iterable[str],
+            file_path: Optional[str] = JSON_FILE,
+            skip_known: bool = False,
+            on_result: Optional[Callable[[str, Optional[str]], None]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Находит ID компаний и сливает их с уже сохраненными в `file_path`.
+
+        Файл переписывается атомарно после каждого ответа. Ошибка запроса или
+        некорректный ответ по одной компании не прерывает остальные: компания
+        остается без ID, а сохраненный ранее ID не затирается.
+
+        :param skip_known: не запрашивать компании, для которых в файле уже есть ID
+        :param on_result: вызывается для каждой компании с найденным ID (или None)
+        :return: итоговое содержимое файла (или только результаты, если файл не задан)
+        """
+        company_ids = load_company_ids(file_path) if file_path else {}
+        pending = list(dict.fromkeys(
+            company for company in companies if not (skip_known and company_ids.get(company))
+        ))
+        if not pending:
+            return company_ids
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.resolve_one, company): company for company in pending}
+            for future in as_completed(futures):
+                company = futures[future]
+                try:
+                    company_ids[company] = future.result()
+                    if on_result:
+                        on_result(company, company_ids[company])
+                except requests.RequestException as e:
+                    print(f"Ошибка при запросе {company}: {e}")
+                    company_ids.setdefault(company, None)
+                except (KeyError, IndexError, TypeError, ValueError) as e:
+                    print(f"Некорректный ответ для {company}: {e!r}")
+                    company_ids.setdefault(company, None)
+                if file_path:
+                    save_company_ids(company_ids, file_path)
+        return company_ids
+
+
+def resolve_company_ids(companies: Iterable[str] = COMPANIES, file_path: str = JSON_FILE,
+                        skip_known: bool = False, max_workers: int = 8) -> Dict[str, Optional[str]]:
+    """Находит ID компаний, печатает их по мере получения и сохраняет в `file_path`."""
+    company_ids = EmployerIdResolver(max_workers=max_workers).resolve(
+        companies, file_path, skip_known=skip_known,
+        on_result=lambda company, emp_id: print(f"{company}: {emp_id}")
+    )
+    print(f"✅ Сохранено в {os.path.abspath(file_path)}")
+    return company_ids
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Поиск ID работодателей HH по названиям компаний")
+    parser.add_argument("--companies", help="Файл с названиями компаний (.txt — по одному в строке, или .json)")
+    parser.add_argument("--output", default=JSON_FILE, help="JSON-файл с ID компаний (результаты дописываются)")
+    parser.add_argument("--workers", type=int, default=8, help="Одновременных запросов к API")
+    parser.add_argument("--skip-known", action="store_true", help="Не запрашивать компании с уже известным ID")
+    args = parser.parse_args()
+
+    companies = load_company_names(args.companies) if args.companies else COMPANIES
+    resolve_company_ids(companies, args.output, skip_known=args.skip_known, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
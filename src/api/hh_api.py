@@ -1,21 +1,72 @@
-import requests
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Optional
 from .base import VacancyAPI
+from .http_client import HTTPClient, get_http_client
+from .rate_limiter import RateLimiter, IntervalRateLimiter
 
 
 class HHVacancyAPI(VacancyAPI):
     """Класс для работы с API hh.ru."""
 
-    def __init__(self):
-        self.base_url = "https://api.hh.ru/vacancies"
+    # hh.ru отдает не более 2000 вакансий на один поисковый запрос
+    MAX_DEPTH = 2000
 
-    def get_vacancies(self, search_query: str) -> List[Dict[str, Any]]:
-        """Получает вакансии с hh.ru по поисковому запросу."""
+    def __init__(
+            self,
+            base_url: str = "https://api.hh.ru/vacancies",
+            per_page: int = 100,
+            max_workers: int = 4,
+            rate_limiter: Optional[RateLimiter] = None,
+            client: Optional[HTTPClient] = None
+    ):
+        self.base_url = base_url
+        self.per_page = per_page
+        self.max_workers = max_workers
+        self.client = client or get_http_client()
+        # По умолчанию — ограничитель клиента (общий адаптивный у get_http_client)
+        self.rate_limiter = rate_limiter or self.client.rate_limiter or IntervalRateLimiter()
+
+    def _fetch_page(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Загружает одну страницу выдачи (ответ из кеша — без ожидания ограничителя)."""
+        params = {**params, "page": page}
+        cached = self.client.get_cached_json(self.base_url, params)
+        if cached is not None:
+            return cached
+        self.rate_limiter.acquire()
+        return self.client.get_json(self.base_url, params=params,
+                                    acquired=self.rate_limiter is self.client.rate_limiter)
+
+    def iter_pages(self, search_query: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Отдает страницы выдачи по мере их загрузки.
+
+        Нулевая страница запрашивается первой и сообщает общее число страниц,
+        остальные загружаются параллельно пулом из `max_workers` потоков.
+        Порядок страниц после нулевой не гарантируется.
+        """
         params = {
             "text": search_query,
             "area": 113,  # Россия
-            "per_page": 100,  # Количество вакансий на странице
+            "per_page": self.per_page,  # Количество вакансий на странице
         }
-        response = requests.get(self.base_url, params=params)
-        response.raise_for_status()
-        return response.json().get("items", [])
+        first = self._fetch_page(params, 0)
+        yield first.get("items", [])
+
+        pages = min(int(first.get("pages", 1)), self.MAX_DEPTH // self.per_page)
+        if pages <= 1:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [executor.submit(self._fetch_page, params, page) for page in range(1, pages)]
+            for future in as_completed(futures):
+                yield future.result().get("items", [])
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_vacancies(self, search_query: str) -> List[Dict[str, Any]]:
+        """Получает все вакансии с hh.ru по поисковому запросу (в пределах лимита глубины API)."""
+        vacancies = []
+        for items in self.iter_pages(search_query):
+            vacancies.extend(items)
+        return vacancies
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+from .response_cache import ResponseCache
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "hh_responses.sqlite")
+
+
+class OfflineCacheMiss(requests.RequestException):
+    """Автономный режим: ответа на запрос нет в кеше."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах: заголовок бывает числом секунд или HTTP-датой."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HTTPClient:
+    """
+    HTTP-клиент для API hh.ru поверх одной `requests.Session`.
+
+    Соединения переиспользуются (keep-alive) из пула размером `pool_size`,
+    ответы 429/5xx повторяются с экспоненциальной задержкой, у каждого запроса
+    есть таймаут по умолчанию.
+
+    С `cache` (ResponseCache) `get_json` отдает свежие ответы из кеша без запроса,
+    устаревшие перепроверяет условным запросом (ETag / Last-Modified). В автономном
+    режиме (`offline`) сеть не используется вовсе: отдается любой сохраненный ответ,
+    а при его отсутствии выбрасывается OfflineCacheMiss.
+
+    С `rate_limiter` (AdaptiveRateLimiter) ответы 429/503 повторяет сам клиент,
+    а не urllib3: ограничитель узнает о каждом отказе и успехе, снижает или
+    повышает скорость и задерживает повтор (Retry-After или задержка с разбросом)
+    для всех, кто его использует.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(
+            self,
+            pool_size: int = 10,
+            retries: int = 3,
+            backoff_factor: float = 0.5,
+            timeout: float = 10,
+            user_agent: str = "PythonProject_3_Search_vacancies_BD/0.1",
+            cache: Optional[ResponseCache] = None,
+            offline: bool = False,
+            rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.cache = cache
+        self.offline = offline
+        self.rate_limiter = rate_limiter
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES if rate_limiter is None else tuple(
+                status for status in self.RETRY_STATUSES if status not in self.THROTTLE_STATUSES),
+            allowed_methods=frozenset({"GET"}),
+            # Иначе urllib3 сам повторяет 429/503 с Retry-After, и ограничитель их не видит
+            respect_retry_after_header=rate_limiter is None,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None,
+            acquired: bool = False) -> requests.Response:
+        """
+        Выполняет GET-запрос через общий пул соединений.
+
+        :param acquired: токен ограничителя уже получен вызывающим (например, через acquire_async)
+        """
+        kwargs = {"headers": headers} if headers else {}
+        if self.rate_limiter is not None and not acquired:
+            self.rate_limiter.acquire()
+        response = self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+        if self.rate_limiter is None:
+            return response
+        for attempt in range(self.retries):
+            if response.status_code not in self.THROTTLE_STATUSES:
+                break
+            self.rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")), attempt)
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+        if response.status_code in self.THROTTLE_STATUSES:
+            self.rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")), self.retries)
+        elif response.ok or response.status_code == 304:
+            self.rate_limiter.on_success()
+        return response
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None, acquired: bool = False, revalidate: bool = False) -> Any:
+        """
+        Выполняет GET-запрос и возвращает разобранный JSON (HTTPError при ошибочном статусе).
+
+        :param revalidate: не доверять сроку жизни закешированного ответа и всегда
+            перепроверять его условным запросом (для данных, по которым что-то удаляется)
+        """
+        if self.cache is None:
+            response = self.get(url, params=params, timeout=timeout, acquired=acquired)
+            response.raise_for_status()
+            return response.json()
+
+        key = self.cache.key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and ((entry.fresh and not revalidate) or self.offline):
+            self.cache.record("hits" if entry.fresh else "stale_hits")
+            return json.loads(entry.body)
+        if self.offline:
+            self.cache.record("misses")
+            raise OfflineCacheMiss(f"Нет ответа в кеше (автономный режим): {key}")
+
+        headers = entry.conditional_headers() if entry is not None else None
+        response = self.get(url, params=params, timeout=timeout, headers=headers, acquired=acquired)
+        if response.status_code == 304 and entry is not None:
+            self.cache.record("revalidated")
+            self.cache.touch(key, url)
+            return json.loads(entry.body)
+        self.cache.record("misses")
+        response.raise_for_status()
+        self.cache.put(key, url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.json()
+
+    def get_cached_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        JSON из кеша без обращения к сети: свежий ответ (в автономном режиме — любой) или None.
+
+        Позволяет не тратить на закешированные ответы лимит частоты запросов.
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.get(self.cache.key(url, params))
+        if entry is None or not (entry.fresh or self.offline):
+            return None
+        self.cache.record("hits" if entry.fresh else "stale_hits")
+        return json.loads(entry.body)
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "HTTPClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_default_client: Optional[HTTPClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Возвращает общий для процесса HTTP-клиент (создается при первом обращении).
+
+    Запросы идут через общий адаптивный ограничитель (get_rate_limiter).
+    Переменные окружения: HH_CACHE — путь к файлу кеша ответов или "off"
+    (по умолчанию .cache/hh_responses.sqlite), HH_OFFLINE=1 — автономный режим
+    (только ответы из кеша).
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            cache_path = os.getenv("HH_CACHE", DEFAULT_CACHE_PATH)
+            _default_client = HTTPClient(
+                cache=ResponseCache(cache_path) if cache_path.lower() != "off" else None,
+                offline=os.getenv("HH_OFFLINE", "") not in ("", "0"),
+                rate_limiter=get_rate_limiter()
+            )
+        return _default_client
+
+
+def set_http_client(client: Optional[HTTPClient]) -> None:
+    """Подменяет общий HTTP-клиент (например, с другими настройками пула или в тестах)."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
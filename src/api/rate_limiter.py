@@ -0,0 +1,202 @@
+import abc
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+
+class RateLimiter(abc.ABC):
+    """Абстрактный ограничитель частоты запросов к API."""
+
+    @abc.abstractmethod
+    def acquire(self) -> None:
+        """Блокирует поток, пока не будет разрешен очередной запрос."""
+        pass
+
+    async def acquire_async(self) -> None:
+        """Асинхронный вариант `acquire` (по умолчанию ожидает в отдельном потоке)."""
+        await asyncio.to_thread(self.acquire)
+
+
+class NoRateLimiter(RateLimiter):
+    """Ограничитель, который ничего не ограничивает (для тестов и локальных заглушек)."""
+
+    def acquire(self) -> None:
+        return None
+
+    async def acquire_async(self) -> None:
+        return None
+
+
+class IntervalRateLimiter(RateLimiter):
+    """Потокобезопасный ограничитель: не более одного запроса в `min_interval` секунд."""
+
+    def __init__(self, min_interval: float = 0.2):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Ограничитель «ведро токенов»: в среднем `rate` запросов в секунду,
+    всплески до `capacity` запросов подряд.
+
+    Один экземпляр можно делить между потоками и корутинами: токен
+    резервируется под блокировкой, а ожидание идет уже вне ее.
+    """
+
+    def __init__(self, rate: float = 5.0, capacity: float = 5.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Забирает токен и возвращает, сколько секунд нужно подождать до его появления."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+@dataclass
+class LimiterMetrics:
+    """Снимок метрик AdaptiveRateLimiter."""
+
+    rate: float
+    requests: int = 0
+    throttled: int = 0
+    retry_after: int = 0
+    decreases: int = 0
+    increases: int = 0
+    waited: float = 0.0
+
+
+class AdaptiveRateLimiter(TokenBucketRateLimiter):
+    """
+    «Ведро токенов», скорость которого подстраивается под ответы API (AIMD).
+
+    Пока запросы проходят, скорость растет на `increase` запросов в секунду
+    примерно за каждую секунду успешных ответов (до `max_rate`). На 429/503
+    скорость умножается на `decrease` (не ниже `min_rate`, не чаще раза
+    в секунду — одновременные отказы от параллельных запросов считаются одним),
+    а выдача токенов всем пользователям ограничителя приостанавливается
+    на Retry-After или, если заголовка нет, на экспоненциальную задержку
+    со случайным разбросом (full jitter).
+
+    Обратную связь (`on_success`, `on_throttle`) дает HTTPClient, у которого
+    этот ограничитель задан; ожидание доступно как `acquire` и `acquire_async`.
+    """
+
+    def __init__(
+            self,
+            rate: float = 5.0,
+            capacity: Optional[float] = None,
+            min_rate: float = 0.5,
+            max_rate: float = 20.0,
+            increase: float = 0.5,
+            decrease: float = 0.5,
+            backoff_base: float = 0.5,
+            backoff_max: float = 30.0
+    ):
+        super().__init__(rate, capacity if capacity is not None else rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._blocked_until = 0.0
+        self._cooldown_until = 0.0
+        self._successes = 0
+        self._metrics = LimiterMetrics(rate=rate)
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, self._blocked_until - now) + max(0.0, -self._tokens / self.rate)
+            self._metrics.requests += 1
+            self._metrics.waited += wait
+            return wait
+
+    def set_rate(self, rate: float) -> None:
+        """Задает текущую скорость и размер всплеска (например, из параметров командной строки)."""
+        with self._lock:
+            self.rate = self.capacity = rate
+            self.max_rate = max(self.max_rate, rate)
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед повтором номер `attempt` (с 0): случайная в [0, base * 2^attempt]."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def on_success(self) -> None:
+        """Успешный ответ: аддитивное увеличение скорости."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.rate and self.rate < self.max_rate:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self._metrics.increases += 1
+
+    def on_throttle(self, retry_after: Optional[float] = None, attempt: int = 0) -> None:
+        """Ответ 429/503: мультипликативное снижение скорости и пауза для всех запросов."""
+        with self._lock:
+            now = time.monotonic()
+            self._metrics.throttled += 1
+            if retry_after is not None:
+                self._metrics.retry_after += 1
+            pause = retry_after if retry_after is not None else self.backoff(attempt)
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._successes = 0
+            if now >= self._cooldown_until:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._tokens = min(self._tokens, 0.0)
+                self._cooldown_until = now + max(1.0, pause)
+                self._metrics.decreases += 1
+
+    def metrics(self) -> LimiterMetrics:
+        """Текущая скорость и счетчики: запросы, отказы 429/503, изменения скорости, суммарное ожидание."""
+        with self._lock:
+            return replace(self._metrics, rate=self.rate)
+
+
+_shared_limiter: Optional[AdaptiveRateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Общий для процесса адаптивный ограничитель запросов к API hh.ru."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter()
+        return _shared_limiter
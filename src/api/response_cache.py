@@ -0,0 +1,162 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+# Время жизни ответов по умолчанию (секунды): шаблон пути -> TTL. Берется первый подошедший шаблон.
+DEFAULT_TTLS: Tuple[Tuple[str, float], ...] = (
+    (r"/employers/\d+$", 7 * 24 * 3600),  # карточка работодателя меняется редко
+    (r"/employers$", 24 * 3600),          # поиск работодателя по названию
+    (r"/vacancies$", 15 * 60),            # выдача вакансий
+    (r".*", 3600),
+)
+
+
+@dataclass
+class CachedResponse:
+    """Сохраненный ответ: тело и валидаторы для условного запроса."""
+
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Заголовки If-None-Match / If-Modified-Since для повторной проверки ответа."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    """Счетчики кеша за время жизни процесса."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stale_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    Кеш ответов API в SQLite: ключ — URL вместе с отсортированными параметрами.
+
+    У каждого ответа свой срок жизни (по шаблону пути, см. DEFAULT_TTLS). Устаревший
+    ответ не удаляется: его ETag / Last-Modified используются для условного запроса,
+    а в автономном режиме он отдается как есть. Общий размер тел ограничен
+    `max_bytes`, при превышении вытесняются давно не использованные ответы (LRU).
+
+    Один экземпляр можно делить между потоками; база открыта в режиме WAL,
+    так что кеш могут одновременно использовать несколько процессов.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 2 ** 20,
+                 ttls: Iterable[Tuple[str, float]] = DEFAULT_TTLS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+    def ttl(self, url: str) -> float:
+        path = urlsplit(url).path.rstrip("/")
+        return next((ttl for pattern, ttl in self.ttls if pattern.search(path)), 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Ответ из кеша (в том числе устаревший) с отметкой об использовании."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return CachedResponse(*row)
+
+    def put(self, key: str, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now + self.ttl(url), now, len(body))
+            )
+            self._evict()
+
+    def touch(self, key: str, url: str) -> None:
+        """Продлевает срок жизни ответа (сервер ответил 304 Not Modified)."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ? WHERE key = ?", (time.time() + self.ttl(url), key))
+
+    def _evict(self) -> None:
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self.stats.evictions += len(keys)
+
+    def record(self, counter: str) -> None:
+        """Увеличивает счетчик `CacheStats` (hits, misses, revalidated, stale_hits)."""
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def size(self) -> int:
+        """Общий размер тел ответов в кеше, байт."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._conn.close()
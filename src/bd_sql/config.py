@@ -10,6 +10,8 @@ DB_NAME = os.getenv("DB_NAME", "hh_vacancies")  # Значение по умол
 DB_USER = os.getenv("DB_USER", "postgres")      # Значение по умолчанию "postgres"
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")  # Set your default password here
 DB_HOST = os.getenv("DB_HOST", "")     # Your server IP as default
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))   # Минимум соединений в пуле
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))  # Максимум соединений в пуле
 
 # Для удобства можно добавить функцию получения всех настроек
 def get_db_config():
@@ -21,4 +23,4 @@ def get_db_config():
     }
 
 # Initialize DBManager with the configuration
-db = DBManager(**get_db_config())
\ No newline at end of file
+db = DBManager(**get_db_config(), minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX)
\ No newline at end of file
@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Tuple
+
+from src.bd_sql.search import search_clause
+from src.storage.criteria import split_criteria
+
+# Критерии хранилищ (см. src/storage/criteria.py), которые переводятся в условия WHERE.
+# Таблица vacancies — псевдоним v, employers — e (LEFT JOIN по employer_id).
+SQL_CONDITIONS = {
+    "min_salary": "COALESCE(v.salary_mid, 0) >= %s",
+    "max_salary": "v.salary_mid <= %s",
+    "currency": "UPPER(v.currency) = UPPER(%s)",
+    "employer_hh_id": "e.hh_id = %s",
+    "hh_id": "v.hh_id = %s",
+    "title": "v.title = %s",
+    "link": "v.link = %s",
+}
+
+
+def criteria_where(criteria: Dict[str, Any]) -> Tuple[str, List[Any], Dict[str, Any]]:
+    """
+    Переводит критерии хранилища в условие WHERE.
+
+    "keyword" ищется подстрокой в том же нормализованном тексте, что Vacancy.search_text
+    в файловых хранилищах (без <highlighttext>, регистр и ё/е не важны), по триграммному
+    индексу. Критерии, которые нельзя выразить в SQL,
+    возвращаются отдельно — их проверяет предикат compile_criteria.
+
+    :return: (строка "WHERE ..." или "", параметры, непереведенные критерии)
+    """
+    pushed, rest = split_criteria(criteria, {"keyword", *SQL_CONDITIONS})
+    conditions: List[str] = []
+    params: List[Any] = []
+    for key, value in pushed.items():
+        if key == "keyword":
+            where, _, search_params = search_clause(value, "substring")
+            conditions.append(where)
+            params.append(search_params[0])
+        else:
+            conditions.append(SQL_CONDITIONS[key])
+            params.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params, rest
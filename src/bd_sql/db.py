@@ -1,13 +1,25 @@
 import psycopg2
+from itertools import islice
 from psycopg2 import sql
-from typing import List
+from psycopg2.extras import execute_values
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from src.bd_sql.criteria import criteria_where
+from src.bd_sql.migrations import ensure_schema
+from src.bd_sql.pool import get_pool
+from src.bd_sql.salary import SALARY_RUB_SQL, fetch_salary_stats, refresh_salary_stats, salary_threshold_column
+from src.bd_sql.search import keyword_search_mode, search_clause
+from src.bd_sql.streaming import keyset_page, stream_rows
 from src.models.vacancy import Vacancy
+from src.storage.criteria import compile_criteria
 
 
 class DatabaseVacancyStorage:
     """Класс для работы с PostgreSQL: вакансии и работодатели"""
 
-    def __init__(self, db_name: str, user: str, password: str, host: str = "localhost"):
+    VACANCY_COLUMNS = "v.title, v.link, v.salary_from, v.salary_to, v.currency, v.description, v.requirements"
+
+    def __init__(self, db_name: str, user: str, password: str, host: str = "localhost",
+                 minconn: int = 1, maxconn: int = 10):
         self.db_name = db_name
         self.user = user
         self.password = password
@@ -18,58 +30,30 @@ class DatabaseVacancyStorage:
             "password": password,
             "host": host
         }
-        self._create_db_if_not_exists()
-        self._ensure_tables_exist()
+        self.pool = self._create_pool(minconn, maxconn)
+        ensure_schema(self.pool, self.conn_params)
 
-    def _create_db_if_not_exists(self):
-        """Создает базу данных, если она отсутствует"""
+    def _create_pool(self, minconn: int, maxconn: int):
+        """Создает пул соединений; если базы нет — сначала создает ее"""
         try:
-            conn = psycopg2.connect(**self.conn_params)
-            conn.close()
-            print(f"✅ База '{self.db_name}' существует.")
+            return get_pool(minconn, maxconn, **self.conn_params)
         except psycopg2.OperationalError:
-            print(f"⚠ База '{self.db_name}' не найдена. Создаю...")
-            conn = psycopg2.connect(dbname="postgres", user=self.user, password=self.password, host=self.host)
-            conn.autocommit = True
-            with conn.cursor() as cursor:
-                cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(self.db_name)))
-            conn.close()
-            print(f"✅ База '{self.db_name}' создана.")
+            self._create_database()
+            return get_pool(minconn, maxconn, **self.conn_params)
 
-    def _connect(self):
-        return psycopg2.connect(**self.conn_params)
+    def _create_database(self):
+        """Создает базу данных"""
+        print(f"⚠ База '{self.db_name}' не найдена. Создаю...")
+        conn = psycopg2.connect(dbname="postgres", user=self.user, password=self.password, host=self.host)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(self.db_name)))
+        conn.close()
+        print(f"✅ База '{self.db_name}' создана.")
 
-    def _ensure_tables_exist(self):
-        """Создает таблицы и добавляет недостающие колонки"""
-        with self._connect() as conn:
-            with conn.cursor() as cursor:
-                # Таблица работодателей
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS employers (
-                        id SERIAL PRIMARY KEY,
-                        hh_id VARCHAR(50) UNIQUE NOT NULL,
-                        name VARCHAR(255) NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Таблица вакансий с внешним ключом employer_id
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS vacancies (
-                        id SERIAL PRIMARY KEY,
-                        hh_id VARCHAR(50) UNIQUE,
-                        title VARCHAR(255) NOT NULL,
-                        link VARCHAR(255) NOT NULL,
-                        salary_from INTEGER,
-                        salary_to INTEGER,
-                        currency VARCHAR(10),
-                        description TEXT,
-                        requirements TEXT,
-                        employer_id INTEGER REFERENCES employers(id) ON DELETE CASCADE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                conn.commit()
+    def _connect(self):
+        """Соединение из общего пула (использовать как контекстный менеджер)"""
+        return self.pool.connection()
 
     # ------------------- Методы для работы с данными -------------------
 
@@ -95,9 +79,7 @@ class DatabaseVacancyStorage:
         """Добавляет вакансию в БД с учетом employer_id"""
         with self._connect() as conn:
             with conn.cursor() as cursor:
-                salary_from = vacancy.salary.get('from') if vacancy.salary else None
-                salary_to = vacancy.salary.get('to') if vacancy.salary else None
-                currency = vacancy.salary.get('currency') if vacancy.salary else None
+                salary_from, salary_to, currency = vacancy.salary_from, vacancy.salary_to, vacancy.currency
 
                 # Находим employer_id по hh_id работодателя
                 cursor.execute("SELECT id FROM employers WHERE hh_id = %s", (vacancy.employer_hh_id,))
@@ -135,6 +117,104 @@ class DatabaseVacancyStorage:
                 ))
             conn.commit()
 
+    def add_vacancies(self, vacancies: Iterable[Vacancy], batch_size: int = 500) -> int:
+        """
+        Пакетно добавляет/обновляет вакансии в БД.
+
+        На каждую пачку из `batch_size` вакансий выполняется один запрос к employers
+        и один многострочный INSERT ... ON CONFLICT через execute_values в одной транзакции.
+        Вакансии работодателей, которых нет в БД, пропускаются.
+
+        :return: количество записанных вакансий
+        """
+        total = 0
+        iterator = iter(vacancies)
+        with self._connect() as conn:
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch:
+                    break
+                with conn.cursor() as cursor:
+                    total += self._upsert_batch(cursor, batch)
+                conn.commit()
+        return total
+
+    def _upsert_batch(self, cursor, batch: List[Vacancy]) -> int:
+        employer_hh_ids = list({v.employer_hh_id for v in batch if v.employer_hh_id})
+        cursor.execute("SELECT hh_id, id FROM employers WHERE hh_id = ANY(%s)", (employer_hh_ids,))
+        employer_ids = dict(cursor.fetchall())
+
+        # В одном INSERT ... ON CONFLICT строка не может обновляться дважды,
+        # поэтому дубликаты hh_id внутри пачки схлопываются (побеждает последняя)
+        rows = {}
+        for vacancy in batch:
+            employer_id = employer_ids.get(vacancy.employer_hh_id)
+            if employer_id is None:
+                print(f"⚠ Работодатель {vacancy.employer_hh_id} не найден. Сначала добавь его.")
+                continue
+            rows[vacancy.hh_id or id(vacancy)] = (
+                vacancy.hh_id,
+                vacancy.title,
+                vacancy.link,
+                vacancy.salary_from,
+                vacancy.salary_to,
+                vacancy.currency,
+                vacancy.description,
+                vacancy.requirements,
+                employer_id
+            )
+        if not rows:
+            return 0
+
+        execute_values(cursor, """
+            INSERT INTO vacancies (
+                hh_id, title, link, salary_from, salary_to,
+                currency, description, requirements, employer_id
+            ) VALUES %s
+            ON CONFLICT (hh_id)
+            DO UPDATE SET
+                title = EXCLUDED.title,
+                link = EXCLUDED.link,
+                salary_from = EXCLUDED.salary_from,
+                salary_to = EXCLUDED.salary_to,
+                currency = EXCLUDED.currency,
+                description = EXCLUDED.description,
+                requirements = EXCLUDED.requirements,
+                employer_id = EXCLUDED.employer_id
+        """, list(rows.values()), page_size=len(rows))
+        return len(rows)
+
+    def count_vacancies(self, employer_hh_id: str) -> int:
+        """Количество сохраненных вакансий работодателя"""
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM vacancies v
+                    JOIN employers e ON e.id = v.employer_id
+                    WHERE e.hh_id = %s
+                """, (str(employer_hh_id),))
+                return cursor.fetchone()[0]
+
+    def expire_vacancies(self, employer_hh_id: str, active_ids: Iterable[str]) -> int:
+        """
+        Удаляет вакансии работодателя, которых больше нет на HH (hh_id не из `active_ids`).
+
+        :return: количество удаленных вакансий
+        """
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    DELETE FROM vacancies v
+                    USING employers e
+                    WHERE e.id = v.employer_id
+                      AND e.hh_id = %s
+                      AND v.hh_id <> ALL(%s::text[])
+                """, (str(employer_hh_id), [str(hh_id) for hh_id in active_ids]))
+                removed = cursor.rowcount
+            conn.commit()
+        return removed
+
     # ------------------- Методы для отчетов -------------------
 
     def get_companies_and_vacancies_count(self):
@@ -152,49 +232,136 @@ class DatabaseVacancyStorage:
 
     def get_all_vacancies(self):
         """Все вакансии"""
+        return list(self.iter_all_vacancies())
+
+    def iter_all_vacancies(self, itersize: int = 1000):
+        """Все вакансии (от новых к старым) генератором через серверный курсор"""
+        return stream_rows(self.pool, f"""
+            SELECT {self.VACANCY_COLUMNS}
+            FROM vacancies v
+            ORDER BY v.created_at DESC, v.id DESC
+        """, itersize=itersize)
+
+    def iter_vacancies(self, criteria: Dict[str, Any], limit: Optional[int] = None,
+                       itersize: int = 1000) -> Iterator[Vacancy]:
+        """
+        Вакансии по критериям хранилищ (как у файловых хранилищ), от новых к старым.
+
+        Поддерживаемые критерии фильтруются в WHERE (и LIMIT уходит в запрос),
+        остальные — общим предикатом compile_criteria по мере чтения курсора.
+        """
+        where, params, rest = criteria_where(criteria)
+        query = f"""
+            SELECT {self.VACANCY_COLUMNS}, v.hh_id, e.hh_id
+            FROM vacancies v
+            LEFT JOIN employers e ON e.id = v.employer_id
+            {where}
+            ORDER BY v.created_at DESC, v.id DESC
+        """
+        if limit is not None and not rest:
+            query += " LIMIT %s"
+            params.append(limit)
+        vacancies = map(Vacancy.from_row, stream_rows(self.pool, query, params, itersize=itersize))
+        if rest:
+            vacancies = filter(compile_criteria(rest), vacancies)
+        return islice(vacancies, limit) if limit is not None else vacancies
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        return list(self.iter_vacancies(criteria))
+
+    def get_vacancies_page(self, limit: int = 50, after=None):
+        """
+        Страница вакансий (keyset-пагинация по created_at).
+
+        :param after: ключ из предыдущего вызова; None — первая страница
+        :return: (строки, ключ следующей страницы или None)
+        """
+        return keyset_page(self.pool, self.VACANCY_COLUMNS, limit, after)
+
+    def refresh_salary_stats(self):
+        """Пересчитывает материализованную статистику зарплат (после загрузки вакансий)"""
         with self._connect() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT title, link, salary_from, salary_to, currency, description, requirements
-                    FROM vacancies
-                    ORDER BY created_at DESC
-                """)
-                return cursor.fetchall()
+                refresh_salary_stats(cursor)
+
+    def get_salary_stats(self):
+        """Статистика зарплат: количество, среднее и перцентили p50/p75/p90"""
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                return fetch_salary_stats(cursor)
 
     def get_avg_salary(self):
         """Средняя зарплата"""
+        stats = self.get_salary_stats()
+        return stats["avg"] if stats else None
+
+    def get_vacancies_with_higher_salary(self, threshold: str = "avg"):
+        """
+        Вакансии с зарплатой выше порога: средней ("avg") или перцентиля ("p50", "p75", "p90").
+
+        Один запрос: порог берется из salary_stats, отбор и сортировка идут по индексу salary_mid.
+        """
+        column = salary_threshold_column(threshold)
         with self._connect() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT AVG((COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2.0)
+                cursor.execute(f"""
+                    SELECT title, link, salary_from, salary_to, currency, description, requirements
                     FROM vacancies
-                    WHERE salary_from IS NOT NULL OR salary_to IS NOT NULL
+                    WHERE salary_mid > (SELECT {column} FROM salary_stats)
+                    ORDER BY salary_mid DESC
                 """)
-                result = cursor.fetchone()
-                return round(result[0], 2) if result and result[0] else None
-
-    def get_vacancies_with_higher_salary(self):
-        """Вакансии с зарплатой выше средней"""
-        avg_salary = self.get_avg_salary()
-        if not avg_salary:
-            return []
+                return cursor.fetchall()
+
+    def get_top_vacancies_by_salary(self, n: int) -> List[Vacancy]:
+        """
+        Топ n вакансий по зарплате в рублях (как Vacancy.salary_key).
+
+        Сортировка выполняется в базе: при ORDER BY ... LIMIT Postgres держит
+        в памяти только n лучших строк (top-N heapsort), а не сортирует всю таблицу.
+        """
         with self._connect() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT title, link, salary_from, salary_to, currency, description, requirements
-                    FROM vacancies
-                    WHERE (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2.0 > %s
-                    ORDER BY (COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2.0 DESC
-                """, (avg_salary,))
-                return cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT {self.VACANCY_COLUMNS}, v.hh_id, e.hh_id
+                    FROM vacancies v
+                    LEFT JOIN employers e ON e.id = v.employer_id
+                    WHERE v.salary_mid IS NOT NULL
+                    ORDER BY {SALARY_RUB_SQL} DESC
+                    LIMIT %s
+                """, (n,))
+                return [Vacancy.from_row(row) for row in cursor.fetchall()]
+
+    def search_vacancies(self, keyword: str, mode: str = "fts", limit: int = 50, offset: int = 0):
+        """
+        Ранжированный поиск вакансий по ключевому слову с пагинацией.
 
-    def get_vacancies_with_keyword(self, keyword: str):
-        """Вакансии по ключевому слову"""
+        :param mode: "fts" (полнотекстовый, русский + английский), "substring" или "fuzzy" (pg_trgm)
+        """
+        where, rank, params = search_clause(keyword, mode)
         with self._connect() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT title, link, salary_from, salary_to, currency, description, requirements
-                    FROM vacancies
-                    WHERE description ILIKE %s OR requirements ILIKE %s
-                """, (f"%{keyword}%", f"%{keyword}%"))
+                cursor.execute(f"""
+                    SELECT v.title, v.link, v.salary_from, v.salary_to, v.currency, v.description, v.requirements
+                    FROM vacancies v
+                    WHERE {where}
+                    ORDER BY {rank} DESC, v.id
+                    LIMIT %s OFFSET %s
+                """, (*params, limit, offset))
                 return cursor.fetchall()
+
+    def keyword_search_mode(self, keyword: str) -> str:
+        """Режим поиска по ключевому слову: "fts", если есть полнотекстовые совпадения, иначе "substring"."""
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                return keyword_search_mode(cursor, keyword)
+
+    def get_vacancies_with_keyword(self, keyword: str, limit: int = 50, offset: int = 0,
+                                   mode: Optional[str] = None):
+        """
+        Вакансии по ключевому слову (полнотекстовый поиск, при отсутствии совпадений — по подстроке).
+
+        Режим выбирается по всей выдаче, а не по странице, чтобы страницы одного поиска
+        не смешивали результаты разных режимов. При постраничном выводе режим лучше
+        определить один раз (`keyword_search_mode`) и передавать в `mode`.
+        """
+        return self.search_vacancies(keyword, mode or self.keyword_search_mode(keyword), limit, offset)
@@ -1,12 +1,15 @@
-import psycopg2
-from psycopg2 import sql
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+from src.bd_sql.pool import get_pool
+from src.bd_sql.salary import fetch_salary_stats, salary_threshold_column
+from src.bd_sql.search import keyword_search_mode, search_clause
+from src.bd_sql.streaming import keyset_page, stream_rows
 
 
 class DBManager:
     """Класс для управления взаимодействием с базой данных PostgreSQL"""
 
-    def __init__(self, dbname: str, user: str, password: str, host: str = "localhost"):
+    def __init__(self, dbname: str, user: str, password: str, host: str = "localhost",
+                 minconn: int = 1, maxconn: int = 10):
         """
         Инициализация подключения к базе данных
 
@@ -14,6 +17,8 @@ class DBManager:
         :param user: имя пользователя
         :param password: пароль
         :param host: хост (по умолчанию localhost)
+        :param minconn: минимальное число соединений в пуле
+        :param maxconn: максимальное число соединений в пуле
         """
         self.conn_params = {
             "dbname": dbname,
@@ -21,10 +26,19 @@ class DBManager:
             "password": password,
             "host": host
         }
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self._pool = None
+
+    def _ensure_pool(self):
+        """Возвращает общий пул соединений (создается при первом обращении)"""
+        if self._pool is None:
+            self._pool = get_pool(self.minconn, self.maxconn, **self.conn_params)
+        return self._pool
 
     def _get_connection(self):
-        """Устанавливает соединение с базой данных"""
-        return psycopg2.connect(**self.conn_params)
+        """Выдает соединение из общего пула"""
+        return self._ensure_pool().connection()
 
     def get_companies_and_vacancies_count(self) -> List[Dict[str, int]]:
         """
@@ -48,75 +62,88 @@ class DBManager:
                     })
                 return result
 
+    LIST_COLUMNS = "e.name AS employer_name, v.title, v.salary_from, v.salary_to, v.currency, v.link"
+    LIST_SOURCE = "vacancies v LEFT JOIN employers e ON e.id = v.employer_id"
+
+    @staticmethod
+    def _list_row_to_dict(row) -> Dict:
+        salary = None
+        if row[2] or row[3]:  # Если указана хотя бы одна часть зарплаты
+            salary = f"{row[2] or ''}-{row[3] or ''} {row[4] or ''}".strip()
+        return {
+            'company': row[0],
+            'title': row[1],
+            'salary': salary,
+            'link': row[5]
+        }
+
     def get_all_vacancies(self) -> List[Dict]:
         """
         Получает список всех вакансий с указанием компании, названия, зарплаты и ссылки
 
         :return: список словарей с информацией о вакансиях
         """
-        with self._get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        employer_name, 
-                        title, 
-                        salary_from, 
-                        salary_to, 
-                        currency, 
-                        link 
-                    FROM vacancies
-                    ORDER BY COALESCE(salary_from, 0) DESC
-                """)
-                result = []
-                for row in cursor.fetchall():
-                    salary = None
-                    if row[2] or row[3]:  # Если указана хотя бы одна часть зарплаты
-                        salary = f"{row[2] or ''}-{row[3] or ''} {row[4] or ''}".strip()
+        return list(self.iter_all_vacancies())
 
-                    result.append({
-                        'company': row[0],
-                        'title': row[1],
-                        'salary': salary,
-                        'link': row[5]
-                    })
-                return result
+    def iter_all_vacancies(self, itersize: int = 1000) -> Iterator[Dict]:
+        """
+        Отдает все вакансии по одной через серверный курсор (память не зависит от числа строк)
+
+        :param itersize: сколько строк забирать с сервера за один раз
+        :return: генератор словарей с информацией о вакансиях
+        """
+        rows = stream_rows(self._ensure_pool(), f"""
+            SELECT {self.LIST_COLUMNS}
+            FROM {self.LIST_SOURCE}
+            ORDER BY COALESCE(v.salary_from, 0) DESC
+        """, itersize=itersize)
+        return (self._list_row_to_dict(row) for row in rows)
+
+    def get_vacancies_page(self, limit: int = 50, after=None) -> Tuple[List[Dict], Optional[tuple]]:
+        """
+        Получает страницу вакансий от новых к старым (keyset-пагинация по created_at)
 
-    def get_avg_salary(self) -> float:
+        :param limit: размер страницы
+        :param after: ключ следующей страницы из предыдущего вызова; None — первая страница
+        :return: (список словарей с вакансиями, ключ следующей страницы или None)
         """
-        Рассчитывает среднюю зарплату по вакансиям
+        rows, next_key = keyset_page(self._ensure_pool(), self.LIST_COLUMNS, limit, after, self.LIST_SOURCE)
+        return [self._list_row_to_dict(row) for row in rows], next_key
 
-        :return: средняя зарплата (по нижней границе вилки)
+    def get_avg_salary(self) -> Optional[float]:
+        """
+        Возвращает среднюю зарплату по вакансиям из материализованной статистики salary_stats
+
+        :return: средняя зарплата (по середине вилки) или None, если зарплат нет
         """
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT AVG(salary_from) 
-                    FROM vacancies 
-                    WHERE salary_from IS NOT NULL
-                """)
-                return round(float(cursor.fetchone()[0]), 2)
+                stats = fetch_salary_stats(cursor)
+                return stats["avg"] if stats else None
 
-    def get_vacancies_with_higher_salary(self) -> List[Dict]:
+    def get_vacancies_with_higher_salary(self, threshold: str = "avg") -> List[Dict]:
         """
-        Получает список вакансий с зарплатой выше средней
+        Получает список вакансий с зарплатой выше средней или выше перцентиля
 
+        :param threshold: порог: "avg", "p50", "p75" или "p90"
         :return: список словарей с вакансиями
         """
-        avg_salary = self.get_avg_salary()
+        column = salary_threshold_column(threshold)
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT 
-                        employer_name, 
-                        title, 
-                        salary_from, 
-                        salary_to, 
-                        currency, 
-                        link 
-                    FROM vacancies
-                    WHERE salary_from > %s
-                    ORDER BY salary_from DESC
-                """, (avg_salary,))
+                        e.name AS employer_name, 
+                        v.title, 
+                        v.salary_from, 
+                        v.salary_to, 
+                        v.currency, 
+                        v.link 
+                    FROM vacancies v
+                    LEFT JOIN employers e ON e.id = v.employer_id
+                    WHERE v.salary_mid > (SELECT {column} FROM salary_stats)
+                    ORDER BY v.salary_mid DESC
+                """)
 
                 result = []
                 for row in cursor.fetchall():
@@ -129,27 +156,42 @@ class DBManager:
                     })
                 return result
 
-    def get_vacancies_with_keyword(self, keyword: str) -> List[Dict]:
+    def keyword_search_mode(self, keyword: str) -> str:
+        """Режим поиска по ключевому слову: "fts", если есть полнотекстовые совпадения, иначе "substring"."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                return keyword_search_mode(cursor, keyword)
+
+    def get_vacancies_with_keyword(self, keyword: str, limit: int = 50, offset: int = 0,
+                                   mode: Optional[str] = None) -> List[Dict]:
         """
-        Ищет вакансии по ключевому слову в названии
+        Ищет вакансии по ключевому слову в названии, описании и требованиях
 
         :param keyword: ключевое слово для поиска
-        :return: список найденных вакансий
+        :param limit: размер страницы результатов
+        :param offset: смещение страницы
+        :param mode: режим поиска: "fts", "substring" или "fuzzy"; по умолчанию полнотекстовый,
+            а при отсутствии совпадений — по подстроке. При постраничном выводе режим лучше
+            определить один раз (`keyword_search_mode`) и передавать в `mode`
+        :return: список найденных вакансий, отсортированный по релевантности
         """
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("""
+                where, rank, params = search_clause(keyword, mode or keyword_search_mode(cursor, keyword))
+                cursor.execute(f"""
                     SELECT 
-                        employer_name, 
-                        title, 
-                        salary_from, 
-                        salary_to, 
-                        currency, 
-                        link 
-                    FROM vacancies
-                    WHERE title ILIKE %s
-                    ORDER BY COALESCE(salary_from, 0) DESC
-                """, (f"%{keyword}%",))
+                        e.name AS employer_name, 
+                        v.title, 
+                        v.salary_from, 
+                        v.salary_to, 
+                        v.currency, 
+                        v.link 
+                    FROM vacancies v
+                    LEFT JOIN employers e ON e.id = v.employer_id
+                    WHERE {where}
+                    ORDER BY {rank} DESC, v.id
+                    LIMIT %s OFFSET %s
+                """, (*params, limit, offset))
 
                 result = []
                 for row in cursor.fetchall():
@@ -160,4 +202,4 @@ class DBManager:
                         'salary': salary,
                         'link': row[5]
                     })
-                return result
\ No newline at end of file
+                return result
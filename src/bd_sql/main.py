@@ -1,53 +1,17 @@
 import argparse
 import json
 import os
-import time
 import requests
 from db import DatabaseVacancyStorage
+from src.api.employers import COMPANIES, resolve_company_ids
+from src.api.http_client import get_http_client
 
-# ✅ Список компаний
-COMPANIES = [
-    "Альфа-Банк",
-    "ВТБ",
-    "X5 Group",
-    "Газпромбанк",
-    "Газпром нефть",
-    "Яндекс",
-    "Ozon",
-    "Аэрофлот",
-    "МТС",
-    "Сбер",
-    "Иви",
-    "AGIMA",
-    "RealWeb"
-]
-
-BASE_URL = "https://api.hh.ru/employers"
 JSON_FILE = "company_ids.json"
 
 
 def get_company_ids():
-    """Получает ID работодателей по именам и сохраняет в JSON"""
-    company_ids = {}
-    for company in COMPANIES:
-        try:
-            response = requests.get(BASE_URL, params={"text": company, "per_page": 1}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("items"):
-                employer = data["items"][0]
-                company_ids[company] = employer["id"]
-            else:
-                company_ids[company] = None
-            print(f"{company}: {company_ids[company]}")
-        except requests.RequestException as e:
-            print(f"Ошибка при запросе {company}: {e}")
-            company_ids[company] = None
-        time.sleep(0.5)
-
-    with open(JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump(company_ids, f, ensure_ascii=False, indent=4)
-    print(f"✅ Сохранено в {JSON_FILE}")
+    """Получает ID работодателей по именам (параллельно) и сохраняет в JSON"""
+    resolve_company_ids(COMPANIES, JSON_FILE)
 
 
 def save_employers_to_db():
@@ -63,11 +27,10 @@ def save_employers_to_db():
 
     db = DatabaseVacancyStorage("hh_vacancies", "postgres", "1q2w3e4r5t", "127.0.0.1")
 
+    client = get_http_client()
     for emp_id in companies:
         try:
-            response = requests.get(f"https://api.hh.ru/employers/{emp_id}", timeout=10)
-            response.raise_for_status()
-            employer = response.json()
+            employer = client.get_json(f"https://api.hh.ru/employers/{emp_id}")
             db.add_employer(employer, source_id=1)
             print(f"✅ Добавлен: {employer.get('name')} (ID {emp_id})")
         except requests.RequestException as e:
@@ -0,0 +1,223 @@
+import threading
+from dataclasses import dataclass
+from typing import List, Sequence, Set, Tuple
+
+from src.bd_sql.salary import SALARY_MID_SQL
+
+
+# salary_stats и индекс salary_mid создаются заново, когда меняется определение salary_mid
+SALARY_MID_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_vacancies_salary_mid
+    ON vacancies (salary_mid DESC) WHERE salary_mid IS NOT NULL
+"""
+
+SALARY_STATS_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS salary_stats AS
+    SELECT
+        1 AS id,
+        COUNT(salary_mid) AS vacancies_with_salary,
+        AVG(salary_mid) AS avg_salary,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY salary_mid) AS p50,
+        percentile_cont(0.75) WITHIN GROUP (ORDER BY salary_mid) AS p75,
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY salary_mid) AS p90,
+        CURRENT_TIMESTAMP AS refreshed_at
+    FROM vacancies
+    WHERE salary_mid IS NOT NULL
+"""
+
+# Уникальный индекс нужен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+SALARY_STATS_ID_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS idx_salary_stats_id ON salary_stats (id)"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Версия схемы: номер, описание и DDL-команды, выполняемые в одной транзакции."""
+
+    version: int
+    description: str
+    statements: Sequence[str]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Таблицы employers и vacancies", [
+        """
+        CREATE TABLE IF NOT EXISTS employers (
+            id SERIAL PRIMARY KEY,
+            hh_id VARCHAR(50) UNIQUE NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS vacancies (
+            id SERIAL PRIMARY KEY,
+            hh_id VARCHAR(50) UNIQUE,
+            title VARCHAR(255) NOT NULL,
+            link VARCHAR(255) NOT NULL,
+            salary_from INTEGER,
+            salary_to INTEGER,
+            currency VARCHAR(10),
+            description TEXT,
+            requirements TEXT,
+            employer_id INTEGER REFERENCES employers(id) ON DELETE CASCADE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    Migration(2, "Индексы для отчетов", [
+        # JOIN/GROUP BY в get_companies_and_vacancies_count
+        "CREATE INDEX IF NOT EXISTS idx_vacancies_employer_id ON vacancies (employer_id)",
+        # ORDER BY created_at DESC в get_all_vacancies
+        "CREATE INDEX IF NOT EXISTS idx_vacancies_created_at ON vacancies (created_at DESC)",
+        # Фильтр и сортировка по средней зарплате в get_vacancies_with_higher_salary
+        """
+        CREATE INDEX IF NOT EXISTS idx_vacancies_salary_avg
+        ON vacancies (((COALESCE(salary_from, 0) + COALESCE(salary_to, 0)) / 2.0) DESC)
+        """,
+    ]),
+    Migration(3, "Полнотекстовый и триграммный поиск по вакансиям", [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        """
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('russian', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('russian', COALESCE(description, '')), 'B') ||
+            setweight(to_tsvector('english', COALESCE(description, '')), 'B') ||
+            setweight(to_tsvector('russian', COALESCE(requirements, '')), 'C') ||
+            setweight(to_tsvector('english', COALESCE(requirements, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_vacancies_search_vector ON vacancies USING GIN (search_vector)",
+        # Подстрочный (ILIKE) и нечеткий поиск; выражение совпадает с SEARCH_TEXT_SQL в search.py
+        """
+        CREATE INDEX IF NOT EXISTS idx_vacancies_search_trgm ON vacancies USING GIN (
+            (COALESCE(title, '') || ' ' || COALESCE(description, '') || ' ' || COALESCE(requirements, ''))
+            gin_trgm_ops
+        )
+        """,
+    ]),
+    Migration(4, "Хранимая средняя зарплата salary_mid и статистика salary_stats", [
+        """
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_mid NUMERIC
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN salary_from IS NOT NULL AND salary_to IS NOT NULL THEN (salary_from + salary_to) / 2.0
+                ELSE COALESCE(salary_from, salary_to)
+            END
+        ) STORED
+        """,
+        "DROP INDEX IF EXISTS idx_vacancies_salary_avg",
+        SALARY_MID_INDEX_SQL,
+        SALARY_STATS_VIEW_SQL,
+        SALARY_STATS_ID_INDEX_SQL,
+    ]),
+    Migration(5, "Индекс для keyset-пагинации по created_at", [
+        "CREATE INDEX IF NOT EXISTS idx_vacancies_created_id ON vacancies (created_at DESC, id DESC)",
+        "DROP INDEX IF EXISTS idx_vacancies_created_at",
+    ]),
+    Migration(6, "Отметки инкрементальной синхронизации sync_state", [
+        """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            scope VARCHAR(255) PRIMARY KEY,
+            watermark TIMESTAMPTZ NOT NULL,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    Migration(7, "Триграммный индекс по нормализованному тексту поиска", [
+        # Выражение совпадает с NORMALIZED_SEARCH_TEXT_SQL в search.py
+        """
+        CREATE INDEX IF NOT EXISTS idx_vacancies_search_norm_trgm ON vacancies USING GIN (
+            replace(lower(regexp_replace(
+                COALESCE(title, '') || COALESCE(' | ' || NULLIF(description, ''), '') ||
+                COALESCE(' | ' || NULLIF(requirements, ''), ''),
+                '</?highlighttext>', '', 'g')), 'ё', 'е')
+            gin_trgm_ops
+        )
+        """,
+    ]),
+    Migration(8, "salary_mid: нулевая граница зарплаты считается неуказанной, как в Vacancy", [
+        # Генерируемую колонку нельзя изменить на месте: пересоздается вместе с зависимыми объектами
+        "DROP MATERIALIZED VIEW IF EXISTS salary_stats",
+        "ALTER TABLE vacancies DROP COLUMN IF EXISTS salary_mid",
+        f"ALTER TABLE vacancies ADD COLUMN salary_mid NUMERIC GENERATED ALWAYS AS ({SALARY_MID_SQL}) STORED",
+        SALARY_MID_INDEX_SQL,
+        SALARY_STATS_VIEW_SQL,
+        SALARY_STATS_ID_INDEX_SQL,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+# Произвольный ключ advisory-блокировки, чтобы миграции не шли параллельно из разных процессов
+_MIGRATION_LOCK_KEY = 7_413_021
+
+_checked: Set[Tuple] = set()
+_checked_lock = threading.Lock()
+
+
+def get_schema_version(cursor) -> int:
+    """Текущая версия схемы (0, если миграции еще не применялись)."""
+    cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(conn, migrations: Sequence[Migration] = MIGRATIONS) -> List[int]:
+    """
+    Применяет недостающие миграции; каждая выполняется в своей транзакции.
+
+    :return: номера примененных версий
+    """
+    applied = []
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.commit()
+        for migration in migrations:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_MIGRATION_LOCK_KEY,))
+            cursor.execute("SELECT 1 FROM schema_version WHERE version = %s", (migration.version,))
+            if cursor.fetchone():
+                conn.commit()
+                continue
+            for statement in migration.statements:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                (migration.version, migration.description)
+            )
+            conn.commit()
+            applied.append(migration.version)
+            print(f"✅ Применена миграция {migration.version}: {migration.description}")
+    return applied
+
+
+def ensure_schema(pool, conn_params: dict, migrations: Sequence[Migration] = MIGRATIONS) -> None:
+    """
+    Приводит схему к последней версии.
+
+    Быстрый путь: в рамках процесса схема для одних параметров подключения проверяется
+    один раз; проверка — это чтение версии из schema_version, а DDL запускается
+    только если версия отстает.
+    """
+    key = tuple(sorted(conn_params.items()))
+    if key in _checked:
+        return
+    with _checked_lock:
+        if key in _checked:
+            return
+        latest = migrations[-1].version
+        with pool.connection() as conn:
+            with conn.cursor() as cursor:
+                current = get_schema_version(cursor)
+            if current < latest:
+                migrate(conn, migrations)
+        _checked.add(key)
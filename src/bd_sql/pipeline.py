@@ -0,0 +1,419 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import requests
+
+from src.api.http_client import HTTPClient, get_http_client
+from src.api.rate_limiter import RateLimiter, TokenBucketRateLimiter, get_rate_limiter
+from src.bd_sql.sync_state import DatabaseSyncState, FileSyncState, later_timestamp, sync_scope
+from src.models.vacancy import Vacancy
+from src.storage.keys import dedupe_vacancies
+
+HH_API_URL = "https://api.hh.ru"
+JSON_FILE = "company_ids.json"
+
+
+def vacancy_from_hh_item(item: Dict[str, Any]) -> Vacancy:
+    """Создает Vacancy из элемента выдачи /vacancies."""
+    snippet = item.get("snippet") or {}
+    return Vacancy(
+        hh_id=item.get("id"),
+        title=item.get("name"),
+        link=item.get("alternate_url"),
+        salary=item.get("salary"),
+        description=snippet.get("responsibility", ""),
+        requirements=snippet.get("requirement", ""),
+        employer_hh_id=(item.get("employer") or {}).get("id")
+    )
+
+
+@dataclass
+class PipelineStats:
+    """Счетчики конвейера загрузки; обновляются по ходу работы."""
+
+    employers: int = 0
+    pages: int = 0
+    fetched: int = 0
+    written: int = 0
+    failed: int = 0
+    expired: int = 0
+    batches: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def vacancies_per_second(self) -> float:
+        """Скорость записи в хранилище, вакансий в секунду."""
+        elapsed = self.elapsed
+        return self.written / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"работодателей: {self.employers}, страниц: {self.pages}, "
+                f"получено: {self.fetched}, записано: {self.written}, удалено: {self.expired}, "
+                f"ошибок: {self.failed}, "
+                f"{self.vacancies_per_second:.1f} вак/с, макс. очередь: {self.max_queue_depth}, "
+                f"время: {self.elapsed:.2f} с")
+
+
+@dataclass
+class _ScopeSync:
+    """Итог загрузки одного набора параметров /vacancies в инкрементальном режиме."""
+
+    params: Dict[str, Any]
+    watermark: Optional[str]
+    found: int
+    # ID всех вакансий — только если загружалась полная выдача (без date_from)
+    ids: Optional[Set[str]] = None
+
+
+class VacancyIngestionPipeline:
+    """
+    Асинхронный конвейер загрузки вакансий работодателей в БД.
+
+    Производители параллельно запрашивают работодателей и страницы их вакансий
+    под общим ограничителем частоты, потребители пачками пишут вакансии в хранилище
+    через ограниченную очередь, так что загрузка и запись идут одновременно.
+    Блокирующие вызовы (HTTP и psycopg2) выполняются в пуле потоков.
+
+    Инкрементальный режим (передан `sync_state`): для каждого работодателя и поискового
+    запроса хранится отметка — последний увиденный published_at, и запрашиваются только
+    вакансии не старше нее (date_from). Отметки сдвигаются после записи всех вакансий
+    и только если загрузка и запись прошли без ошибок. Исчезнувшие с HH вакансии
+    работодателя удаляются (`expire`): число вакансий в хранилище сверяется с "found"
+    в выдаче HH, и только при расхождении собирается полный список ID. Удаление
+    необратимо, поэтому выключено по умолчанию.
+    """
+
+    def __init__(
+            self,
+            storage,
+            client: Optional[HTTPClient] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            base_url: str = HH_API_URL,
+            concurrency: int = 4,
+            queue_size: int = 1000,
+            batch_size: int = 200,
+            writers: int = 1,
+            flush_interval: float = 1.0,
+            load_employers: bool = True,
+            on_progress: Optional[Callable[[PipelineStats], None]] = None,
+            sync_state=None,
+            expire: bool = False
+    ):
+        self.storage = storage
+        self.client = client or get_http_client()
+        # По умолчанию — ограничитель клиента (общий адаптивный у get_http_client)
+        self.rate_limiter = rate_limiter or self.client.rate_limiter or TokenBucketRateLimiter(rate=5, capacity=5)
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.writers = writers
+        self.flush_interval = flush_interval
+        self.load_employers = load_employers
+        self.on_progress = on_progress
+        self.sync_state = sync_state
+        self.expire = expire
+        self.stats = PipelineStats()
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                        revalidate: bool = False) -> Any:
+        """
+        GET к API через кеш клиента.
+
+        :param revalidate: перепроверить закешированный ответ на сервере — по выдаче
+            сдвигаются отметки и удаляются вакансии, устаревшая копия здесь недопустима
+        """
+        url = f"{self.base_url}{path}"
+        # Свежий ответ из кеша не расходует лимит частоты запросов
+        cached = None if revalidate else self.client.get_cached_json(url, params)
+        if cached is not None:
+            return cached
+        async with self._semaphore:
+            await self.rate_limiter.acquire_async()
+            get_json = functools.partial(self.client.get_json, url, params,
+                                         acquired=self.rate_limiter is self.client.rate_limiter,
+                                         revalidate=revalidate)
+            return await asyncio.to_thread(get_json)
+
+    async def _fetch_page(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        data = await self._get_json("/vacancies", {**params, "page": page, "per_page": 100},
+                                    revalidate=self.sync_state is not None)
+        self.stats.pages += 1
+        return data
+
+    async def _enqueue(self, items: Iterable[Dict[str, Any]]) -> None:
+        for item in items:
+            await self._queue.put(vacancy_from_hh_item(item))
+            self.stats.fetched += 1
+            self.stats.queue_depth = self._queue.qsize()
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+
+    async def _produce(self, emp_id: str) -> None:
+        """Загружает работодателя и все страницы его вакансий."""
+        try:
+            if self.load_employers:
+                employer = await self._get_json(f"/employers/{emp_id}")
+                await asyncio.to_thread(self.storage.add_employer, employer)
+            await self._produce_vacancies({"employer_id": emp_id})
+            self.stats.employers += 1
+        except requests.RequestException as e:
+            print(f"Ошибка при загрузке вакансий для {emp_id}: {e}")
+            self.stats.failed += 1
+        except Exception as e:
+            # Некорректный ответ HH (например, published_at) или ошибка хранилища: отметка
+            # этого работодателя не сдвигается, остальные загрузки продолжаются
+            print(f"Ошибка при обработке вакансий для {emp_id}: {e!r}")
+            self.stats.failed += 1
+
+    async def _produce_query(self, params: Dict[str, Any]) -> None:
+        """Загружает все страницы выдачи поискового запроса (например, {"text": "python"})."""
+        try:
+            await self._produce_vacancies(params)
+        except requests.RequestException as e:
+            print(f"Ошибка при загрузке вакансий по запросу {params}: {e}")
+            self.stats.failed += 1
+        except Exception as e:
+            print(f"Ошибка при обработке вакансий по запросу {params}: {e!r}")
+            self.stats.failed += 1
+
+    async def _produce_vacancies(self, params: Dict[str, Any]) -> bool:
+        """
+        Загружает все страницы выдачи /vacancies (в инкрементальном режиме — только новее отметки).
+
+        :return: True, если все страницы загружены
+        """
+        scope = sync_scope(params)
+        watermark = None
+        query = params
+        if self.sync_state is not None:
+            watermark = await asyncio.to_thread(self.sync_state.get, scope)
+            if watermark:
+                query = {**params, "date_from": watermark}
+
+        first = await self._fetch_page(query, 0)
+        await self._enqueue(first.get("items", []))
+        pages = await asyncio.gather(
+            *(self._fetch_page(query, page) for page in range(1, first.get("pages", 1))),
+            return_exceptions=True
+        )
+
+        complete = True
+        latest = watermark
+        ids: Set[str] = set()
+        for data in [first, *pages]:
+            if isinstance(data, Exception):
+                print(f"Ошибка при загрузке страницы вакансий ({scope}): {data}")
+                self.stats.failed += 1
+                complete = False
+                continue
+            if data is not first:
+                await self._enqueue(data.get("items", []))
+            for item in data.get("items", []):
+                ids.add(str(item.get("id")))
+                latest = later_timestamp(latest, item.get("published_at"))
+
+        if complete and self.sync_state is not None:
+            self._synced[scope] = _ScopeSync(params, latest, first.get("found", len(ids)),
+                                             ids if watermark is None else None)
+        return complete
+
+    async def _collect_ids(self, emp_id: str) -> Optional[Set[str]]:
+        """ID всех текущих вакансий работодателя на HH (None, если выдачу не удалось загрузить)."""
+        params = {"employer_id": emp_id}
+        try:
+            first = await self._fetch_page(params, 0)
+            pages = await asyncio.gather(*(self._fetch_page(params, page) for page in range(1, first.get("pages", 1))))
+        except requests.RequestException as e:
+            print(f"Ошибка при проверке вакансий работодателя {emp_id}: {e}")
+            return None
+        ids = {str(item.get("id")) for data in [first, *pages] for item in data.get("items", [])}
+        # HH отдает не больше 2000 вакансий на выдачу: по неполному списку удалять нельзя
+        return ids if len(ids) >= first.get("found", 0) else None
+
+    async def _expire(self, sync: _ScopeSync) -> None:
+        """Удаляет вакансии работодателя, которых больше нет в выдаче HH."""
+        emp_id = sync.params["employer_id"]
+        ids = sync.ids if sync.ids is not None and len(sync.ids) >= sync.found else None
+        if ids is None:
+            try:
+                found = (await self._get_json("/vacancies", {"employer_id": emp_id, "per_page": 1},
+                                              revalidate=True)).get("found", 0)
+            except requests.RequestException as e:
+                print(f"Ошибка при проверке вакансий работодателя {emp_id}: {e}")
+                return
+            if await asyncio.to_thread(self.storage.count_vacancies, emp_id) <= found:
+                return
+            ids = await self._collect_ids(emp_id)
+            if ids is None:
+                return
+        self.stats.expired += await asyncio.to_thread(self.storage.expire_vacancies, emp_id, ids)
+
+    async def _commit_sync(self) -> None:
+        """Удаляет исчезнувшие вакансии и сохраняет новые отметки (после записи всех вакансий)."""
+        if self._write_failed:
+            print("⚠ Не все вакансии записаны — отметки синхронизации не обновлены")
+            return
+        if self.client.offline:
+            # Выдача взята из кеша без проверки на сервере: удалять и сдвигать отметки по ней нельзя
+            print("⚠ Автономный режим — отметки синхронизации не обновлены")
+            return
+        can_expire = self.expire and hasattr(self.storage, "expire_vacancies")
+        for scope, sync in self._synced.items():
+            try:
+                if can_expire and list(sync.params) == ["employer_id"]:
+                    await self._expire(sync)
+                if sync.watermark:
+                    await asyncio.to_thread(self.sync_state.set, scope, sync.watermark)
+            except Exception as e:
+                # Ошибка БД по одному набору не мешает остальным; его отметка остается прежней
+                print(f"Ошибка при обновлении отметки синхронизации ({scope}): {e!r}")
+                self.stats.failed += 1
+
+    def _store_batch(self, batch: List[Vacancy]) -> int:
+        try:
+            return self.storage.add_vacancies(batch, batch_size=len(batch))
+        except Exception as e:
+            print(f"   ❌ Ошибка записи пачки из {len(batch)} вакансий: {e}")
+            self._write_failed = True
+            return 0
+
+    async def _flush(self, batch: List[Vacancy]) -> None:
+        if not batch:
+            return
+        # Одна вакансия может прийти и от работодателя, и по поисковому запросу
+        batch = dedupe_vacancies(batch)
+        stored = await asyncio.to_thread(self._store_batch, batch)
+        self.stats.written += stored
+        self.stats.failed += len(batch) - stored
+        if stored < len(batch):
+            # Часть вакансий пропущена (например, работодатель еще не загружен в БД):
+            # отметки нельзя сдвигать, иначе эти вакансии больше не будут запрошены
+            self._write_failed = True
+        self.stats.batches += 1
+        self.stats.queue_depth = self._queue.qsize()
+        if self.on_progress:
+            self.on_progress(self.stats)
+
+    async def _consume(self) -> None:
+        """Собирает вакансии из очереди в пачки и пишет их в хранилище."""
+        batch: List[Vacancy] = []
+        while True:
+            try:
+                vacancy = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch = []
+                continue
+            if vacancy is None:
+                await self._flush(batch)
+                return
+            batch.append(vacancy)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+
+    async def run(self, employer_ids: Iterable[str] = (),
+                  queries: Iterable[Dict[str, Any]] = ()) -> PipelineStats:
+        """
+        Загружает вакансии всех переданных работодателей и поисковых запросов
+        (параметры /vacancies, например {"text": "python", "area": 1}) и возвращает статистику.
+        """
+        self.stats = PipelineStats()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._synced: Dict[str, _ScopeSync] = {}
+        self._write_failed = False
+
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.writers)]
+        await asyncio.gather(*(self._produce(str(emp_id)) for emp_id in employer_ids),
+                             *(self._produce_query(dict(params)) for params in queries))
+        for _ in consumers:
+            await self._queue.put(None)
+        await asyncio.gather(*consumers)
+        if self.sync_state is not None:
+            await self._commit_sync()
+        if (self.stats.written or self.stats.expired) and hasattr(self.storage, "refresh_salary_stats"):
+            await asyncio.to_thread(self.storage.refresh_salary_stats)
+
+        self.stats.queue_depth = 0
+        self.stats.finished_at = time.monotonic()
+        return self.stats
+
+    def run_sync(self, employer_ids: Iterable[str] = (),
+                 queries: Iterable[Dict[str, Any]] = ()) -> PipelineStats:
+        """Синхронная обертка над `run` для вызова из обычного кода."""
+        return asyncio.run(self.run(employer_ids, queries))
+
+
+def load_employer_ids(file_path: str = JSON_FILE, names: Optional[List[str]] = None) -> List[str]:
+    """Читает ID работодателей из company_ids.json (все или только указанные компании)."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        company_ids = json.load(f)
+    if names:
+        company_ids = {name: company_ids.get(name) for name in names}
+    return [str(cid) for cid in company_ids.values() if cid]
+
+
+if __name__ == "__main__":
+    from src.bd_sql.db import DatabaseVacancyStorage
+
+    parser = argparse.ArgumentParser(description="Асинхронная загрузка вакансий работодателей HH в БД")
+    parser.add_argument("employer_ids", nargs="*", help="ID работодателей (по умолчанию все из JSON)")
+    parser.add_argument("--file", default=JSON_FILE, help="JSON-файл с ID компаний")
+    parser.add_argument("--rate", type=float, default=5.0, help="Запросов к API в секунду")
+    parser.add_argument("--concurrency", type=int, default=4, help="Одновременных запросов к API")
+    parser.add_argument("--batch-size", type=int, default=200, help="Размер пачки записи в БД")
+    parser.add_argument("--query", action="append", default=[], help="Поисковый запрос (text), можно несколько")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Загружать только новые вакансии (отметки в таблице sync_state)")
+    parser.add_argument("--state-file", help="Хранить отметки в локальном JSON-файле вместо БД")
+    parser.add_argument("--expire", action="store_true",
+                        help="Удалять из БД вакансии, снятые с публикации на HH (только с --incremental)")
+    parser.add_argument("--db-name", default=os.getenv("DB_NAME", "hh_vacancies"))
+    parser.add_argument("--db-user", default=os.getenv("DB_USER", "postgres"))
+    parser.add_argument("--db-password", default=os.getenv("DB_PASSWORD", ""))
+    parser.add_argument("--db-host", default=os.getenv("DB_HOST", "127.0.0.1"))
+    args = parser.parse_args()
+
+    if not args.employer_ids and not args.query and not os.path.exists(args.file):
+        parser.error(f"Файл {args.file} не найден, укажите ID работодателей явно")
+
+    storage = DatabaseVacancyStorage(args.db_name, args.db_user, args.db_password, args.db_host)
+    get_rate_limiter().set_rate(args.rate)
+    sync_state = None
+    if args.state_file:
+        sync_state = FileSyncState(args.state_file)
+    elif args.incremental:
+        sync_state = DatabaseSyncState(storage.pool)
+    pipeline = VacancyIngestionPipeline(
+        storage,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        sync_state=sync_state,
+        expire=args.expire,
+        on_progress=lambda stats: print(f"   записано {stats.written}, очередь {stats.queue_depth}, "
+                                        f"{stats.vacancies_per_second:.1f} вак/с")
+    )
+    employer_ids = args.employer_ids or ([] if args.query else load_employer_ids(args.file))
+    stats = pipeline.run_sync(employer_ids, [{"text": text} for text in args.query])
+    print(f"✅ Готово: {stats.summary()}")
+    if pipeline.client.cache is not None:
+        cache_stats = pipeline.client.cache.stats
+        print(f"Кеш ответов: попаданий {cache_stats.hits}, промахов {cache_stats.misses}, "
+              f"перепроверено {cache_stats.revalidated}")
+    limiter = get_rate_limiter().metrics()
+    print(f"Ограничитель: {limiter.rate:.1f} запр/с, отказов 429/503: {limiter.throttled}, "
+          f"ожидание: {limiter.waited:.1f} с")
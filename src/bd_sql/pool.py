@@ -0,0 +1,105 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул соединений PostgreSQL поверх ThreadedConnectionPool.
+
+    В отличие от ThreadedConnectionPool, при исчерпании пула `connection()` ждет
+    освобождения соединения, а не бросает PoolError. Перед выдачей соединение
+    проверяется: закрытые и сломанные отбрасываются, а простаивавшие дольше
+    `health_check_interval` секунд пингуются запросом SELECT 1.
+    """
+
+    def __init__(self, minconn: int = 1, maxconn: int = 10, health_check_interval: float = 30.0,
+                 **conn_params):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self.conn_params = conn_params
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **conn_params)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used: Dict[int, float] = {}
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkout(self):
+        conn = self._pool.getconn()
+        while not self._is_healthy(conn):
+            self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+            conn = self._pool.getconn()
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator["extensions.connection"]:
+        """
+        Выдает соединение из пула на время блока `with`.
+
+        При выходе без исключения транзакция фиксируется, при исключении — откатывается;
+        затем соединение возвращается в пул.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    def closeall(self) -> None:
+        self._pool.closeall()
+        self._last_used.clear()
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(minconn: int = 1, maxconn: int = 10, **conn_params) -> ConnectionPool:
+    """Возвращает общий пул для заданных параметров подключения (создает при первом вызове)."""
+    key = tuple(sorted(conn_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(minconn, maxconn, **conn_params)
+        return pool
+
+
+def close_all_pools(conn_params: Optional[dict] = None) -> None:
+    """Закрывает все общие пулы (или только пул для указанных параметров)."""
+    with _pools_lock:
+        keys = [tuple(sorted(conn_params.items()))] if conn_params else list(_pools)
+        for key in keys:
+            pool = _pools.pop(key, None)
+            if pool is not None:
+                pool.closeall()
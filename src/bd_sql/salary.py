@@ -0,0 +1,62 @@
+from typing import Any, Dict, Optional
+
+from src.models.vacancy import CURRENCY_RATES
+
+# Пороги для отчета «зарплата выше ...»: имя порога -> колонка материализованного представления salary_stats
+SALARY_THRESHOLDS = {
+    "avg": "avg_salary",
+    "p50": "p50",
+    "p75": "p75",
+    "p90": "p90",
+}
+
+SALARY_STATS_SQL = """
+    SELECT vacancies_with_salary, avg_salary, p50, p75, p90, refreshed_at
+    FROM salary_stats
+"""
+
+# Выражение генерируемой колонки vacancies.salary_mid (миграция 8). Правило то же, что у
+# Vacancy.salary_mid и VacancyBatch: середина вилки или одна из границ, 0 — зарплата не указана.
+SALARY_MID_SQL = """
+    CASE
+        WHEN NULLIF(salary_from, 0) IS NOT NULL AND NULLIF(salary_to, 0) IS NOT NULL
+            THEN (salary_from + salary_to) / 2.0
+        ELSE COALESCE(NULLIF(salary_from, 0), NULLIF(salary_to, 0))
+    END
+"""
+
+# salary_mid в рублях; те же курсы, что и в Vacancy.salary_key
+SALARY_RUB_SQL = "salary_mid * CASE UPPER(currency) {} ELSE 1 END".format(
+    " ".join(f"WHEN '{code}' THEN {rate}" for code, rate in CURRENCY_RATES.items())
+)
+
+
+def salary_threshold_column(threshold: str) -> str:
+    """Колонка salary_stats для порога ("avg", "p50", "p75" или "p90")."""
+    try:
+        return SALARY_THRESHOLDS[threshold]
+    except KeyError:
+        raise ValueError(f"Неизвестный порог зарплаты: {threshold}. "
+                         f"Допустимые: {', '.join(SALARY_THRESHOLDS)}") from None
+
+
+def fetch_salary_stats(cursor) -> Optional[Dict[str, Any]]:
+    """Читает строку salary_stats (None, если вакансий с зарплатой нет)."""
+    cursor.execute(SALARY_STATS_SQL)
+    row = cursor.fetchone()
+    if not row or not row[0]:
+        return None
+    count, avg_salary, p50, p75, p90, refreshed_at = row
+    return {
+        "vacancies_with_salary": count,
+        "avg": round(float(avg_salary), 2),
+        "p50": float(p50),
+        "p75": float(p75),
+        "p90": float(p90),
+        "refreshed_at": refreshed_at,
+    }
+
+
+def refresh_salary_stats(cursor) -> None:
+    """Пересчитывает salary_stats, не блокируя читателей (вызывать после загрузки вакансий)."""
+    cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY salary_stats")
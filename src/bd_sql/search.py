@@ -0,0 +1,69 @@
+from typing import Any, List, Tuple
+
+from src.models.vacancy import normalize_keyword
+
+# Текст, по которому строится триграммный индекс idx_vacancies_search_trgm (см. migrations.py).
+# Выражение в запросе должно совпадать с индексным, иначе индекс не используется.
+SEARCH_TEXT_SQL = "(COALESCE(v.title, '') || ' ' || COALESCE(v.description, '') || ' ' || COALESCE(v.requirements, ''))"
+
+# Тот же текст, что Vacancy.search_text в файловых хранилищах: поля через " | ", без разметки
+# <highlighttext>, в нижнем регистре, ё → е. Выражение совпадает с индексом idx_vacancies_search_norm_trgm.
+NORMALIZED_SEARCH_TEXT_SQL = (
+    "replace(lower(regexp_replace("
+    "COALESCE(v.title, '') || COALESCE(' | ' || NULLIF(v.description, ''), '') || "
+    "COALESCE(' | ' || NULLIF(v.requirements, ''), ''), "
+    "'</?highlighttext>', '', 'g')), 'ё', 'е')"
+)
+
+# Запрос пользователя разбирается в обеих конфигурациях, совпадения по любой из них подходят
+TSQUERY_SQL = "(websearch_to_tsquery('russian', %s) || websearch_to_tsquery('english', %s))"
+
+SEARCH_MODES = ("fts", "substring", "fuzzy")
+
+
+def search_clause(keyword: str, mode: str = "fts") -> Tuple[str, str, List[Any]]:
+    """
+    Собирает условие WHERE и выражение ранжирования для поиска по ключевому слову.
+
+    Режимы:
+      * ``fts`` — полнотекстовый поиск по search_vector (GIN), ранжирование ts_rank_cd;
+      * ``substring`` — подстрока в нормализованном тексте, как в файловых хранилищах
+        (регистр и ё/е не важны; ILIKE по триграммному индексу);
+      * ``fuzzy`` — нечеткое совпадение слов (оператор <% из pg_trgm), устойчиво к опечаткам.
+
+    Таблица vacancies в запросе должна иметь псевдоним ``v``.
+
+    :return: (условие WHERE, выражение ранга для ORDER BY ... DESC, параметры в порядке появления)
+    """
+    if mode == "fts":
+        return (
+            f"v.search_vector @@ {TSQUERY_SQL}",
+            f"ts_rank_cd(v.search_vector, {TSQUERY_SQL})",
+            [keyword, keyword, keyword, keyword],
+        )
+    if mode == "substring":
+        escaped = normalize_keyword(keyword).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return (
+            f"{NORMALIZED_SEARCH_TEXT_SQL} ILIKE %s",
+            "similarity(v.title, %s)",
+            [f"%{escaped}%", keyword],
+        )
+    if mode == "fuzzy":
+        return (
+            f"%s <%% {SEARCH_TEXT_SQL}",
+            f"word_similarity(%s, {SEARCH_TEXT_SQL})",
+            [keyword, keyword],
+        )
+    raise ValueError(f"Неизвестный режим поиска: {mode}. Допустимые: {', '.join(SEARCH_MODES)}")
+
+
+def keyword_search_mode(cursor, keyword: str) -> str:
+    """
+    Режим поиска по ключевому слову: "fts", если есть полнотекстовые совпадения, иначе "substring".
+
+    Режим определяется по всей таблице, а не по странице, чтобы страницы одного поиска
+    не смешивали результаты разных режимов.
+    """
+    where, _, params = search_clause(keyword, "fts")
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM vacancies v WHERE {where})", params)
+    return "fts" if cursor.fetchone()[0] else "substring"
@@ -0,0 +1,49 @@
+import uuid
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+# Ключ страницы для keyset-пагинации: (created_at, id) последней строки предыдущей страницы
+PageKey = Tuple[Any, int]
+
+
+def stream_rows(pool, query: str, params: Sequence[Any] = (), itersize: int = 1000) -> Iterator[tuple]:
+    """
+    Построчно отдает результат запроса через именованный (серверный) курсор.
+
+    Строки забираются с сервера порциями по `itersize`, поэтому память не зависит
+    от размера выборки, а первые строки доступны сразу. Соединение из пула занято,
+    пока генератор не исчерпан или не закрыт.
+    """
+    with pool.connection() as conn:
+        with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+
+
+def keyset_page(pool, columns: str, limit: int, after: Optional[PageKey] = None,
+                source: str = "vacancies v") -> Tuple[List[tuple], Optional[PageKey]]:
+    """
+    Одна страница вакансий, от новых к старым, без OFFSET.
+
+    Условие `(created_at, id) < after` идет по индексу idx_vacancies_created_id,
+    поэтому любая страница читается так же быстро, как первая.
+
+    :param columns: список выбираемых колонок (к нему добавляются v.created_at и v.id)
+    :param after: ключ, возвращенный предыдущим вызовом (None — первая страница)
+    :return: (строки без служебных колонок, ключ следующей страницы или None)
+    """
+    where = "WHERE (v.created_at, v.id) < (%s, %s)" if after else ""
+    params = (*after, limit) if after else (limit,)
+    with pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {columns}, v.created_at, v.id
+                FROM {source}
+                {where}
+                ORDER BY v.created_at DESC, v.id DESC
+                LIMIT %s
+            """, params)
+            rows = cursor.fetchall()
+    next_key = (rows[-1][-2], rows[-1][-1]) if len(rows) == limit else None
+    return [row[:-2] for row in rows], next_key
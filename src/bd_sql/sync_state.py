@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# Формат published_at в ответах HH и параметра date_from
+HH_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def sync_scope(params: Dict[str, Any]) -> str:
+    """Ключ отметки синхронизации для параметров /vacancies: "employer_id=1740", "area=1&text=python"."""
+    return "&".join(f"{key}={params[key]}" for key in sorted(params))
+
+
+def later_timestamp(current: Optional[str], candidate: Optional[str]) -> Optional[str]:
+    """Более поздняя из двух отметок времени HH (сравниваются с учетом часового пояса)."""
+    if not candidate:
+        return current
+    if not current:
+        return candidate
+    return candidate if datetime.strptime(candidate, HH_DATETIME_FORMAT) > \
+        datetime.strptime(current, HH_DATETIME_FORMAT) else current
+
+
+class FileSyncState:
+    """
+    Отметки синхронизации (последний увиденный published_at) в локальном JSON-файле.
+
+    Файл переписывается атомарно (временный файл + os.replace) при каждом `set`.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                self._marks: Dict[str, str] = json.load(file)
+        except FileNotFoundError:
+            self._marks = {}
+
+    def get(self, scope: str) -> Optional[str]:
+        return self._marks.get(scope)
+
+    def set(self, scope: str, watermark: str) -> None:
+        with self._lock:
+            self._marks[scope] = watermark
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            tmp_path = self.file_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self._marks, file, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.file_path)
+
+
+class DatabaseSyncState:
+    """Отметки синхронизации в таблице sync_state (см. миграцию 6)."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def get(self, scope: str) -> Optional[str]:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT watermark FROM sync_state WHERE scope = %s", (scope,))
+                row = cursor.fetchone()
+        return row[0].strftime(HH_DATETIME_FORMAT) if row else None
+
+    def set(self, scope: str, watermark: str) -> None:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO sync_state (scope, watermark, synced_at)
+                    VALUES (%s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (scope)
+                    DO UPDATE SET
+                        watermark = GREATEST(sync_state.watermark, EXCLUDED.watermark),
+                        synced_at = EXCLUDED.synced_at
+                """, (scope, datetime.strptime(watermark, HH_DATETIME_FORMAT)))
+            conn.commit()
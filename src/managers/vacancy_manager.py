@@ -1,4 +1,6 @@
-from typing import List
+import heapq
+from operator import attrgetter
+from typing import List, Optional
 from ..api import VacancyAPI
 from ..storage import VacancyStorage
 from ..models import Vacancy
@@ -14,19 +16,33 @@ class VacancyManager:
     def fetch_and_store_vacancies(self, search_query: str) -> None:
         """Получает вакансии по API и сохраняет их в хранилище."""
         vacancies_data = self.api.get_vacancies(search_query)
+        vacancies = []
         for data in vacancies_data:
             try:
-                vacancy = Vacancy.validate_and_create(data)
-                self.storage.add_vacancy(vacancy)
+                vacancies.append(Vacancy.validate_and_create(data))
             except ValueError as e:
                 print(f"Ошибка при создании вакансии: {e}")
+        if vacancies:
+            self.storage.add_vacancies(vacancies)
 
     def get_top_vacancies_by_salary(self, n: int) -> List[Vacancy]:
-        """Возвращает топ N вакансий по зарплате."""
-        vacancies = self.storage.get_vacancies({})
-        vacancies.sort(reverse=True)
-        return vacancies[:n]
-
-    def get_vacancies_with_keyword(self, keyword: str) -> List[Vacancy]:
-        """Возвращает вакансии, содержащие ключевое слово в описании."""
-        return self.storage.get_vacancies({"keyword": keyword})
+        """
+        Возвращает топ N вакансий по зарплате (Vacancy.salary_key, в рублях).
+
+        Если хранилище умеет отбирать топ само (например, PostgreSQL через
+        ORDER BY ... LIMIT), отбор выполняется в нем. Иначе вакансии читаются
+        потоково, а в памяти держится куча только из N лучших.
+        """
+        top_by_salary = getattr(self.storage, "get_top_vacancies_by_salary", None)
+        if callable(top_by_salary):
+            return top_by_salary(n)
+        return heapq.nlargest(n, self.storage.iter_vacancies({}), key=attrgetter("salary_key"))
+
+    def get_vacancies_with_keyword(self, keyword: str, limit: Optional[int] = None) -> List[Vacancy]:
+        """
+        Возвращает вакансии, содержащие ключевое слово в описании.
+
+        Хранилище читается потоково: при `limit` чтение останавливается
+        на первых `limit` найденных вакансиях.
+        """
+        return list(self.storage.iter_vacancies({"keyword": keyword}, limit=limit))
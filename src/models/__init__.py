@@ -1,3 +1,4 @@
-from .vacancy import Vacancy
+from .vacancy import Vacancy, CURRENCY_RATES, normalize_keyword, normalize_search_text
+from .batch import VacancyBatch
 
-__all__ = ['Vacancy']
+__all__ = ['Vacancy', 'CURRENCY_RATES', 'VacancyBatch', 'normalize_keyword', 'normalize_search_text']
@@ -0,0 +1,178 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .vacancy import CURRENCY_RATES, Vacancy
+
+# Колонки, которые хранятся массивами объектов (строки и идентификаторы)
+TEXT_COLUMNS = ("title", "link", "description", "requirements", "hh_id", "employer_hh_id")
+
+# Те же пороги, что и у отчета «зарплата выше ...» в PostgreSQL (SALARY_THRESHOLDS)
+PERCENTILES = {"p50": 50, "p75": 75, "p90": 90}
+
+
+class VacancyBatch:
+    """
+    Пачка вакансий в колоночном виде для векторных фильтров и статистики.
+
+    Зарплаты хранятся массивами NumPy: salary_from и salary_to (float, NaN — не указана)
+    и currency_code (индекс в списке `currencies`). Текстовые поля — массивами
+    объектов, поэтому выборка по маске не копирует сами строки.
+
+    Правила совпадают с Vacancy и колонкой salary_mid в PostgreSQL (SALARY_MID_SQL):
+    середина вилки или одна из границ, 0 считается отсутствием зарплаты; статистика
+    совпадает с salary_stats (среднее и перцентили с линейной интерполяцией
+    по вакансиям с зарплатой).
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], salary_from: np.ndarray, salary_to: np.ndarray,
+                 currency_code: np.ndarray, currencies: Sequence[Optional[str]]):
+        self.columns = columns
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.currency_code = currency_code
+        self.currencies = list(currencies)
+        self.salary_mid = self._salary_mid(salary_from, salary_to)
+
+    @classmethod
+    def from_vacancies(cls, vacancies: Iterable[Vacancy]) -> "VacancyBatch":
+        """Собирает пачку за один проход по вакансиям (подходит и для генератора iter_vacancies)."""
+        texts: Dict[str, List[Any]] = {name: [] for name in TEXT_COLUMNS}
+        salary_from: List[Optional[int]] = []
+        salary_to: List[Optional[int]] = []
+        codes: List[int] = []
+        currency_index: Dict[Optional[str], int] = {}
+        for vacancy in vacancies:
+            for name, values in texts.items():
+                values.append(getattr(vacancy, name))
+            salary_from.append(vacancy.salary_from)
+            salary_to.append(vacancy.salary_to)
+            codes.append(currency_index.setdefault(vacancy.currency, len(currency_index)))
+
+        columns = {name: _object_array(values) for name, values in texts.items()}
+        return cls(
+            columns,
+            np.array(salary_from, dtype=float),
+            np.array(salary_to, dtype=float),
+            np.array(codes, dtype=np.int32),
+            list(currency_index),
+        )
+
+    @staticmethod
+    def _salary_mid(salary_from: np.ndarray, salary_to: np.ndarray) -> np.ndarray:
+        salary_from = np.where(salary_from == 0, np.nan, salary_from)
+        salary_to = np.where(salary_to == 0, np.nan, salary_to)
+        both = (salary_from + salary_to) / 2
+        return np.where(np.isnan(salary_from), salary_to, np.where(np.isnan(salary_to), salary_from, both))
+
+    def __len__(self) -> int:
+        return len(self.salary_from)
+
+    def __iter__(self) -> Iterator[Vacancy]:
+        for i in range(len(self)):
+            yield self.vacancy(i)
+
+    def vacancy(self, i: int) -> Vacancy:
+        """Вакансия в строке i."""
+        columns = self.columns
+        return Vacancy.from_row((
+            columns["title"][i],
+            columns["link"][i],
+            _optional_int(self.salary_from[i]),
+            _optional_int(self.salary_to[i]),
+            self.currencies[self.currency_code[i]] if len(self.currencies) else None,
+            columns["description"][i],
+            columns["requirements"][i],
+            columns["hh_id"][i],
+            columns["employer_hh_id"][i],
+        ))
+
+    def to_vacancies(self) -> List[Vacancy]:
+        return list(self)
+
+    def select(self, rows: np.ndarray) -> "VacancyBatch":
+        """Новая пачка из строк по булевой маске или массиву индексов."""
+        batch = VacancyBatch.__new__(VacancyBatch)
+        batch.columns = {name: values[rows] for name, values in self.columns.items()}
+        batch.salary_from = self.salary_from[rows]
+        batch.salary_to = self.salary_to[rows]
+        batch.currency_code = self.currency_code[rows]
+        batch.currencies = self.currencies
+        batch.salary_mid = self.salary_mid[rows]
+        return batch
+
+    @property
+    def salary(self) -> np.ndarray:
+        """Зарплата для сравнения, как Vacancy.get_salary(): 0 вместо отсутствующей."""
+        return np.nan_to_num(self.salary_mid, nan=0.0)
+
+    @property
+    def salary_rub(self) -> np.ndarray:
+        """Зарплата в рублях, как Vacancy.salary_key."""
+        rates = np.array(
+            [CURRENCY_RATES.get((currency or "RUR").upper(), 1.0) for currency in self.currencies] or [1.0]
+        )
+        return self.salary * rates[self.currency_code]
+
+    def min_salary_mask(self, min_salary: float) -> np.ndarray:
+        """Маска вакансий с зарплатой не ниже min_salary (критерий "min_salary" хранилищ)."""
+        return self.salary >= min_salary
+
+    def with_min_salary(self, min_salary: float) -> "VacancyBatch":
+        return self.select(self.min_salary_mask(min_salary))
+
+    def _salaries(self) -> np.ndarray:
+        return self.salary_mid[~np.isnan(self.salary_mid)]
+
+    def mean_salary(self) -> Optional[float]:
+        salaries = self._salaries()
+        return float(salaries.mean()) if len(salaries) else None
+
+    def median_salary(self) -> Optional[float]:
+        salaries = self._salaries()
+        return float(np.median(salaries)) if len(salaries) else None
+
+    def percentiles(self, *q: float) -> List[float]:
+        """Перцентили зарплаты (0–100) с линейной интерполяцией, как percentile_cont."""
+        salaries = self._salaries()
+        if not len(salaries):
+            return [float("nan")] * len(q)
+        return [float(value) for value in np.percentile(salaries, q)]
+
+    def salary_stats(self) -> Optional[Dict[str, Any]]:
+        """Статистика в формате fetch_salary_stats (None, если вакансий с зарплатой нет)."""
+        salaries = self._salaries()
+        if not len(salaries):
+            return None
+        stats: Dict[str, Any] = {"vacancies_with_salary": len(salaries), "avg": round(float(salaries.mean()), 2)}
+        values = np.percentile(salaries, list(PERCENTILES.values()))
+        stats.update({name: float(value) for name, value in zip(PERCENTILES, values)})
+        return stats
+
+    def above(self, threshold: str = "avg") -> "VacancyBatch":
+        """
+        Вакансии с зарплатой выше порога: средней ("avg") или перцентиля ("p50", "p75", "p90"),
+        по убыванию зарплаты — как DatabaseVacancyStorage.get_vacancies_with_higher_salary.
+        """
+        if threshold == "avg":
+            value = self.mean_salary()
+        elif threshold in PERCENTILES:
+            value = self.percentiles(PERCENTILES[threshold])[0]
+        else:
+            raise ValueError(f"Неизвестный порог зарплаты: {threshold}. "
+                             f"Допустимые: avg, {', '.join(PERCENTILES)}")
+        if value is None:
+            return self.select(np.zeros(len(self), dtype=bool))
+        rows = np.flatnonzero(self.salary_mid > value)
+        order = np.argsort(-self.salary_mid[rows], kind="stable")
+        return self.select(rows[order])
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _optional_int(value: float) -> Optional[int]:
+    return None if np.isnan(value) else int(value)
@@ -1,8 +1,60 @@
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, Sequence
+
+# Примерные курсы валют HH к рублю: используются только для сравнения зарплат в разных валютах
+CURRENCY_RATES: Dict[str, float] = {
+    "RUR": 1.0,
+    "RUB": 1.0,
+    "USD": 90.0,
+    "EUR": 98.0,
+    "KZT": 0.18,
+    "BYR": 27.0,
+    "UAH": 2.2,
+    "UZS": 0.0072,
+    "KGS": 1.03,
+    "AZN": 53.0,
+    "GEL": 33.0,
+}
+
+_HIGHLIGHT_RE = re.compile(r"</?highlighttext>")
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Приводит текст к виду для поиска по подстроке: без разметки <highlighttext> HH,
+    casefold (регистр не важен) и ё → е. Ключевое слово нормализуется так же.
+    """
+    return _HIGHLIGHT_RE.sub("", text).casefold().replace("ё", "е")
+
+
+@lru_cache(maxsize=1024)
+def normalize_keyword(keyword: str) -> str:
+    """normalize_search_text для ключевого слова запроса; кешируется, т.к. проверяется для каждой вакансии."""
+    return normalize_search_text(keyword)
 
 
 class Vacancy:
-    """Класс для представления вакансии."""
+    """
+    Класс для представления вакансии.
+
+    Атрибуты хранятся в __slots__ (без __dict__ у каждого экземпляра), зарплата —
+    плоскими полями salary_from/salary_to/currency; словарь `salary` собирается
+    по запросу для совместимости (прочие ключи зарплаты HH, например gross,
+    хранятся как есть). Середина вилки вычисляется один раз при установке зарплаты.
+
+    Вакансии упорядочиваются по зарплате в рублях (`salary_key`), как в VacancyManager;
+    равенство и хеш — по идентичности объекта, поэтому вакансии с одинаковой
+    зарплатой не считаются равными.
+
+    Нормализованный текст для поиска (`search_text`) считается один раз при первом
+    обращении или берется из файла хранилища, если был сохранен вместе с записью.
+    """
+
+    __slots__ = (
+        "title", "link", "description", "requirements", "hh_id", "employer_hh_id",
+        "salary_from", "salary_to", "currency", "salary_mid", "_salary_extra", "_search_text",
+    )
 
     def __init__(
             self,
@@ -12,7 +64,8 @@ class Vacancy:
             description: str,
             requirements: str,
             hh_id: Optional[str] = None,           # ID вакансии на HH
-            employer_hh_id: Optional[str] = None   # ID работодателя на HH
+            employer_hh_id: Optional[str] = None,  # ID работодателя на HH
+            search_text: Optional[str] = None      # сохраненный нормализованный текст для поиска
     ):
         self.title = title
         self.link = link
@@ -20,7 +73,105 @@ class Vacancy:
         self.description = description
         self.requirements = requirements
         self.hh_id = hh_id
-        self.employer_hh_id = employer_hh_id  # <-- добавлено
+        self.employer_hh_id = employer_hh_id
+        self._search_text = search_text or None
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Vacancy":
+        """
+        Быстрое создание из строки с плоской зарплатой, без проверок validate_and_create.
+
+        Порядок полей: title, link, salary_from, salary_to, currency, description,
+        requirements[, hh_id[, employer_hh_id]] — как в запросах к таблице vacancies.
+        """
+        vacancy = cls.__new__(cls)
+        (vacancy.title, vacancy.link, salary_from, salary_to, currency,
+         vacancy.description, vacancy.requirements) = row[:7]
+        vacancy.hh_id = row[7] if len(row) > 7 else None
+        vacancy.employer_hh_id = row[8] if len(row) > 8 else None
+        vacancy._search_text = None
+        vacancy._set_salary(salary_from, salary_to, currency)
+        return vacancy
+
+    def _set_salary(self, salary_from: Optional[int], salary_to: Optional[int],
+                    currency: Optional[str], extra: Optional[Dict[str, Any]] = None) -> None:
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.currency = currency
+        self._salary_extra = extra or None
+        if salary_from and salary_to:
+            self.salary_mid = (salary_from + salary_to) / 2
+        else:
+            self.salary_mid = salary_from or salary_to or None
+
+    @property
+    def salary(self) -> Optional[Dict[str, Any]]:
+        """Зарплата в формате HH ({"from", "to", "currency"} и прочие ключи, например gross); None, если не указана."""
+        if self.salary_from is None and self.salary_to is None and self.currency is None and not self._salary_extra:
+            return None
+        return {"from": self.salary_from, "to": self.salary_to, "currency": self.currency,
+                **(self._salary_extra or {})}
+
+    @salary.setter
+    def salary(self, salary: Optional[Dict[str, Any]]) -> None:
+        salary = salary or {}
+        salary_from, salary_to = salary.get("from"), salary.get("to")
+        self._set_salary(
+            int(salary_from) if salary_from is not None else None,
+            int(salary_to) if salary_to is not None else None,
+            salary.get("currency"),
+            {key: value for key, value in salary.items() if key not in ("from", "to", "currency")},
+        )
+
+    @property
+    def search_text(self) -> str:
+        """Название, описание и требования одной строкой, нормализованные normalize_search_text."""
+        if self._search_text is None:
+            # Разделитель не дает ключевому слову совпасть на стыке полей и не ломает строки TXT/CSV
+            parts = (self.title, self.description, self.requirements)
+            self._search_text = normalize_search_text(" | ".join(part for part in parts if part))
+        return self._search_text
+
+    def get_salary(self) -> float:
+        """Середина вилки, одна из границ, если указана только она, или 0."""
+        return self.salary_mid or 0
+
+    @property
+    def salary_key(self) -> float:
+        """
+        Зарплата для сравнения вакансий: середина вилки (или одна из границ),
+        пересчитанная в рубли по CURRENCY_RATES; 0, если зарплата не указана.
+        """
+        if not self.salary_mid:
+            return 0
+        currency = (self.currency or "RUR").upper()
+        return self.salary_mid * CURRENCY_RATES.get(currency, 1.0)
+
+    def __lt__(self, other: "Vacancy") -> bool:
+        if not isinstance(other, Vacancy):
+            return NotImplemented
+        return self.salary_key < other.salary_key
+
+    def __le__(self, other: "Vacancy") -> bool:
+        if not isinstance(other, Vacancy):
+            return NotImplemented
+        return self.salary_key <= other.salary_key
+
+    def __gt__(self, other: "Vacancy") -> bool:
+        if not isinstance(other, Vacancy):
+            return NotImplemented
+        return self.salary_key > other.salary_key
+
+    def __ge__(self, other: "Vacancy") -> bool:
+        if not isinstance(other, Vacancy):
+            return NotImplemented
+        return self.salary_key >= other.salary_key
+
+    def __repr__(self) -> str:
+        return (
+            f"Vacancy(title={self.title!r}, link={self.link!r}, salary={self.salary!r}, "
+            f"description={self.description!r})"
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Преобразует объект Vacancy в словарь."""
@@ -31,7 +182,8 @@ class Vacancy:
             "description": self.description,
             "requirements": self.requirements,
             "hh_id": self.hh_id,
-            "employer_hh_id": self.employer_hh_id  # <-- добавлено
+            "employer_hh_id": self.employer_hh_id,
+            "search_text": self.search_text,
         }
 
     @classmethod
@@ -53,6 +205,8 @@ class Vacancy:
             employer_id = data["employer"].get("id")
         elif "employer_id" in data:
             employer_id = data["employer_id"]
+        elif "employer_hh_id" in data:  # формат to_dict()
+            employer_id = data["employer_hh_id"]
 
         return cls(
             title=title,
@@ -61,7 +215,8 @@ class Vacancy:
             description=data.get("description", ""),
             requirements=data.get("snippet", {}).get("requirement", "") if isinstance(data.get("snippet"), dict)
             else data.get("requirements", ""),
-            hh_id=data.get("id"),
-            employer_hh_id=employer_id
+            hh_id=data.get("id") or data.get("hh_id"),
+            employer_hh_id=employer_id,
+            search_text=data.get("search_text"),
         )
 
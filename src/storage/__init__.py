@@ -1,8 +1,12 @@
 from .base import VacancyStorage
 from .json_storage import JSONVacancyStorage
+from .jsonl_storage import JSONLVacancyStorage
 from .excel_storage import ExcelVacancyStorage
 from .csv_storage import CSVVacancyStorage
 from .txt_storage import TXTVacancyStorage
+from .indexed_storage import IndexedVacancyStorage
+from .columnar_storage import ColumnarVacancyStorage
 
-__all__ = ['VacancyStorage', 'JSONVacancyStorage', 'ExcelVacancyStorage', 'CSVVacancyStorage', 'TXTVacancyStorage']
+__all__ = ['VacancyStorage', 'JSONVacancyStorage', 'JSONLVacancyStorage', 'ExcelVacancyStorage',
+           'CSVVacancyStorage', 'TXTVacancyStorage', 'IndexedVacancyStorage', 'ColumnarVacancyStorage']
 
@@ -1,6 +1,8 @@
 import abc
-from typing import List, Dict, Any
-from ..models import Vacancy
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from ..models import Vacancy, VacancyBatch
+from .criteria import compile_criteria
 
 
 class VacancyStorage(abc.ABC):
@@ -11,59 +13,70 @@ class VacancyStorage(abc.ABC):
         """Добавляет вакансию в хранилище."""
         pass
 
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Добавляет несколько вакансий за одну операцию.
+
+        Базовая реализация вызывает add_vacancy для каждой вакансии; хранилища
+        переопределяют ее, чтобы открывать и записывать файл один раз на пачку.
+        """
+        for vacancy in vacancies:
+            self.add_vacancy(vacancy)
+
     @abc.abstractmethod
     def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
         """Получает вакансии по критериям."""
         pass
 
+    def iter_vacancies(self, criteria: Dict[str, Any], limit: Optional[int] = None) -> Iterator[Vacancy]:
+        """
+        Потоково отдает вакансии, подходящие под критерии.
+
+        Записи читаются, разбираются и проверяются по одной, поэтому память
+        не зависит от размера хранилища; при `limit` чтение прекращается,
+        как только найдено нужное число вакансий.
+        """
+        stored = self._iter_stored()
+        matched = filter(compile_criteria(criteria), stored) if criteria else stored
+        return islice(matched, limit) if limit is not None else matched
+
+    def get_batch(self, criteria: Optional[Dict[str, Any]] = None) -> VacancyBatch:
+        """Вакансии по критериям в колоночном виде для векторной фильтрации и статистики."""
+        return VacancyBatch.from_vacancies(self.iter_vacancies(criteria or {}))
+
+    def get_salary_stats(self) -> Optional[Dict[str, Any]]:
+        """Средняя зарплата и перцентили — в том же формате, что и у DatabaseVacancyStorage."""
+        return self.get_batch().salary_stats()
+
+    def get_vacancies_with_higher_salary(self, threshold: str = "avg") -> List[Vacancy]:
+        """Вакансии с зарплатой выше средней ("avg") или перцентиля ("p50", "p75", "p90")."""
+        return self.get_batch().above(threshold).to_vacancies()
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        """
+        Потоково отдает все вакансии хранилища без фильтрации.
+
+        Хранилища переопределяют этот метод; базовая реализация опирается
+        на get_vacancies и нужна для хранилищ, которые его не переопределили.
+        """
+        return iter(self.get_vacancies({}))
+
     @abc.abstractmethod
     def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
         """Удаляет вакансии по критериям."""
         pass
 
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Заменяет содержимое хранилища переданными вакансиями.
+
+        Файловые хранилища переопределяют метод, чтобы переписать файл за один раз.
+        """
+        self.delete_vacancy({})
+        self.add_vacancies(vacancies)
+
     def _filter_vacancies(self, vacancies: List[Vacancy], criteria: Dict[str, Any]) -> List[Vacancy]:
-        """Базовая реализация фильтрации вакансий."""
+        """Вакансии из списка, подходящие под критерии (см. compile_criteria)."""
         if not criteria:
             return vacancies
-
-        filtered = []
-        for vacancy in vacancies:
-            matches = True
-            for key, value in criteria.items():
-                if key == "keyword":
-                    keyword_lower = value.lower()
-                    title_match = keyword_lower in vacancy.title.lower()
-                    desc_match = keyword_lower in vacancy.description.lower()
-                    req_match = keyword_lower in vacancy.requirements.lower()
-
-                    if not (title_match or desc_match or req_match):
-                        matches = False
-                        break
-                elif key == "min_salary":
-                    if vacancy.get_salary() < value:
-                        matches = False
-                        break
-                elif getattr(vacancy, key, None) != value:
-                    matches = False
-                    break
-            if matches:
-                filtered.append(vacancy)
-        return filtered
-
-    def _matches_criteria(self, vacancy: Vacancy, criteria: Dict[str, Any]) -> bool:
-        """Проверяет, соответствует ли вакансия критериям."""
-        for key, value in criteria.items():
-            if key == "keyword":
-                keyword_lower = value.lower()
-                title_match = keyword_lower in vacancy.title.lower()
-                desc_match = keyword_lower in vacancy.description.lower()
-                req_match = keyword_lower in vacancy.requirements.lower()
-
-                if not (title_match or desc_match or req_match):
-                    return False
-            elif key == "min_salary":
-                if vacancy.get_salary() < value:
-                    return False
-            elif getattr(vacancy, key, None) != value:
-                return False
-        return True
+        return list(filter(compile_criteria(criteria), vacancies))
@@ -0,0 +1,395 @@
+import mmap
+import os
+import struct
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .base import VacancyStorage
+from .criteria import compile_criteria, normalize_criteria
+from .keys import dedupe_vacancies, vacancy_key
+from ..models import Vacancy, VacancyBatch, normalize_keyword
+from ..models.batch import TEXT_COLUMNS
+
+# Формат файла (все числа little-endian):
+#   MAGIC | rows: u64 | buffers: u32 | каталог буферов: (имя 32s, смещение u64, длина u64) * buffers | буферы
+# Каждый буфер выровнен на 8 байт, поэтому числовые колонки читаются из mmap без копирования.
+# Строковая колонка X хранится тремя буферами: X.offsets (int64, rows + 1), X.nulls (uint8) и X.data (UTF-8).
+MAGIC = b"VACCOL01"
+_HEADER = struct.Struct("<QI")
+_ENTRY = struct.Struct("<32sQQ")
+
+STRING_COLUMNS = ("title", "link", "currency", "description", "requirements", "hh_id", "employer_hh_id",
+                  "search_text")
+INT_COLUMNS = ("salary_from", "salary_to")
+# Значение int64, которым в колонках зарплаты обозначается NULL
+INT_NULL = int(np.iinfo(np.int64).min)
+# Сколько строк декодируется за раз при потоковом чтении
+_CHUNK = 1024
+
+
+class _Strings(NamedTuple):
+    offsets: np.ndarray
+    nulls: np.ndarray
+    data: bytes
+
+    @classmethod
+    def encode(cls, values: Sequence[Optional[str]]) -> "_Strings":
+        encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        nulls = np.array([value is None for value in values], dtype=np.uint8)
+        return cls(offsets, nulls, b"".join(encoded))
+
+    def concat(self, other: "_Strings") -> "_Strings":
+        return _Strings(
+            np.concatenate([self.offsets[:-1], other.offsets + self.offsets[-1]]),
+            np.concatenate([self.nulls, other.nulls]),
+            self.data + other.data,
+        )
+
+    def take(self, rows: np.ndarray) -> "_Strings":
+        starts, ends = self.offsets[rows], self.offsets[rows + 1]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        data = b"".join(self.data[start:end] for start, end in zip(starts.tolist(), ends.tolist()))
+        return _Strings(offsets, self.nulls[rows], data)
+
+
+class _Snapshot:
+    """Открытый через mmap файл снимка: колонки читаются по требованию и без копирования."""
+
+    def __init__(self, file_path: str):
+        self.rows = 0
+        self._buffers: Dict[str, tuple] = {}
+        self._mm: Optional[mmap.mmap] = None
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return
+        with open(file_path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Файл {file_path} не является снимком вакансий")
+        self.rows, count = _HEADER.unpack_from(self._mm, len(MAGIC))
+        position = len(MAGIC) + _HEADER.size
+        for _ in range(count):
+            name, offset, size = _ENTRY.unpack_from(self._mm, position)
+            self._buffers[name.rstrip(b"\0").decode()] = (offset, size)
+            position += _ENTRY.size
+
+    def __enter__(self) -> "_Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Закрывает mmap. Массивы из `array` ссылаются на него без копирования, поэтому
+        к этому моменту их не должно остаться (иначе BufferError): открытый mmap
+        не дает заменить файл снимка в Windows.
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def array(self, name: str, dtype) -> np.ndarray:
+        if self._mm is None:
+            return np.zeros(0, dtype=dtype)
+        offset, size = self._buffers[name]
+        return np.frombuffer(self._mm, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=offset)
+
+    def offsets(self, column: str) -> np.ndarray:
+        if self._mm is None:
+            return np.zeros(1, dtype=np.int64)
+        return self.array(f"{column}.offsets", np.int64)
+
+    def salary_mid(self) -> np.ndarray:
+        return self.array("salary_mid", np.float64)
+
+    def values(self, column: str, rows: np.ndarray) -> List[Optional[str]]:
+        """Декодирует значения строковой колонки только в строках `rows`."""
+        offsets = self.offsets(column)
+        base = self._buffers[f"{column}.data"][0]
+        mm = self._mm
+        starts = (offsets[rows] + base).tolist()
+        ends = (offsets[rows + 1] + base).tolist()
+        values: List[Optional[str]] = [mm[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+        for i in np.flatnonzero(self.array(f"{column}.nulls", np.uint8)[rows]).tolist():
+            values[i] = None
+        return values
+
+    def salaries(self, column: str, rows: np.ndarray) -> List[Optional[int]]:
+        return [None if value == INT_NULL else value for value in self.array(column, np.int64)[rows].tolist()]
+
+    def vacancies(self, rows: np.ndarray) -> List[Vacancy]:
+        """Вакансии из строк `rows` (search_text не декодируется — он вычисляется заново при обращении)."""
+        return [Vacancy.from_row(row) for row in zip(
+            self.values("title", rows), self.values("link", rows),
+            self.salaries("salary_from", rows), self.salaries("salary_to", rows),
+            self.values("currency", rows), self.values("description", rows), self.values("requirements", rows),
+            self.values("hh_id", rows), self.values("employer_hh_id", rows),
+        )]
+
+    def strings(self, column: str) -> _Strings:
+        """Копия строковой колонки в память (для перезаписи файла)."""
+        if self._mm is None:
+            return _Strings.encode([])
+        offset, size = self._buffers[f"{column}.data"]
+        return _Strings(self.offsets(column).copy(), self.array(f"{column}.nulls", np.uint8).copy(),
+                        self._mm[offset:offset + size])
+
+    def equals_mask(self, column: str, value: str, candidates: np.ndarray, ignore_case: bool = False) -> np.ndarray:
+        """Маска строк-кандидатов, где значение колонки равно `value` (байты сравниваются без декодирования)."""
+        needle = value.encode("utf-8")
+        offsets = self.offsets(column)
+        nulls = self.array(f"{column}.nulls", np.uint8)
+        base = self._buffers[f"{column}.data"][0]
+        lengths = offsets[1:] - offsets[:-1]
+        mask = np.zeros(self.rows, dtype=bool)
+        for row in np.flatnonzero(candidates & (lengths == len(needle)) & (nulls == 0)).tolist():
+            data = self._mm[base + offsets[row]:base + offsets[row + 1]]
+            mask[row] = (data.upper() if ignore_case else data) == needle
+        return mask
+
+    def contains_mask(self, column: str, value: str) -> np.ndarray:
+        """
+        Маска строк, в значении которых есть подстрока `value`.
+
+        Подстрока ищется сразу по всему буферу колонки (mmap.find), а номера строк
+        определяются по таблице смещений одним вызовом searchsorted — строки
+        без совпадений не декодируются. Поиск по байтам UTF-8 дает тот же
+        результат, что и поиск по строкам.
+        """
+        mask = np.zeros(self.rows, dtype=bool)
+        if self._mm is None:
+            return mask
+        if not value:
+            mask[:] = True
+            return mask
+        needle = value.encode("utf-8")
+        offsets = self.offsets(column)
+        base, size = self._buffers[f"{column}.data"]
+        end = base + size
+        find = self._mm.find
+        positions = []
+        position = find(needle, base, end)
+        while position != -1:
+            positions.append(position)
+            position = find(needle, position + 1, end)
+        if not positions:
+            return mask
+        relative = np.array(positions, dtype=np.int64) - base
+        rows = np.searchsorted(offsets, relative, side="right") - 1
+        # Совпадения на стыке двух записей не считаются
+        mask[rows[relative + len(needle) <= offsets[rows + 1]]] = True
+        return mask
+
+
+def _write_snapshot(file_path: str, rows: int, strings: Dict[str, _Strings], numbers: Dict[str, np.ndarray]) -> None:
+    """Записывает снимок во временный файл и атомарно заменяет им целевой."""
+    buffers: List[tuple] = []
+    for column in STRING_COLUMNS:
+        column_data = strings[column]
+        buffers += [
+            (f"{column}.offsets", column_data.offsets.astype("<i8").tobytes()),
+            (f"{column}.nulls", column_data.nulls.astype(np.uint8).tobytes()),
+            (f"{column}.data", bytes(column_data.data)),
+        ]
+    buffers += [(name, array.tobytes()) for name, array in numbers.items()]
+
+    position = len(MAGIC) + _HEADER.size + _ENTRY.size * len(buffers)
+    directory = []
+    for name, data in buffers:
+        position += -position % 8
+        directory.append(_ENTRY.pack(name.encode(), position, len(data)))
+        position += len(data)
+
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(MAGIC + _HEADER.pack(rows, len(buffers)) + b"".join(directory))
+        for name, data in buffers:
+            file.write(b"\0" * (-file.tell() % 8))
+            file.write(data)
+    os.replace(tmp_path, file_path)
+
+
+class ColumnarVacancyStorage(VacancyStorage):
+    """
+    Хранилище вакансий в бинарном колоночном снимке, читаемом через mmap.
+
+    Каждое поле хранится отдельной колонкой: зарплаты — массивами int64/float64,
+    строки — таблицей смещений и общим буфером UTF-8. Запрос читает только нужные
+    ему колонки: зарплатные критерии считаются векторно, "keyword" ищется сразу по
+    буферу search_text, а строки декодируются только у подошедших вакансий.
+
+    Снимок неизменяем: добавление и удаление переписывают файл целиком (колонки
+    копируются блоками, без разбора записей), поэтому добавлять вакансии
+    выгоднее пачками через add_vacancies. Добавление работает как upsert по hh_id:
+    старые строки с теми же hh_id отбрасываются, новые версии пишутся в конец.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._ensure_file_exists()
+
+    def _ensure_file_exists(self) -> None:
+        if os.path.exists(self.file_path):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            self._save_all_vacancies([])
+        except Exception as e:
+            print(f"Ошибка при создании файла {self.file_path}: {e}")
+
+    def __len__(self) -> int:
+        with _Snapshot(self.file_path) as snapshot:
+            return snapshot.rows
+
+    @staticmethod
+    def _encode(vacancies: List[Vacancy]):
+        strings = {column: _Strings.encode([getattr(v, column) for v in vacancies]) for column in STRING_COLUMNS}
+        numbers = {
+            column: np.array([INT_NULL if getattr(v, column) is None else getattr(v, column) for v in vacancies],
+                             dtype="<i8")
+            for column in INT_COLUMNS
+        }
+        numbers["salary_mid"] = np.array([np.nan if v.salary_mid is None else v.salary_mid for v in vacancies],
+                                         dtype="<f8")
+        return strings, numbers
+
+    def _save_all_vacancies(self, vacancies: List[Vacancy]) -> None:
+        strings, numbers = self._encode(vacancies)
+        _write_snapshot(self.file_path, len(vacancies), strings, numbers)
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Дописывает вакансии: существующие колонки копируются как есть, новые кодируются.
+        Строки с hh_id добавляемых вакансий при этом отбрасываются.
+        """
+        vacancies = dedupe_vacancies(vacancies)
+        if not vacancies:
+            return
+        new_strings, new_numbers = self._encode(vacancies)
+        keys = {vacancy_key(vacancy) for vacancy in vacancies} - {None}
+        with _Snapshot(self.file_path) as snapshot:
+            rows = snapshot.rows
+            stored = {column: snapshot.strings(column) for column in STRING_COLUMNS}
+            # Копии, а не представления mmap: снимок закрывается до замены файла
+            stored_numbers = {name: snapshot.array(name, array.dtype).copy() for name, array in new_numbers.items()}
+            if keys and rows:
+                keep = np.flatnonzero([key not in keys for key in snapshot.values("hh_id", np.arange(rows))])
+                if len(keep) < rows:
+                    rows = len(keep)
+                    stored = {column: strings.take(keep) for column, strings in stored.items()}
+                    stored_numbers = {name: array[keep] for name, array in stored_numbers.items()}
+            strings = {column: stored[column].concat(new_strings[column]) for column in STRING_COLUMNS}
+            numbers = {name: np.concatenate([stored_numbers[name], array]) for name, array in new_numbers.items()}
+        _write_snapshot(self.file_path, rows + len(vacancies), strings, numbers)
+
+    def _match(self, snapshot: _Snapshot, criteria: Dict[str, Any]):
+        """
+        Номера подходящих строк и критерии, которые не удалось проверить по колонкам.
+
+        Зарплата сравнивается векторно, равенство строк — по байтам только у оставшихся
+        кандидатов, ключевое слово — поиском по буферу search_text.
+        """
+        if not snapshot.rows:
+            return np.zeros(0, dtype=np.int64), {}
+        mask = np.ones(snapshot.rows, dtype=bool)
+        rest: Dict[str, Any] = {}
+        salary_mid = snapshot.salary_mid()
+        for key, value in normalize_criteria(criteria).items():
+            if key == "min_salary":
+                mask &= np.nan_to_num(salary_mid, nan=0.0) >= value
+            elif key == "max_salary":
+                mask &= salary_mid <= value
+            elif key == "keyword":
+                mask &= snapshot.contains_mask("search_text", normalize_keyword(value))
+            elif key in STRING_COLUMNS and isinstance(value, str):
+                ignore_case = key == "currency"
+                mask &= snapshot.equals_mask(key, value.upper() if ignore_case else value, mask, ignore_case)
+            else:
+                rest[key] = value
+        return np.flatnonzero(mask), rest
+
+    def _match_all(self, snapshot: _Snapshot, criteria: Dict[str, Any]) -> np.ndarray:
+        """Номера подходящих строк с учетом критериев, проверяемых по вакансиям целиком."""
+        rows, rest = self._match(snapshot, criteria)
+        if not rest:
+            return rows
+        matches = compile_criteria(rest)
+        return rows[[matches(vacancy) for vacancy in snapshot.vacancies(rows)]]
+
+    def iter_vacancies(self, criteria: Dict[str, Any], limit: Optional[int] = None) -> Iterator[Vacancy]:
+        with _Snapshot(self.file_path) as snapshot:
+            if not snapshot.rows:
+                return
+            rows, rest = self._match(snapshot, criteria)
+            # Вакансии декодируются порциями, чтобы при limit не разбирать лишние строки
+            vacancies = (vacancy for start in range(0, len(rows), _CHUNK)
+                         for vacancy in snapshot.vacancies(rows[start:start + _CHUNK]))
+            if rest:
+                vacancies = filter(compile_criteria(rest), vacancies)
+            yield from (islice(vacancies, limit) if limit is not None else vacancies)
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        return self.iter_vacancies({})
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        return list(self.iter_vacancies(criteria))
+
+    def read_columns(self, columns: Sequence[str], criteria: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Проекция: только указанные колонки подходящих вакансий.
+
+        Зарплатные колонки (salary_from, salary_to — NaN вместо NULL, salary_mid)
+        возвращаются массивами NumPy, строковые — списками; остальные колонки
+        файла не читаются и не декодируются.
+        """
+        with _Snapshot(self.file_path) as snapshot:
+            rows = self._match_all(snapshot, criteria or {})
+            result: Dict[str, Any] = {}
+            for column in columns:
+                if column in INT_COLUMNS:
+                    values = snapshot.array(column, np.int64)[rows]
+                    result[column] = np.where(values == INT_NULL, np.nan, values.astype(float))
+                elif column == "salary_mid":
+                    result[column] = snapshot.salary_mid()[rows].copy()
+                elif column in STRING_COLUMNS:
+                    result[column] = snapshot.values(column, rows)
+                else:
+                    raise ValueError(f"Неизвестная колонка: {column}")
+            return result
+
+    def get_batch(self, criteria: Optional[Dict[str, Any]] = None) -> VacancyBatch:
+        """VacancyBatch прямо из колонок снимка, без создания объектов Vacancy."""
+        data = self.read_columns([*TEXT_COLUMNS, "currency", *INT_COLUMNS], criteria)
+        currency_index: Dict[Optional[str], int] = {}
+        codes = np.array([currency_index.setdefault(c, len(currency_index)) for c in data["currency"]],
+                         dtype=np.int32)
+        columns = {}
+        for name in TEXT_COLUMNS:
+            values = np.empty(len(data[name]), dtype=object)
+            values[:] = data[name]
+            columns[name] = values
+        return VacancyBatch(columns, data["salary_from"], data["salary_to"], codes, list(currency_index))
+
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        """Перезаписывает снимок переданными вакансиями."""
+        self._save_all_vacancies(list(vacancies))
+
+    def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
+        with _Snapshot(self.file_path) as snapshot:
+            deleted = self._match_all(snapshot, criteria)
+            if not len(deleted):
+                return
+            keep = np.setdiff1d(np.arange(snapshot.rows), deleted)
+            strings = {column: snapshot.strings(column).take(keep) for column in STRING_COLUMNS}
+            numbers = {name: snapshot.array(name, dtype)[keep]
+                       for name, dtype in (("salary_from", "<i8"), ("salary_to", "<i8"), ("salary_mid", "<f8"))}
+        _write_snapshot(self.file_path, len(keep), strings, numbers)
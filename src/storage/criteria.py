@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, Tuple
+
+from ..models import Vacancy, normalize_keyword
+
+Predicate = Callable[[Vacancy], bool]
+
+# Синонимы ключей критериев: {"employer": "123"} то же, что {"employer_hh_id": "123"}
+CRITERIA_ALIASES = {"employer": "employer_hh_id"}
+
+# Порядок проверок: сначала дешевые сравнения, затем зарплата, последним — поиск подстроки
+_COST = {"keyword": 2, "min_salary": 1, "max_salary": 1}
+
+
+def normalize_criteria(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """Критерии с ключами-синонимами, замененными на имена полей Vacancy."""
+    return {CRITERIA_ALIASES.get(key, key): value for key, value in criteria.items()}
+
+
+def _check(key: str, value: Any) -> Predicate:
+    if key == "keyword":
+        keyword = normalize_keyword(value)
+        return lambda vacancy: keyword in vacancy.search_text
+    if key == "min_salary":
+        return lambda vacancy: vacancy.get_salary() >= value
+    if key == "max_salary":
+        # Вакансии без зарплаты под ограничение сверху не попадают (как salary_mid <= x в SQL)
+        return lambda vacancy: vacancy.salary_mid is not None and vacancy.salary_mid <= value
+    if key == "currency":
+        currency = value.upper()
+        return lambda vacancy: (vacancy.currency or "").upper() == currency
+    return lambda vacancy: getattr(vacancy, key, None) == value
+
+
+def compile_criteria(criteria: Dict[str, Any]) -> Predicate:
+    """
+    Превращает словарь критериев в одну функцию-предикат.
+
+    Разбор ключей и подготовка значений (нормализация ключевого слова и т.п.)
+    выполняются один раз на запрос, а не для каждой вакансии. Поддерживаются:
+
+      * ``keyword`` — подстрока в Vacancy.search_text (название, описание, требования);
+      * ``min_salary`` / ``max_salary`` — границы для зарплаты (Vacancy.get_salary / salary_mid);
+      * ``currency`` — код валюты без учета регистра;
+      * ``employer`` (или ``employer_hh_id``) и ``hh_id`` — идентификаторы HH;
+      * любое другое поле Vacancy — проверка на равенство.
+    """
+    items = sorted(normalize_criteria(criteria).items(), key=lambda item: _COST.get(item[0], 0))
+    checks = [_check(key, value) for key, value in items]
+    if not checks:
+        return lambda vacancy: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda vacancy: all(check(vacancy) for check in checks)
+
+
+def split_criteria(criteria: Dict[str, Any], supported) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Делит критерии на те, что хранилище выполнит само (индекс, SQL), и остаток,
+    который проверяется предикатом compile_criteria.
+
+    :return: (поддерживаемые критерии, остальные критерии)
+    """
+    pushed: Dict[str, Any] = {}
+    rest: Dict[str, Any] = {}
+    for key, value in normalize_criteria(criteria).items():
+        (pushed if key in supported else rest)[key] = value
+    return pushed, rest
+
@@ -1,21 +1,37 @@
 import csv
 import json
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Iterable, Iterator
 from .base import VacancyStorage
 from ..models import Vacancy
+from .criteria import compile_criteria
+from .keys import KeyIndex, dedupe_vacancies, upsert_vacancies, vacancy_key
 
 
 class CSVVacancyStorage(VacancyStorage):
-    """Класс для сохранения вакансий в CSV-файл."""
+    """
+    Класс для сохранения вакансий в CSV-файл.
+
+    Вместе с вакансией сохраняются идентификаторы HH и нормализованный текст для
+    поиска (search_text). Файлы старого формата (без этих колонок) переводятся
+    в новый формат при открытии.
+
+    Добавление работает как upsert по hh_id: вакансия с уже сохраненным hh_id
+    заменяет старую запись. Наличие hh_id проверяется по индексу-спутнику
+    (KeyIndex), поэтому новые вакансии дописываются без чтения файла.
+    """
+
+    HEADERS = ["title", "link", "salary", "description", "requirements", "hh_id", "employer_hh_id", "search_text"]
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self._ensure_file_exists()
+        self._keys = KeyIndex(self.file_path, self._stored_keys)
+        self._upgrade_format()
 
     def _ensure_file_exists(self) -> None:
         try:
             # Создаем директорию, если она не существует
-            import os
             os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
 
             with open(self.file_path, "r", newline="", encoding="utf-8") as file:
@@ -23,91 +39,83 @@ class CSVVacancyStorage(VacancyStorage):
         except FileNotFoundError:
             with open(self.file_path, "w", newline="", encoding="utf-8") as file:
                 writer = csv.writer(file)
-                writer.writerow(["title", "link", "salary", "description", "requirements"])
+                writer.writerow(self.HEADERS)
         except Exception as e:
             print(f"Ошибка при создании файла {self.file_path}: {e}")
 
+    def _upgrade_format(self) -> None:
+        """Переписывает файл старого формата с текущим заголовком, чтобы к нему можно было дописывать."""
+        with open(self.file_path, "r", newline="", encoding="utf-8") as file:
+            header = next(csv.reader(file), None)
+        if header is not None and header != self.HEADERS:
+            self._save_all_vacancies(list(self._iter_stored()))
+
+    def _stored_keys(self) -> Iterator[str]:
+        with open(self.file_path, "r", newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                if row.get("hh_id"):
+                    yield row["hh_id"]
+
+    @staticmethod
+    def _to_row(vacancy: Vacancy) -> List[Any]:
+        return [
+            vacancy.title,
+            vacancy.link,
+            json.dumps(vacancy.salary) if vacancy.salary else "",
+            vacancy.description,
+            vacancy.requirements,
+            vacancy.hh_id or "",
+            vacancy.employer_hh_id or "",
+            vacancy.search_text,
+        ]
+
     def add_vacancy(self, vacancy: Vacancy) -> None:
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        vacancies = dedupe_vacancies(vacancies)
+        if any(vacancy_key(vacancy) in self._keys for vacancy in vacancies):
+            # Есть уже сохраненные hh_id — файл переписывается с заменой этих записей
+            self._save_all_vacancies(list(upsert_vacancies(self._iter_stored(), vacancies)))
+            return
         with open(self.file_path, "a", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
-            writer.writerow([
-                vacancy.title,
-                vacancy.link,
-                json.dumps(vacancy.salary) if vacancy.salary else "",
-                vacancy.description,
-                vacancy.requirements,
-            ])
+            writer.writerows(self._to_row(vacancy) for vacancy in vacancies)
+        self._keys.add(filter(None, map(vacancy_key, vacancies)))
 
-    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
-        vacancies = []
+    def _iter_stored(self) -> Iterator[Vacancy]:
         with open(self.file_path, "r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                salary = json.loads(row["salary"]) if row["salary"] else None
-                vacancy = Vacancy(
+            for row in csv.DictReader(file):
+                yield Vacancy(
                     title=row["title"],
                     link=row["link"],
-                    salary=salary,
+                    salary=json.loads(row["salary"]) if row["salary"] else None,
                     description=row["description"],
                     requirements=row["requirements"],
+                    hh_id=row.get("hh_id") or None,
+                    employer_hh_id=row.get("employer_hh_id") or None,
+                    search_text=row.get("search_text"),
                 )
-                vacancies.append(vacancy)
-        return self._filter_vacancies(vacancies, criteria)
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        return list(self.iter_vacancies(criteria))
 
     def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
-        vacancies = self.get_vacancies({})
-        filtered_vacancies = [v for v in vacancies if not self._matches_criteria(v, criteria)]
+        matches = compile_criteria(criteria)
+        filtered_vacancies = [v for v in self._iter_stored() if not matches(v)]
         self._save_all_vacancies(filtered_vacancies)
 
-    def _save_all_vacancies(self, vacancies: List[Vacancy]) -> None:
-        with open(self.file_path, "w", newline="", encoding="utf-8") as file:
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        self._save_all_vacancies(vacancies)
+
+    def _save_all_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        keys = []
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
-            writer.writerow(["title", "link", "salary", "description", "requirements"])
+            writer.writerow(self.HEADERS)
             for vacancy in vacancies:
-                writer.writerow([
-                    vacancy.title,
-                    vacancy.link,
-                    json.dumps(vacancy.salary) if vacancy.salary else "",
-                    vacancy.description,
-                    vacancy.requirements,
-                ])
-
-    def _filter_vacancies(
-        self, vacancies: List[Vacancy], criteria: Dict[str, Any]
-    ) -> List[Vacancy]:
-        filtered = []
-        for vacancy in vacancies:
-            matches = True
-            for key, value in criteria.items():
-                if key == "keyword":
-                    if value.lower() not in vacancy.description.lower() and value.lower() not in vacancy.requirements.lower():
-                        matches = False
-                        break
-                elif key == "min_salary":
-                    if vacancy.get_salary() < value:
-                        matches = False
-                        break
-                elif getattr(vacancy, key, None) != value:
-                    matches = False
-                    break
-            if matches:
-                filtered.append(vacancy)
-        return filtered
-
-    def _matches_criteria(self, vacancy_data: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
-        for key, value in criteria.items():
-            if key == "keyword":
-                description = vacancy_data.get("description", "").lower()
-                requirements = vacancy_data.get("requirements", "").lower()
-                title = vacancy_data.get("title", "").lower()
-                if (value.lower() not in description and
-                        value.lower() not in requirements and
-                        value.lower() not in title):
-                    return False
-            elif key == "min_salary":
-                vacancy = Vacancy.validate_and_create(vacancy_data)
-                if vacancy.get_salary() < value:
-                    return False
-            elif getattr(vacancy_data, key, None) != value:
-                return False
-        return True
\ No newline at end of file
+                writer.writerow(self._to_row(vacancy))
+                keys.append(vacancy_key(vacancy))
+        os.replace(tmp_path, self.file_path)
+        self._keys.rebuild(filter(None, keys))
@@ -0,0 +1,73 @@
+import os
+import re
+from typing import Dict, Optional, Type
+
+from .base import VacancyStorage
+from .csv_storage import CSVVacancyStorage
+from .excel_storage import ExcelVacancyStorage
+from .json_storage import JSONVacancyStorage
+from .jsonl_storage import JSONLVacancyStorage
+from .txt_storage import TXTVacancyStorage
+from .columnar_storage import ColumnarVacancyStorage
+from .keys import dedupe_vacancies
+
+# Хранилище для каждого расширения файла в каталоге данных
+STORAGE_BY_EXTENSION: Dict[str, Type[VacancyStorage]] = {
+    ".json": JSONVacancyStorage,
+    ".jsonl": JSONLVacancyStorage,
+    ".csv": CSVVacancyStorage,
+    ".txt": TXTVacancyStorage,
+    ".xlsx": ExcelVacancyStorage,
+    ".vcol": ColumnarVacancyStorage,
+}
+
+_VACANCY_ID_RE = re.compile(r"/vacanc(?:y|ies)/(\d+)")
+
+
+def hh_id_from_link(link: Optional[str]) -> Optional[str]:
+    """Идентификатор вакансии HH из ссылки вида https://hh.ru/vacancy/123."""
+    match = _VACANCY_ID_RE.search(link or "")
+    return match.group(1) if match else None
+
+
+def dedupe_storage(storage: VacancyStorage) -> int:
+    """
+    Убирает повторы вакансий по hh_id и переписывает хранилище.
+
+    У записей старого формата hh_id нет — он восстанавливается из ссылки.
+
+    :return: количество удаленных повторов
+    """
+    vacancies = list(storage.iter_vacancies({}))
+    for vacancy in vacancies:
+        if not vacancy.hh_id:
+            vacancy.hh_id = hh_id_from_link(vacancy.link)
+    unique = dedupe_vacancies(vacancies)
+    storage.export(unique)
+    return len(vacancies) - len(unique)
+
+
+def dedupe_data_dir(data_dir: str = "data") -> Dict[str, int]:
+    """
+    Дедуплицирует все файлы вакансий в каталоге (формат определяется по расширению).
+
+    :return: количество удаленных повторов по каждому файлу
+    """
+    removed = {}
+    for name in sorted(os.listdir(data_dir)):
+        storage_class = STORAGE_BY_EXTENSION.get(os.path.splitext(name)[1])
+        if storage_class is None:
+            continue
+        path = os.path.join(data_dir, name)
+        removed[path] = dedupe_storage(storage_class(path))
+    return removed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Удаление повторов вакансий (по hh_id) в файлах данных")
+    parser.add_argument("data_dir", nargs="?", default="data", help="Каталог с файлами вакансий")
+    args = parser.parse_args()
+    for path, count in dedupe_data_dir(args.data_dir).items():
+        print(f"{path}: удалено повторов {count}")
@@ -1,123 +1,179 @@
 import json
 import os
-from typing import List, Dict, Any
+import weakref
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 
 import openpyxl
 
 from .base import VacancyStorage
 from ..models import Vacancy
+from .criteria import compile_criteria
+from .keys import upsert_vacancies
+
+HEADERS = ["title", "link", "salary", "description", "requirements", "hh_id", "employer_hh_id", "search_text"]
+HH_ID = HEADERS.index("hh_id")
+
+
+def _read_rows(file_path: str) -> Iterator[tuple]:
+    """
+    Потоково читает строки данных (без заголовка) в режиме read_only.
+
+    Строки приводятся к порядку колонок HEADERS: в файлах старого формата
+    колонки сопоставляются по заголовку, отсутствующие заполняются None.
+    """
+    if not os.path.exists(file_path):
+        return
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows, None) or [])
+        positions = None if header == HEADERS else [header.index(name) if name in header else None for name in HEADERS]
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            if positions is not None:
+                row = tuple(row[i] if i is not None and i < len(row) else None for i in positions)
+            yield row
+    finally:
+        workbook.close()
+
+
+def _write_rows(file_path: str, rows: Iterable[Iterable[Any]]) -> None:
+    """
+    Записывает заголовок и строки в новый файл в режиме write_only.
+
+    Запись идет во временный файл, который затем атомарно заменяет целевой,
+    поэтому строки можно читать потоково из заменяемого файла.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADERS)
+    for row in rows:
+        sheet.append(list(row))
+    tmp_path = file_path + ".tmp.xlsx"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+def _flush_pending(file_path: str, pending: List[List[Any]]) -> None:
+    """
+    Дописывает буфер в файл: существующие строки переносятся потоково, строки
+    с hh_id из буфера заменяются новыми версиями, остальной буфер — в конец.
+    """
+    if not pending:
+        return
+    rows = list(pending)
+    _write_rows(file_path, upsert_vacancies(_read_rows(file_path), rows, key=_row_key))
+    pending.clear()
+
+
+def _row_key(row) -> Optional[str]:
+    return str(row[HH_ID]) if row[HH_ID] else None
 
 
 class ExcelVacancyStorage(VacancyStorage):
-    """Класс для сохранения вакансий в Excel-файл."""
+    """
+    Класс для сохранения вакансий в Excel-файл.
 
-    def __init__(self, file_path: str):
+    Чтение идет в режиме read_only (строки не загружаются в память целиком),
+    запись — в режиме write_only. Добавляемые вакансии накапливаются в буфере
+    и записываются в файл при `flush()`, при выходе из блока `with`,
+    при переполнении буфера (`buffer_size`) или при завершении программы.
+
+    Добавление работает как upsert по hh_id: повторы схлопываются уже в буфере,
+    а сохраненные строки с тем же hh_id заменяются при записи буфера в файл,
+    которая и так переписывает файл целиком.
+    """
+
+    def __init__(self, file_path: str, buffer_size: int = 1000):
         self.file_path = file_path
+        self.buffer_size = buffer_size
+        self._pending: List[List[Any]] = []
+        self._pending_keys: Dict[str, int] = {}
         self._ensure_file_exists()
+        self._finalizer = weakref.finalize(self, _flush_pending, self.file_path, self._pending)
 
     def _ensure_file_exists(self) -> None:
+        if os.path.exists(self.file_path):
+            return
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            workbook.close()
-        except FileNotFoundError:
             # Создаем директорию, если она не существует
-            import os
             os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-
-            workbook = openpyxl.Workbook()
-            sheet = workbook.active
-            sheet.append(["title", "link", "salary", "description", "requirements"])
-            workbook.save(self.file_path)
-            workbook.close()
+            _write_rows(self.file_path, [])
         except Exception as e:
             print(f"Ошибка при создании файла {self.file_path}: {e}")
 
-    def add_vacancy(self, vacancy: Vacancy) -> None:
-        workbook = openpyxl.load_workbook(self.file_path)
-        sheet = workbook.active
-        sheet.append([
+    def __enter__(self) -> "ExcelVacancyStorage":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+
+    @staticmethod
+    def _to_row(vacancy: Vacancy) -> List[Any]:
+        return [
             vacancy.title,
             vacancy.link,
             json.dumps(vacancy.salary) if vacancy.salary else "",
             vacancy.description,
             vacancy.requirements,
-        ])
-        workbook.save(self.file_path)
-        workbook.close()
+            vacancy.hh_id or "",
+            vacancy.employer_hh_id or "",
+            vacancy.search_text,
+        ]
+
+    @staticmethod
+    def _from_row(row) -> Vacancy:
+        return Vacancy(
+            title=row[0],
+            link=row[1] or "",
+            salary=json.loads(row[2]) if row[2] else None,
+            description=row[3] or "",
+            requirements=row[4] or "",
+            hh_id=row[5] or None,
+            employer_hh_id=row[6] or None,
+            search_text=row[7],
+        )
+
+    def flush(self) -> None:
+        """Записывает буфер добавленных вакансий в файл."""
+        _flush_pending(self.file_path, self._pending)
+        self._pending_keys.clear()
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        for vacancy in vacancies:
+            row = self._to_row(vacancy)
+            key = _row_key(row)
+            if key in self._pending_keys:
+                self._pending[self._pending_keys[key]] = row
+                continue
+            if key is not None:
+                self._pending_keys[key] = len(self._pending)
+            self._pending.append(row)
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        for row in upsert_vacancies(_read_rows(self.file_path), list(self._pending), key=_row_key):
+            yield self._from_row(row)
 
     def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
-        vacancies = []
-        workbook = openpyxl.load_workbook(self.file_path)
-        sheet = workbook.active
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            salary = json.loads(row[2]) if row[2] else None
-            vacancy = Vacancy(
-                title=row[0],
-                link=row[1],
-                salary=salary,
-                description=row[3],
-                requirements=row[4],
-            )
-            vacancies.append(vacancy)
-        workbook.close()
-        return self._filter_vacancies(vacancies, criteria)
+        return list(self.iter_vacancies(criteria))
 
     def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
-        vacancies = self.get_vacancies({})
-        filtered_vacancies = [v for v in vacancies if not self._matches_criteria(v, criteria)]
-        self._save_all_vacancies(filtered_vacancies)
+        self.flush()
+        matches = compile_criteria(criteria)
+        self._save_all_vacancies(v for v in self._iter_stored() if not matches(v))
 
-    def _save_all_vacancies(self, vacancies: List[Vacancy]) -> None:
-        workbook = openpyxl.Workbook()
-        sheet = workbook.active
-        sheet.append(["title", "link", "salary", "description", "requirements"])
-        for vacancy in vacancies:
-            sheet.append([
-                vacancy.title,
-                vacancy.link,
-                json.dumps(vacancy.salary) if vacancy.salary else "",
-                vacancy.description,
-                vacancy.requirements,
-            ])
-        workbook.save(self.file_path)
-        workbook.close()
+    def _save_all_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        _write_rows(self.file_path, (self._to_row(vacancy) for vacancy in vacancies))
 
-    def _filter_vacancies(
-        self, vacancies: List[Vacancy], criteria: Dict[str, Any]
-    ) -> List[Vacancy]:
-        filtered = []
-        for vacancy in vacancies:
-            matches = True
-            for key, value in criteria.items():
-                if key == "keyword":
-                    if value.lower() not in vacancy.description.lower() and value.lower() not in vacancy.requirements.lower():
-                        matches = False
-                        break
-                elif key == "min_salary":
-                    if vacancy.get_salary() < value:
-                        matches = False
-                        break
-                elif getattr(vacancy, key, None) != value:
-                    matches = False
-                    break
-            if matches:
-                filtered.append(vacancy)
-        return filtered
-
-    def _matches_criteria(self, vacancy_data: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
-        for key, value in criteria.items():
-            if key == "keyword":
-                description = vacancy_data.get("description", "").lower()
-                requirements = vacancy_data.get("requirements", "").lower()
-                title = vacancy_data.get("title", "").lower()
-                if (value.lower() not in description and
-                        value.lower() not in requirements and
-                        value.lower() not in title):
-                    return False
-            elif key == "min_salary":
-                vacancy = Vacancy.validate_and_create(vacancy_data)
-                if vacancy.get_salary() < value:
-                    return False
-            elif getattr(vacancy_data, key, None) != value:
-                return False
-        return True
\ No newline at end of file
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        """Перезаписывает файл переданными вакансиями (потоково, в режиме write_only)."""
+        self._pending.clear()
+        self._pending_keys.clear()
+        self._save_all_vacancies(vacancies)
@@ -0,0 +1,188 @@
+import re
+from bisect import bisect_left, insort
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from .base import VacancyStorage
+from .criteria import compile_criteria, normalize_criteria
+from ..models import Vacancy, normalize_keyword
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class IndexedVacancyStorage(VacancyStorage):
+    """
+    Хранилище вакансий в памяти с индексами для быстрых повторных запросов.
+
+    Индексы:
+      * вакансии по ключу (hh_id, а если его нет — ссылка);
+      * инвертированный индекс токенов title/description/requirements для "keyword";
+      * отсортированный список (зарплата, ключ) для "min_salary" (bisect);
+      * хеш-индексы равенства для полей из INDEXED_FIELDS.
+
+    Если передано `backing`-хранилище (JSON, CSV и т.д.), вакансии загружаются
+    из него один раз при создании, а добавление и удаление дублируются в него.
+    """
+
+    INDEXED_FIELDS = ("title", "link", "hh_id", "employer_hh_id")
+
+    def __init__(self, backing: Optional[VacancyStorage] = None):
+        self.backing = backing
+        self._by_key: Dict[str, Vacancy] = {}
+        self._order: Dict[str, int] = {}
+        self._seq = 0
+        self._texts: Dict[str, str] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._salaries: List[Tuple[float, str]] = []
+        self._salary_of: Dict[str, float] = {}
+        self._fields: Dict[str, Dict[Any, Set[str]]] = {field: {} for field in self.INDEXED_FIELDS}
+        # Результаты поиска по ключевым словам; сбрасываются при любом изменении данных
+        self._keyword_cache: Dict[str, Set[str]] = {}
+        if backing is not None:
+            for vacancy in backing.iter_vacancies({}):
+                self._index(vacancy)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    @staticmethod
+    def _key(vacancy: Vacancy) -> str:
+        return str(vacancy.hh_id) if vacancy.hh_id else f"link:{vacancy.link}"
+
+    def _index(self, vacancy: Vacancy) -> None:
+        self._keyword_cache.clear()
+        key = self._key(vacancy)
+        if key in self._by_key:
+            self._unindex(key)
+        self._by_key[key] = vacancy
+        self._order[key] = self._seq
+        self._seq += 1
+
+        text = vacancy.search_text
+        self._texts[key] = text
+        for token in set(_TOKEN_RE.findall(text)):
+            self._tokens.setdefault(token, set()).add(key)
+
+        salary = self._salary_of[key] = vacancy.get_salary()
+        insort(self._salaries, (salary, key))
+
+        for field, index in self._fields.items():
+            index.setdefault(getattr(vacancy, field, None), set()).add(key)
+
+    def _unindex(self, key: str) -> None:
+        self._keyword_cache.clear()
+        vacancy = self._by_key.pop(key)
+        del self._order[key]
+
+        for token in set(_TOKEN_RE.findall(self._texts.pop(key))):
+            keys = self._tokens[token]
+            keys.discard(key)
+            if not keys:
+                del self._tokens[token]
+
+        position = bisect_left(self._salaries, (self._salary_of.pop(key), key))
+        del self._salaries[position]
+
+        for field, index in self._fields.items():
+            value = getattr(vacancy, field, None)
+            index[value].discard(key)
+            if not index[value]:
+                del index[value]
+
+    def _keyword_keys(self, keyword: str) -> Set[str]:
+        keyword = normalize_keyword(keyword)
+        if keyword not in self._keyword_cache:
+            self._keyword_cache[keyword] = self._search_keyword(keyword)
+        return self._keyword_cache[keyword]
+
+    def _search_keyword(self, keyword: str) -> Set[str]:
+        """
+        Ключи вакансий, в тексте которых есть подстрока `keyword`.
+
+        Кандидаты берутся из инвертированного индекса: для каждого слова запроса —
+        объединение вакансий со всеми токенами, содержащими это слово (просматривается
+        словарь токенов, а не вакансии). Затем кандидаты проверяются на точное
+        вхождение всей подстроки, поэтому результат совпадает с линейным поиском.
+        """
+        words = _TOKEN_RE.findall(keyword)
+        if not words:
+            return {key for key, text in self._texts.items() if keyword in text}
+
+        candidates: Optional[Set[str]] = None
+        for word in sorted(set(words), key=len, reverse=True):
+            keys: Set[str] = set()
+            for token, postings in self._tokens.items():
+                if word in token:
+                    keys |= postings
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                return set()
+        return {key for key in candidates if keyword in self._texts[key]}
+
+    def _salary_keys(self, min_salary: float, candidates: Optional[Set[str]]) -> Set[str]:
+        """Ключи с зарплатой не ниже `min_salary`: срез отсортированного индекса или фильтр кандидатов."""
+        position = bisect_left(self._salaries, (min_salary,))
+        if candidates is not None and len(candidates) < len(self._salaries) - position:
+            return {key for key in candidates if self._salary_of[key] >= min_salary}
+        keys = {key for _, key in self._salaries[position:]}
+        return keys if candidates is None else candidates & keys
+
+    def _find_keys(self, criteria: Dict[str, Any]) -> List[str]:
+        if not criteria:
+            return list(self._by_key)
+
+        criteria = normalize_criteria(criteria)
+        result: Optional[Set[str]] = None
+        scan: Dict[str, Any] = {}
+        for field, value in criteria.items():
+            if field == "keyword":
+                keys = self._keyword_keys(value)
+            elif field in self._fields:
+                keys = self._fields[field].get(value, set())
+            else:
+                if field != "min_salary":
+                    scan[field] = value
+                continue
+            # Множества индексов не изменяются на месте, поэтому копировать их не нужно
+            result = keys if result is None else result & keys
+            if not result:
+                return []
+
+        # Зарплата проверяется последней: по уже суженному множеству это дешевле
+        if "min_salary" in criteria:
+            result = self._salary_keys(criteria["min_salary"], result)
+
+        keys = result if result is not None else self._by_key.keys()
+        if scan:
+            # Остальные критерии (max_salary, currency и т.д.) — общим предикатом по суженному множеству
+            matches = compile_criteria(scan)
+            keys = [key for key in keys if matches(self._by_key[key])]
+        return sorted(keys, key=self._order.__getitem__)
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию (вакансия с тем же ключом заменяется)."""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        vacancies = list(vacancies)
+        for vacancy in vacancies:
+            self._index(vacancy)
+        if self.backing is not None:
+            self.backing.add_vacancies(vacancies)
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        return iter(list(self._by_key.values()))
+
+    def iter_vacancies(self, criteria: Dict[str, Any], limit: Optional[int] = None) -> Iterator[Vacancy]:
+        """Отдает вакансии по индексам; при `limit` объекты берутся только для первых ключей."""
+        keys = self._find_keys(criteria)
+        if limit is not None:
+            keys = keys[:limit]
+        return (self._by_key[key] for key in keys)
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        return list(self.iter_vacancies(criteria))
+
+    def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
+        for key in self._find_keys(criteria):
+            self._unindex(key)
+        if self.backing is not None:
+            self.backing.delete_vacancy(criteria)
@@ -1,8 +1,10 @@
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 from .base import VacancyStorage
 from ..models import Vacancy
+from .criteria import compile_criteria
+from .keys import dedupe_vacancies, vacancy_key
 
 
 class JSONVacancyStorage(VacancyStorage):
@@ -25,32 +27,64 @@ class JSONVacancyStorage(VacancyStorage):
             print(f"Ошибка при создании файла {self.file_path}: {e}")
 
     def add_vacancy(self, vacancy: Vacancy) -> None:
-        """Добавляет вакансию в JSON файл."""
-        vacancies = self._load_vacancies()
-        if not isinstance(vacancies, list):
-            vacancies = []
-        vacancies.append(vacancy.to_dict())
-        self._save_vacancies(vacancies)
+        """Добавляет вакансию в JSON файл (upsert по hh_id)."""
+        self.add_vacancies([vacancy])
 
-    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
-        """Получает вакансии из JSON файла по критериям."""
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Добавляет вакансии в JSON файл за одно чтение и одну запись.
+
+        Вакансия с уже сохраненным hh_id заменяет старую запись на ее месте.
+        """
+        stored = self._load_vacancies()
+        if not isinstance(stored, list):
+            stored = []
+        positions = {}
+        for position, data in enumerate(stored):
+            key = data.get("hh_id") or data.get("id")
+            if key:
+                positions.setdefault(str(key), position)
+        for vacancy in dedupe_vacancies(vacancies):
+            key = vacancy_key(vacancy)
+            if key in positions:
+                stored[positions[key]] = vacancy.to_dict()
+            else:
+                if key is not None:
+                    positions[key] = len(stored)
+                stored.append(vacancy.to_dict())
+        self._save_vacancies(stored)
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        """
+        Отдает вакансии из JSON файла по одной.
+
+        JSON-массив разбирается целиком, но объекты Vacancy создаются лениво,
+        только по мере чтения генератора.
+        """
         vacancies_data = self._load_vacancies()
         if not isinstance(vacancies_data, list):
-            vacancies_data = []
-        vacancies = [Vacancy.validate_and_create(data) for data in vacancies_data]
-        return self._filter_vacancies(vacancies, criteria)
+            return
+        for data in vacancies_data:
+            yield Vacancy.validate_and_create(data)
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        """Получает вакансии из JSON файла по критериям."""
+        return list(self.iter_vacancies(criteria))
 
     def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
         """Удаляет вакансии из JSON файла по критериям."""
         vacancies_data = self._load_vacancies()
         if not isinstance(vacancies_data, list):
             vacancies_data = []
+        matches = compile_criteria(criteria)
         vacancies = [Vacancy.validate_and_create(data) for data in vacancies_data]
-        filtered_vacancies = [
-            v for v in vacancies if not self._matches_criteria(v, criteria)
-        ]
+        filtered_vacancies = [v for v in vacancies if not matches(v)]
         self._save_vacancies([v.to_dict() for v in filtered_vacancies])
 
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        """Перезаписывает JSON файл переданными вакансиями."""
+        self._save_vacancies([vacancy.to_dict() for vacancy in vacancies])
+
     def _load_vacancies(self) -> List[Dict[str, Any]]:
         """Загружает вакансии из JSON файла."""
         try:
@@ -0,0 +1,188 @@
+import json
+import os
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
+from .base import VacancyStorage
+from ..models import Vacancy
+from .criteria import compile_criteria
+from .keys import dedupe_vacancies, vacancy_key
+
+
+class JSONLVacancyStorage(VacancyStorage):
+    """
+    Класс для хранения вакансий в формате JSON Lines (одна запись на строку).
+
+    Добавление дописывает одну строку в конец файла, чтение идет потоково.
+    Удаление дописывает «надгробие» ({"_deleted": rid}) вместо перезаписи файла;
+    когда надгробий накапливается больше `compaction_ratio` от всех записей,
+    файл уплотняется (переписывается только с живыми записями).
+
+    Добавление работает как upsert по hh_id: для уже сохраненной вакансии
+    дописывается надгробие старой записи и новая версия. Соответствие
+    hh_id → номер записи строится при открытии тем же проходом по файлу.
+    """
+
+    def __init__(self, file_path: str, compaction_ratio: float = 0.5):
+        self.file_path = file_path
+        self.compaction_ratio = compaction_ratio
+        self._ensure_file_exists()
+        self._load_state()
+
+    def _ensure_file_exists(self) -> None:
+        """Создает файл, если он не существует."""
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            if not os.path.exists(self.file_path):
+                open(self.file_path, "w", encoding="utf-8").close()
+        except Exception as e:
+            print(f"Ошибка при создании файла {self.file_path}: {e}")
+
+    def _load_state(self) -> None:
+        """Один проход по файлу: следующий номер записи, удаленные записи и номера записей по hh_id."""
+        self._next_rid = 0
+        self._records = 0
+        self._deleted: Set[int] = set()
+        self._rid_by_key: Dict[str, int] = {}
+        for record in self._iter_raw():
+            if "_deleted" in record:
+                self._deleted.add(record["_deleted"])
+            else:
+                self._records += 1
+                self._next_rid = max(self._next_rid, record.get("_rid", -1) + 1)
+                key = self._record_key(record)
+                if key is not None:
+                    self._rid_by_key[key] = record.get("_rid")
+        self._rid_by_key = {key: rid for key, rid in self._rid_by_key.items() if rid not in self._deleted}
+
+    @staticmethod
+    def _record_key(record: Dict[str, Any]) -> Optional[str]:
+        key = record.get("hh_id") or record.get("id")
+        return str(key) if key else None
+
+    def _iter_raw(self) -> Iterator[Dict[str, Any]]:
+        """Потоково читает все строки файла, пропуская поврежденные."""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"Предупреждение: пропущена поврежденная строка в {self.file_path}")
+        except FileNotFoundError:
+            return
+
+    def _iter_live(self) -> Iterator[Dict[str, Any]]:
+        """Живые (не удаленные) записи."""
+        for record in self._iter_raw():
+            if "_deleted" not in record and record.get("_rid") not in self._deleted:
+                yield record
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        with open(self.file_path, "a", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Дописывает вакансию в конец файла."""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        """
+        Дописывает вакансии в конец файла за одно открытие.
+
+        Для вакансий с уже сохраненным hh_id старая запись помечается удаленной.
+        """
+        tombstones = []
+        records = []
+        for vacancy in dedupe_vacancies(vacancies):
+            key = vacancy_key(vacancy)
+            if key in self._rid_by_key:
+                tombstones.append({"_deleted": self._rid_by_key[key]})
+            if key is not None:
+                self._rid_by_key[key] = self._next_rid
+            records.append({"_rid": self._next_rid, **vacancy.to_dict()})
+            self._next_rid += 1
+        self._append(tombstones + records)
+        self._records += len(records)
+        if tombstones:
+            self._deleted.update(t["_deleted"] for t in tombstones)
+            self._maybe_compact()
+
+    def _iter_stored(self) -> Iterator[Vacancy]:
+        for record in self._iter_live():
+            yield Vacancy.validate_and_create(record)
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        """Получает вакансии из файла по критериям."""
+        return list(self.iter_vacancies(criteria))
+
+    def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
+        """Помечает подходящие вакансии удаленными (дописывает надгробия)."""
+        matches = compile_criteria(criteria)
+        tombstones = []
+        for record in self._iter_live():
+            if matches(Vacancy.validate_and_create(record)):
+                tombstones.append({"_deleted": record["_rid"]})
+                self._rid_by_key.pop(self._record_key(record), None)
+        if not tombstones:
+            return
+        self._append(tombstones)
+        self._deleted.update(t["_deleted"] for t in tombstones)
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._deleted) > self.compaction_ratio * max(self._records, 1):
+            self.compact()
+
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        """Перезаписывает файл переданными вакансиями (номера записей начинаются заново)."""
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            for rid, vacancy in enumerate(vacancies):
+                file.write(json.dumps({"_rid": rid, **vacancy.to_dict()}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.file_path)
+        self._load_state()
+
+    def compact(self) -> None:
+        """Переписывает файл, оставляя только живые записи."""
+        tmp_path = self.file_path + ".tmp"
+        live = 0
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            for record in self._iter_live():
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                live += 1
+        os.replace(tmp_path, self.file_path)
+        self._records = live
+        self._deleted = set()
+
+
+def migrate_json_to_jsonl(json_path: str, jsonl_path: str) -> int:
+    """
+    Переносит вакансии из JSON-массива (формат JSONVacancyStorage) в JSON Lines.
+
+    :return: количество перенесенных записей
+    """
+    with open(json_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise ValueError(f"Файл {json_path} не содержит JSON-массив вакансий")
+
+    os.makedirs(os.path.dirname(jsonl_path) or ".", exist_ok=True)
+    tmp_path = jsonl_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        for rid, record in enumerate(data):
+            file.write(json.dumps({"_rid": rid, **record}, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, jsonl_path)
+    return len(data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Перенос вакансий из JSON-массива в JSON Lines")
+    parser.add_argument("source", help="Исходный JSON-файл (например, data/vacancies.json)")
+    parser.add_argument("target", help="Целевой JSONL-файл (например, data/vacancies.jsonl)")
+    args = parser.parse_args()
+    print(f"Перенесено записей: {migrate_json_to_jsonl(args.source, args.target)}")
@@ -0,0 +1,119 @@
+import os
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+
+from ..models import Vacancy
+
+T = TypeVar("T")
+
+
+def vacancy_key(vacancy: Vacancy) -> Optional[str]:
+    """Ключ вакансии для upsert — hh_id (вакансии без него не дедуплицируются)."""
+    return str(vacancy.hh_id) if vacancy.hh_id else None
+
+
+def dedupe_vacancies(vacancies: Iterable[T], key: Callable[[T], Optional[str]] = vacancy_key) -> List[T]:
+    """
+    Убирает повторы по hh_id: остается последняя версия вакансии на месте первой.
+    Вакансии без hh_id сохраняются как есть. Через `key` можно передать способ
+    получить hh_id из записи другого вида (например, строки файла).
+    """
+    result: List[T] = []
+    positions: Dict[str, int] = {}
+    for vacancy in vacancies:
+        key_value = key(vacancy)
+        if key_value is None:
+            result.append(vacancy)
+        elif key_value in positions:
+            result[positions[key_value]] = vacancy
+        else:
+            positions[key_value] = len(result)
+            result.append(vacancy)
+    return result
+
+
+def upsert_vacancies(
+    stored: Iterable[T], updates: List[T], key: Callable[[T], Optional[str]] = vacancy_key
+) -> Iterator[T]:
+    """
+    Сохраненные вакансии, где записи с hh_id из `updates` заменены новыми версиями
+    (на том же месте; повторные старые копии отбрасываются), а остальные
+    вакансии из `updates` добавлены в конец.
+    """
+    pending = {key(vacancy): vacancy for vacancy in updates if key(vacancy)}
+    seen: Set[str] = set()
+    for vacancy in stored:
+        key_value = key(vacancy)
+        if key_value is None or key_value not in pending:
+            yield vacancy
+        elif key_value not in seen:
+            seen.add(key_value)
+            yield pending[key_value]
+    for vacancy in updates:
+        key_value = key(vacancy)
+        if key_value is None or key_value not in seen:
+            yield vacancy
+
+
+class KeyIndex:
+    """
+    Постоянный индекс hh_id файлового хранилища (файл-спутник `<файл>.keys`).
+
+    Позволяет проверить, есть ли вакансия в файле, без чтения самого файла.
+    В заголовке индекса записаны размер и время изменения файла данных: если они
+    не совпадают (файл изменили в обход хранилища или запись прервалась),
+    индекс перестраивается функцией `load_keys` при открытии.
+    """
+
+    HEADER_SIZE = 64
+
+    def __init__(self, data_path: str, load_keys: Callable[[], Iterable[str]]):
+        self.data_path = data_path
+        self.path = data_path + ".keys"
+        self.keys: Set[str] = set()
+        if not self._load():
+            self.rebuild(load_keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _stamp(self) -> bytes:
+        try:
+            stat = os.stat(self.data_path)
+            stamp = f"{stat.st_size} {stat.st_mtime_ns}"
+        except FileNotFoundError:
+            stamp = "0 0"
+        return stamp.encode().ljust(self.HEADER_SIZE - 1) + b"\n"
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, "rb") as file:
+                if file.read(self.HEADER_SIZE) != self._stamp():
+                    return False
+                self.keys = {line.decode("utf-8") for line in file.read().splitlines() if line}
+                return True
+        except FileNotFoundError:
+            return False
+
+    def rebuild(self, keys: Iterable[str]) -> None:
+        """Перезаписывает индекс (после перезаписи файла данных)."""
+        self.keys = set(keys)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(self._stamp())
+            file.writelines(f"{key}\n".encode("utf-8") for key in self.keys)
+        os.replace(tmp_path, self.path)
+
+    def add(self, keys: Iterable[str]) -> None:
+        """Дописывает новые ключи и обновляет отметку файла данных (после дозаписи в него)."""
+        new_keys = [key for key in keys if key not in self.keys]
+        self.keys.update(new_keys)
+        try:
+            with open(self.path, "r+b") as file:
+                file.write(self._stamp())
+                file.seek(0, os.SEEK_END)
+                file.writelines(f"{key}\n".encode("utf-8") for key in new_keys)
+        except FileNotFoundError:
+            self.rebuild(self.keys)
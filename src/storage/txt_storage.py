@@ -1,95 +1,101 @@
 import json
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from .base import VacancyStorage
 from ..models import Vacancy
+from .criteria import compile_criteria
+from .keys import KeyIndex, dedupe_vacancies, upsert_vacancies, vacancy_key
 
 
 class TXTVacancyStorage(VacancyStorage):
-    """Класс для сохранения вакансий в TXT-файл."""
+    """
+    Класс для сохранения вакансий в TXT-файл (поля через табуляцию).
+
+    Поля: title, link, salary, description, requirements, hh_id, employer_hh_id
+    и нормализованный текст для поиска (search_text). Строки старых форматов
+    (пять полей или шесть — с search_text) тоже читаются.
+
+    Добавление работает как upsert по hh_id, наличие hh_id проверяется
+    по индексу-спутнику (KeyIndex) без чтения файла.
+    """
 
     def __init__(self, file_path: str):
         self.file_path = file_path
+        self._keys = KeyIndex(self.file_path, self._stored_keys)
+
+    def _stored_keys(self) -> Iterator[str]:
+        return filter(None, map(vacancy_key, self._iter_stored()))
+
+    @staticmethod
+    def _to_line(vacancy: Vacancy) -> str:
+        return (
+            f"{vacancy.title}\t{vacancy.link}\t"
+            f"{json.dumps(vacancy.salary) if vacancy.salary else ''}\t"
+            f"{vacancy.description}\t{vacancy.requirements}\t"
+            f"{vacancy.hh_id or ''}\t{vacancy.employer_hh_id or ''}\t{vacancy.search_text}\n"
+        )
+
+    @staticmethod
+    def _from_parts(parts: List[str]) -> Optional[Vacancy]:
+        if len(parts) not in (5, 6, 8):
+            return None
+        title, link, salary_str, description, requirements = parts[:5]
+        hh_id = employer_hh_id = search_text = None
+        if len(parts) == 6:
+            search_text = parts[5]
+        elif len(parts) == 8:
+            hh_id, employer_hh_id, search_text = parts[5] or None, parts[6] or None, parts[7]
+        return Vacancy(
+            title=title,
+            link=link,
+            salary=json.loads(salary_str) if salary_str else None,
+            description=description,
+            requirements=requirements,
+            hh_id=hh_id,
+            employer_hh_id=employer_hh_id,
+            search_text=search_text,
+        )
 
     def add_vacancy(self, vacancy: Vacancy) -> None:
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        vacancies = dedupe_vacancies(vacancies)
+        if any(vacancy_key(vacancy) in self._keys for vacancy in vacancies):
+            # Есть уже сохраненные hh_id — файл переписывается с заменой этих записей
+            self._save_all_vacancies(list(upsert_vacancies(self._iter_stored(), vacancies)))
+            return
         with open(self.file_path, "a", encoding="utf-8") as file:
-            file.write(
-                f"{vacancy.title}\t{vacancy.link}\t"
-                f"{json.dumps(vacancy.salary) if vacancy.salary else ''}\t"
-                f"{vacancy.description}\t{vacancy.requirements}\n"
-            )
+            file.writelines(self._to_line(vacancy) for vacancy in vacancies)
+        self._keys.add(filter(None, map(vacancy_key, vacancies)))
 
-    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
-        vacancies = []
+    def _iter_stored(self) -> Iterator[Vacancy]:
         try:
             with open(self.file_path, "r", encoding="utf-8") as file:
                 for line in file:
-                    parts = line.strip().split("\t")
-                    if len(parts) != 5:
-                        continue
-                    title, link, salary_str, description, requirements = parts
-                    salary = json.loads(salary_str) if salary_str else None
-                    vacancy = Vacancy(
-                        title=title,
-                        link=link,
-                        salary=salary,
-                        description=description,
-                        requirements=requirements,
-                    )
-                    vacancies.append(vacancy)
+                    vacancy = self._from_parts(line.rstrip("\n").split("\t"))
+                    if vacancy is not None:
+                        yield vacancy
         except FileNotFoundError:
-            pass
-        return self._filter_vacancies(vacancies, criteria)
+            return
+
+    def get_vacancies(self, criteria: Dict[str, Any]) -> List[Vacancy]:
+        return list(self.iter_vacancies(criteria))
 
     def delete_vacancy(self, criteria: Dict[str, Any]) -> None:
-        vacancies = self.get_vacancies({})
-        filtered_vacancies = [v for v in vacancies if not self._matches_criteria(v, criteria)]
+        matches = compile_criteria(criteria)
+        filtered_vacancies = [v for v in self._iter_stored() if not matches(v)]
         self._save_all_vacancies(filtered_vacancies)
 
-    def _save_all_vacancies(self, vacancies: List[Vacancy]) -> None:
-        with open(self.file_path, "w", encoding="utf-8") as file:
-            for vacancy in vacancies:
-                file.write(
-                    f"{vacancy.title}\t{vacancy.link}\t"
-                    f"{json.dumps(vacancy.salary) if vacancy.salary else ''}\t"
-                    f"{vacancy.description}\t{vacancy.requirements}\n"
-                )
-
-    def _filter_vacancies(
-        self, vacancies: List[Vacancy], criteria: Dict[str, Any]
-    ) -> List[Vacancy]:
-        filtered = []
-        for vacancy in vacancies:
-            matches = True
-            for key, value in criteria.items():
-                if key == "keyword":
-                    if value.lower() not in vacancy.description.lower() and value.lower() not in vacancy.requirements.lower():
-                        matches = False
-                        break
-                elif key == "min_salary":
-                    if vacancy.get_salary() < value:
-                        matches = False
-                        break
-                elif getattr(vacancy, key, None) != value:
-                    matches = False
-                    break
-            if matches:
-                filtered.append(vacancy)
-        return filtered
+    def export(self, vacancies: Iterable[Vacancy]) -> None:
+        self._save_all_vacancies(vacancies)
 
-    def _matches_criteria(self, vacancy_data: Dict[str, Any], criteria: Dict[str, Any]) -> bool:
-        for key, value in criteria.items():
-            if key == "keyword":
-                description = vacancy_data.get("description", "").lower()
-                requirements = vacancy_data.get("requirements", "").lower()
-                title = vacancy_data.get("title", "").lower()
-                if (value.lower() not in description and
-                        value.lower() not in requirements and
-                        value.lower() not in title):
-                    return False
-            elif key == "min_salary":
-                vacancy = Vacancy.validate_and_create(vacancy_data)
-                if vacancy.get_salary() < value:
-                    return False
-            elif getattr(vacancy_data, key, None) != value:
-                return False
-        return True
\ No newline at end of file
+    def _save_all_vacancies(self, vacancies: Iterable[Vacancy]) -> None:
+        keys = []
+        tmp_path = self.file_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            for vacancy in vacancies:
+                file.write(self._to_line(vacancy))
+                keys.append(vacancy_key(vacancy))
+        os.replace(tmp_path, self.file_path)
+        self._keys.rebuild(filter(None, keys))
@@ -1,4 +1,56 @@
 import sys
 import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
\ No newline at end of file
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+# Тесты не используют общий кеш ответов API (.cache/hh_responses.sqlite)
+os.environ.setdefault("HH_CACHE", "off")
+
+
+class StubHHServer:
+    """Локальная заглушка API hh.ru: маршрутизирует GET-запросы в функцию `handler`."""
+
+    def __init__(self):
+        self.requests = []
+        self.handler = lambda path, query: (404, {}, {})
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                stub.requests.append((parsed.path, query, dict(self.headers)))
+                status, headers, body = stub.handler(parsed.path, query)
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def hh_server():
+    server = StubHHServer()
+    yield server
+    server.close()
@@ -1,4 +1,6 @@
 from src.api.hh_api import HHVacancyAPI
+from src.api.http_client import HTTPClient
+from src.api.rate_limiter import NoRateLimiter
 
 def test_hh_api_get_vacancies(mocker):
     mock_response = mocker.Mock()
@@ -15,10 +17,11 @@ def test_hh_api_get_vacancies(mocker):
     }
     mock_response.raise_for_status = mocker.Mock()
 
-    # Мокаем requests.get
-    mocker.patch("src.api.hh_api.requests.get", return_value=mock_response)
+    # Мокаем запрос через сессию клиента
+    client = HTTPClient()
+    mocker.patch.object(client.session, "get", return_value=mock_response)
 
-    api = HHVacancyAPI()
+    api = HHVacancyAPI(client=client)
     results = api.get_vacancies("Python")
 
     assert isinstance(results, list)
@@ -27,12 +30,85 @@ def test_hh_api_get_vacancies(mocker):
 
 
 def test_hh_api_request_params(mocker):
-    mock_get = mocker.patch("src.api.hh_api.requests.get")
-    api = HHVacancyAPI()
+    client = HTTPClient()
+    mock_get = mocker.patch.object(client.session, "get")
+    api = HHVacancyAPI(client=client)
     api.get_vacancies("Python")
 
     mock_get.assert_called_once()
     args, kwargs = mock_get.call_args
     assert kwargs["params"]["text"] == "Python"
     assert kwargs["params"]["area"] == 113
-    assert kwargs["params"]["per_page"] == 100
\ No newline at end of file
+    assert kwargs["params"]["per_page"] == 100
+
+def _paged_handler(total_pages, per_page=2):
+    def handler(path, query):
+        page = int(query.get("page", 0))
+        items = [{"id": f"{page}-{i}", "name": f"Vacancy {page}-{i}"} for i in range(per_page)]
+        return 200, {}, {"items": items, "pages": total_pages, "page": page}
+    return handler
+
+
+def test_hh_api_fetches_all_pages(hh_server):
+    hh_server.handler = _paged_handler(total_pages=5)
+    api = HHVacancyAPI(base_url=hh_server.url + "/vacancies", rate_limiter=NoRateLimiter())
+
+    results = api.get_vacancies("Python")
+
+    assert len(results) == 10
+    assert {r["id"] for r in results} == {f"{p}-{i}" for p in range(5) for i in range(2)}
+    pages = sorted(int(q["page"]) for _, q, _ in hh_server.requests)
+    assert pages == [0, 1, 2, 3, 4]
+    assert all(q["text"] == "Python" for _, q, _ in hh_server.requests)
+
+
+def test_hh_api_respects_depth_limit(hh_server):
+    hh_server.handler = _paged_handler(total_pages=50)
+    api = HHVacancyAPI(base_url=hh_server.url + "/vacancies", per_page=100, rate_limiter=NoRateLimiter())
+
+    list(api.iter_pages("Python"))
+
+    assert len(hh_server.requests) == HHVacancyAPI.MAX_DEPTH // 100
+
+
+def test_hh_api_uses_rate_limiter(hh_server):
+    class CountingLimiter(NoRateLimiter):
+        calls = 0
+
+        def acquire(self):
+            CountingLimiter.calls += 1
+
+    hh_server.handler = _paged_handler(total_pages=3)
+    api = HHVacancyAPI(base_url=hh_server.url + "/vacancies", rate_limiter=CountingLimiter())
+    api.get_vacancies("Python")
+
+    assert CountingLimiter.calls == 3
+
+
+def test_http_client_reuses_session(hh_server):
+    hh_server.handler = lambda path, query: (200, {}, {"ok": True})
+    with HTTPClient(pool_size=2) as client:
+        assert client.get_json(hh_server.url + "/employers/1") == {"ok": True}
+        assert client.get_json(hh_server.url + "/employers/2") == {"ok": True}
+        adapter = client.session.get_adapter(hh_server.url)
+        assert adapter.max_retries.status_forcelist == HTTPClient.RETRY_STATUSES
+    assert len(hh_server.requests) == 2
+
+
+def test_token_bucket_rate_limiter_spaces_requests():
+    import asyncio
+    import time
+    from src.api.rate_limiter import TokenBucketRateLimiter
+
+    limiter = TokenBucketRateLimiter(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+    async def burst():
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(6)))
+
+    start = time.monotonic()
+    asyncio.run(burst())
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.models import Vacancy, VacancyBatch
+
+
+@pytest.fixture
+def batch():
+    return VacancyBatch.from_vacancies([
+        Vacancy("A", "a", {"from": 100000, "to": 200000, "currency": "RUR"}, "desc", "req", hh_id="1"),
+        Vacancy("B", "b", {"from": 80000}, "desc", "req", hh_id="2"),
+        Vacancy("C", "c", None, "desc", "req", hh_id="3"),
+        Vacancy("D", "d", {"to": 2000, "currency": "USD"}, "desc", "req", hh_id="4"),
+    ])
+
+
+def test_batch_salary_columns_match_vacancy(batch):
+    assert batch.salary.tolist() == [150000, 80000, 0, 2000]
+    assert batch.salary_rub.tolist() == [150000, 80000, 0, 180000]
+    assert [v.title for v in batch] == ["A", "B", "C", "D"]
+    assert batch.vacancy(3).salary == {"from": None, "to": 2000, "currency": "USD"}
+
+
+def test_batch_min_salary_mask(batch):
+    assert batch.min_salary_mask(80000).tolist() == [True, True, False, False]
+    assert [v.hh_id for v in batch.with_min_salary(100000)] == ["1"]
+
+
+def test_batch_stats(batch):
+    stats = batch.salary_stats()
+    salaries = [150000, 80000, 2000]
+    assert stats["vacancies_with_salary"] == 3
+    assert stats["avg"] == round(np.mean(salaries), 2)
+    assert stats["p50"] == 80000
+    assert batch.median_salary() == 80000
+    assert batch.percentiles(0, 100) == [2000, 150000]
+
+
+def test_batch_above_threshold_sorted_desc(batch):
+    assert [v.title for v in batch.above("avg")] == ["A", "B"]
+    assert [v.title for v in batch.above("p50")] == ["A"]
+    with pytest.raises(ValueError):
+        batch.above("p99")
+
+
+def test_empty_batch():
+    batch = VacancyBatch.from_vacancies([])
+    assert len(batch) == 0
+    assert batch.salary_stats() is None
+    assert len(batch.above("avg")) == 0
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.models import Vacancy
+from src.storage import columnar_storage
+from src.storage.columnar_storage import MAGIC, ColumnarVacancyStorage
+
+
+def _storage(tmp_path):
+    storage = ColumnarVacancyStorage(str(tmp_path / "vacancies.vcol"))
+    storage.add_vacancies([
+        Vacancy("Python Dev", "l1", {"from": 100000, "to": 200000, "currency": "RUR"}, "Django", "SQL",
+                hh_id="1", employer_hh_id="80"),
+        Vacancy("Ёжик Java", "l2", {"from": 3000, "currency": "USD"}, "Spring", "python", hh_id="2"),
+    ])
+    storage.add_vacancy(Vacancy("QA", "l3", None, "", ""))
+    return storage
+
+
+def test_columnar_round_trip(tmp_path):
+    storage = _storage(tmp_path)
+    assert (tmp_path / "vacancies.vcol").read_bytes().startswith(MAGIC)
+    assert len(storage) == 3
+    vacancies = storage.get_vacancies({})
+    assert [v.title for v in vacancies] == ["Python Dev", "Ёжик Java", "QA"]
+    assert vacancies[1].salary == {"from": 3000, "to": None, "currency": "USD"}
+    assert vacancies[2].salary is None and vacancies[2].hh_id is None
+
+
+def test_columnar_keyword_does_not_match_across_rows(tmp_path):
+    storage = _storage(tmp_path)
+    assert [v.hh_id for v in storage.get_vacancies({"keyword": "ежик"})] == ["2"]
+    # "sql" в конце первой записи и "ежик" в начале второй не образуют совпадение
+    assert storage.get_vacancies({"keyword": "sqlежик"}) == []
+    assert [v.title for v in storage.iter_vacancies({"keyword": ""}, limit=2)] == ["Python Dev", "Ёжик Java"]
+
+
+def test_columnar_projection_and_batch(tmp_path):
+    storage = _storage(tmp_path)
+    columns = storage.read_columns(["title", "salary_to"], {"min_salary": 1})
+    assert columns["title"] == ["Python Dev", "Ёжик Java"]
+    assert np.isnan(columns["salary_to"][1])
+    assert storage.get_batch().salary_stats()["vacancies_with_salary"] == 2
+
+
+def test_columnar_delete(tmp_path):
+    storage = _storage(tmp_path)
+    storage.delete_vacancy({"currency": "usd"})
+    assert [v.hh_id for v in storage.get_vacancies({})] == ["1", None]
+    storage.delete_vacancy({})
+    assert len(storage) == 0
+
+
+def test_columnar_closes_mmap_before_replacing_file(tmp_path, mocker):
+    storage = _storage(tmp_path)
+    maps = []
+    open_snapshot = columnar_storage._Snapshot.__init__
+
+    def tracking_init(snapshot, file_path):
+        open_snapshot(snapshot, file_path)
+        maps.append(snapshot._mm)
+
+    write_snapshot = columnar_storage._write_snapshot
+
+    def checked_write(*args):
+        assert maps and all(mm.closed for mm in maps)
+        write_snapshot(*args)
+
+    mocker.patch.object(columnar_storage._Snapshot, "__init__", tracking_init)
+    mocker.patch.object(columnar_storage, "_write_snapshot", checked_write)
+
+    storage.add_vacancies([Vacancy("New", "l4", None, "", "", hh_id="4")])
+    storage.add_vacancies([Vacancy("Python Dev v2", "l1", None, "", "", hh_id="1")])
+    storage.delete_vacancy({"hh_id": "2"})
+    assert [v.hh_id for v in storage.get_vacancies({})] == [None, "4", "1"]
+
+
+def test_columnar_snapshot_close_reports_live_views(tmp_path):
+    storage = _storage(tmp_path)
+    snapshot = columnar_storage._Snapshot(storage.file_path)
+    view = snapshot.salary_mid()
+    with pytest.raises(BufferError):
+        snapshot.close()
+    del view
+    snapshot.close()
@@ -0,0 +1,119 @@
+import os
+import re
+
+import pytest
+
+from src.bd_sql.criteria import criteria_where
+from src.bd_sql.migrations import MIGRATIONS
+from src.bd_sql.search import NORMALIZED_SEARCH_TEXT_SQL
+from src.models import Vacancy
+from src.storage import (ColumnarVacancyStorage, CSVVacancyStorage, ExcelVacancyStorage, IndexedVacancyStorage, JSONLVacancyStorage,
+                         JSONVacancyStorage, TXTVacancyStorage)
+from src.storage.criteria import compile_criteria, split_criteria
+
+VACANCIES = [
+    Vacancy("Python Dev", "l1", {"from": 100000, "to": 200000, "currency": "RUR"}, "Django", "SQL",
+            hh_id="1", employer_hh_id="80"),
+    Vacancy("Java Dev", "l2", {"from": 3000, "currency": "USD"}, "Spring", "python скрипты",
+            hh_id="2", employer_hh_id="80"),
+    Vacancy("QA", "l3", None, "Тестирование", "Pytest", hh_id="3", employer_hh_id="3529"),
+]
+
+CASES = [
+    ({}, ["1", "2", "3"]),
+    ({"keyword": "PYTHON"}, ["1", "2"]),
+    ({"min_salary": 100000}, ["1"]),
+    ({"max_salary": 5000}, ["2"]),
+    ({"currency": "usd"}, ["2"]),
+    ({"employer": "80", "keyword": "dev"}, ["1", "2"]),
+    ({"employer_hh_id": "3529"}, ["3"]),
+    ({"hh_id": "2", "keyword": "python"}, ["2"]),
+    ({"title": "QA"}, ["3"]),
+]
+
+
+@pytest.mark.parametrize("criteria, expected", CASES)
+def test_compile_criteria(criteria, expected):
+    matches = compile_criteria(criteria)
+    assert [v.hh_id for v in VACANCIES if matches(v)] == expected
+
+
+@pytest.mark.parametrize("factory, name", [
+    (JSONVacancyStorage, "v.json"),
+    (JSONLVacancyStorage, "v.jsonl"),
+    (CSVVacancyStorage, "v.csv"),
+    (TXTVacancyStorage, "v.txt"),
+    (ExcelVacancyStorage, "v.xlsx"),
+    (lambda path: IndexedVacancyStorage(), None),
+    (ColumnarVacancyStorage, "v.vcol"),
+])
+def test_backends_filter_the_same_way(tmp_path, factory, name):
+    storage = factory(str(tmp_path / (name or "unused")))
+    storage.add_vacancies(VACANCIES)
+    for criteria, expected in CASES:
+        assert [v.title for v in storage.get_vacancies(criteria)] == \
+               [v.title for v in VACANCIES if v.hh_id in expected], criteria
+
+
+def test_split_criteria_resolves_aliases():
+    assert split_criteria({"employer": "80", "foo": 1}, {"employer_hh_id"}) == ({"employer_hh_id": "80"}, {"foo": 1})
+
+
+def test_criteria_where():
+    where, params, rest = criteria_where({"keyword": "50%", "employer": "80", "min_salary": 1, "foo": "bar"})
+    assert where == f"WHERE {NORMALIZED_SEARCH_TEXT_SQL} ILIKE %s AND e.hh_id = %s AND COALESCE(v.salary_mid, 0) >= %s"
+    assert params == ["%50\\%%", "80", 1]
+    assert rest == {"foo": "bar"}
+    assert criteria_where({}) == ("", [], {})
+
+
+# Ключевое слово и текст с ё, разным регистром и разметкой HH: совпадения везде одинаковые
+NORMALIZATION_VACANCIES = [
+    Vacancy("Ведущий ИНЖЕНЕР", "n1", None, "Всё о <highlighttext>Python</highlighttext>", "",
+            hh_id="n1", employer_hh_id="test-normalization"),
+    Vacancy("Аналитик", "n2", None, "Учет ёлок", "Excel", hh_id="n2", employer_hh_id="test-normalization"),
+]
+NORMALIZATION_CASES = [
+    ({"keyword": "инженер"}, ["n1"]),
+    ({"keyword": "ВСЕ О python"}, ["n1"]),
+    ({"keyword": "ЁЛОК"}, ["n2"]),
+    ({"keyword": "учёт елок"}, ["n2"]),
+    ({"keyword": "highlighttext"}, []),
+]
+
+
+def _database_storage(tmp_path):
+    if not os.getenv("TEST_DB_NAME"):
+        pytest.skip("TEST_DB_NAME не задан: проверка на PostgreSQL пропущена")
+    from src.bd_sql.db import DatabaseVacancyStorage
+
+    storage = DatabaseVacancyStorage(os.environ["TEST_DB_NAME"], os.getenv("DB_USER", "postgres"),
+                                     os.getenv("DB_PASSWORD", ""), os.getenv("DB_HOST", "127.0.0.1"))
+    storage.add_employer({"id": "test-normalization", "name": "Test"})
+    storage.expire_vacancies("test-normalization", [])
+    return storage
+
+
+@pytest.mark.parametrize("factory", [
+    lambda tmp_path: JSONVacancyStorage(str(tmp_path / "v.json")),
+    lambda tmp_path: IndexedVacancyStorage(),
+    _database_storage,
+], ids=["json", "indexed", "postgres"])
+def test_keyword_normalization_is_the_same_on_all_backends(tmp_path, factory):
+    storage = factory(tmp_path)
+    storage.add_vacancies(NORMALIZATION_VACANCIES)
+    try:
+        for criteria, expected in NORMALIZATION_CASES:
+            assert sorted(v.hh_id for v in storage.get_vacancies(criteria)) == expected, criteria
+    finally:
+        if hasattr(storage, "expire_vacancies"):
+            storage.expire_vacancies("test-normalization", [])
+
+
+def test_normalized_search_index_matches_query_expression():
+    def squash(expression):
+        return re.sub(r"\s+", "", expression.replace("v.", ""))
+
+    index_sql = next(statement for migration in MIGRATIONS for statement in migration.statements
+                     if "idx_vacancies_search_norm_trgm" in statement)
+    assert squash(NORMALIZED_SEARCH_TEXT_SQL) in squash(index_sql)
@@ -12,7 +12,7 @@ def test_csv_storage_file_creation(tmp_path):
     with open(file_path, 'r') as f:
         reader = csv.reader(f)
         headers = next(reader)
-        assert headers == ["title", "link", "salary", "description", "requirements"]
+        assert headers == ["title", "link", "salary", "description", "requirements", "hh_id", "employer_hh_id", "search_text"]
 
 def test_csv_add_get_filter(tmp_path):
     file_path = tmp_path / "vac.csv"
@@ -35,4 +35,24 @@ def test_csv_delete_vacancy(tmp_path):
     storage.add_vacancy(v)
     storage.delete_vacancy({"title": "Dev"})
     result = storage.get_vacancies({})
-    assert len(result) == 0
\ No newline at end of file
+    assert len(result) == 0
+def test_csv_add_vacancies_batch(tmp_path):
+    file_path = tmp_path / "vac.csv"
+    storage = CSVVacancyStorage(str(file_path))
+
+    storage.add_vacancies([Vacancy(f"Dev{i}", "url", None, "desc", "req") for i in range(3)])
+
+    assert [v.title for v in storage.get_vacancies({})] == ["Dev0", "Dev1", "Dev2"]
+
+
+def test_csv_iter_vacancies_stops_at_limit(tmp_path):
+    file_path = tmp_path / "vac.csv"
+    storage = CSVVacancyStorage(str(file_path))
+    storage.add_vacancies([Vacancy(f"Dev{i}", "url", None, "desc", "req") for i in range(3)])
+    # Поврежденная строка в конце файла не читается, если limit уже достигнут
+    with open(file_path, "a", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerow(["Broken", "url", "{not json", "desc", "req"])
+
+    result = storage.iter_vacancies({"keyword": "desc"}, limit=2)
+
+    assert [v.title for v in result] == ["Dev0", "Dev1"]
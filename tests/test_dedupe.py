@@ -0,0 +1,87 @@
+import csv
+import json
+import os
+
+import pytest
+
+from src.models import Vacancy
+from src.storage import (ColumnarVacancyStorage, CSVVacancyStorage, ExcelVacancyStorage, JSONLVacancyStorage,
+                         JSONVacancyStorage, TXTVacancyStorage)
+from src.storage.dedupe import dedupe_data_dir, hh_id_from_link
+from src.storage.keys import KeyIndex, dedupe_vacancies, upsert_vacancies
+
+BACKENDS = [
+    (JSONVacancyStorage, "v.json"),
+    (JSONLVacancyStorage, "v.jsonl"),
+    (CSVVacancyStorage, "v.csv"),
+    (TXTVacancyStorage, "v.txt"),
+    (ExcelVacancyStorage, "v.xlsx"),
+    (ColumnarVacancyStorage, "v.vcol"),
+]
+
+
+def make(hh_id, title, salary_from=100):
+    return Vacancy(title, f"https://hh.ru/vacancy/{hh_id}", {"from": salary_from, "currency": "RUR"}, "", "",
+                   hh_id=hh_id, employer_hh_id="80")
+
+
+def test_dedupe_and_upsert_keep_order():
+    stored = [make("1", "a"), make("2", "b"), make("1", "a-copy"), Vacancy("x", "l", None, "", "")]
+    assert [v.title for v in dedupe_vacancies([make("1", "a"), make("2", "b"), make("1", "a2")])] == ["a2", "b"]
+    result = upsert_vacancies(stored, [make("1", "a-new"), make("3", "c")])
+    assert [v.title for v in result] == ["a-new", "b", "x", "c"]
+
+
+@pytest.mark.parametrize("factory, name", BACKENDS)
+def test_add_vacancies_upserts_by_hh_id(tmp_path, factory, name):
+    path = str(tmp_path / name)
+    storage = factory(path)
+    storage.add_vacancies([make("1", "old"), make("2", "second")])
+    storage.add_vacancy(make("1", "new", salary_from=500))
+    storage.add_vacancies([make("3", "third"), make("3", "third-updated")])
+
+    # Повторное открытие: индекс ключей и идентификаторы читаются из файла
+    if hasattr(storage, "flush"):
+        storage.flush()
+    storage = factory(path)
+    vacancies = storage.get_vacancies({})
+    assert sorted((v.hh_id, v.title) for v in vacancies) == [("1", "new"), ("2", "second"), ("3", "third-updated")]
+    assert storage.get_vacancies({"hh_id": "1"})[0].salary == {"from": 500, "to": None, "currency": "RUR"}
+    assert all(v.employer_hh_id == "80" for v in vacancies)
+
+
+def test_key_index_rebuilds_when_file_changed_outside(tmp_path):
+    path = str(tmp_path / "v.csv")
+    storage = CSVVacancyStorage(path)
+    storage.add_vacancy(make("1", "a"))
+    with open(path, "a", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerow(CSVVacancyStorage._to_row(make("2", "b")))
+
+    index = KeyIndex(path, lambda: ["1", "2"])
+    assert "2" in index and len(index) == 2
+    # После пересборки отметка совпадает — индекс читается из файла-спутника
+    assert "2" in KeyIndex(path, lambda: [])
+
+
+def test_hh_id_from_link():
+    assert hh_id_from_link("https://hh.ru/vacancy/121160623") == "121160623"
+    assert hh_id_from_link("https://api.hh.ru/vacancies/42?host=hh.ru") == "42"
+    assert hh_id_from_link("link") is None
+
+
+def test_dedupe_data_dir_backfills_ids_from_links(tmp_path):
+    records = [{"title": t, "link": f"https://hh.ru/vacancy/{i}", "salary": None, "description": "",
+                "requirements": ""} for t, i in [("a", 1), ("b", 2), ("a2", 1), ("c", 3), ("a3", 1)]]
+    with open(tmp_path / "vacancies.json", "w", encoding="utf-8") as file:
+        json.dump(records, file)
+    with open(tmp_path / "vacancies.txt", "w", encoding="utf-8") as file:
+        file.writelines(f"{r['title']}\t{r['link']}\t\t\t\n" for r in records)
+    open(tmp_path / "notes.md", "w").close()
+
+    removed = dedupe_data_dir(str(tmp_path))
+
+    assert removed == {os.path.join(str(tmp_path), "vacancies.json"): 2,
+                       os.path.join(str(tmp_path), "vacancies.txt"): 2}
+    for storage in (JSONVacancyStorage(str(tmp_path / "vacancies.json")),
+                    TXTVacancyStorage(str(tmp_path / "vacancies.txt"))):
+        assert [(v.hh_id, v.title) for v in storage.get_vacancies({})] == [("1", "a3"), ("2", "b"), ("3", "c")]
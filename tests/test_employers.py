@@ -0,0 +1,74 @@
+import json
+
+from src.api.employers import EmployerIdResolver, load_company_names
+from src.api.http_client import HTTPClient
+from src.api.rate_limiter import NoRateLimiter
+
+
+def _employers_handler(path, query):
+    text = query["text"]
+    if text == "broken":
+        return 500, {}, {}
+    if text == "missing":
+        return 200, {}, {"items": [], "found": 0}
+    if text == "no-id":
+        return 200, {}, {"items": [{"name": text}], "found": 1}
+    if text == "not-object":
+        return 200, {}, [text]
+    if text == "bad-items":
+        return 200, {}, {"items": {"id": "1"}, "found": 1}
+    return 200, {}, {"items": [{"id": f"id-{text}", "name": text}], "found": 1}
+
+
+def _resolver(hh_server):
+    return EmployerIdResolver(client=HTTPClient(retries=0), rate_limiter=NoRateLimiter(),
+                              base_url=hh_server.url + "/employers")
+
+
+def test_resolver_merges_results_into_file(hh_server, tmp_path):
+    hh_server.handler = _employers_handler
+    file_path = tmp_path / "company_ids.json"
+    file_path.write_text(json.dumps({"old": "1", "broken": "2"}), encoding="utf-8")
+    companies = [f"c{i}" for i in range(50)] + ["missing", "broken", "c0"]
+
+    result = _resolver(hh_server).resolve(companies, str(file_path))
+
+    saved = json.loads(file_path.read_text(encoding="utf-8"))
+    assert saved == result
+    assert saved["old"] == "1"
+    assert saved["broken"] == "2"  # ошибка запроса не затирает известный ID
+    assert saved["missing"] is None
+    assert saved["c49"] == "id-c49"
+    assert len(hh_server.requests) == 52
+    assert not (tmp_path / "company_ids.json.tmp").exists()
+
+
+def test_resolver_survives_malformed_responses(hh_server, tmp_path):
+    hh_server.handler = _employers_handler
+    file_path = tmp_path / "company_ids.json"
+    file_path.write_text(json.dumps({"no-id": "7"}), encoding="utf-8")
+
+    result = _resolver(hh_server).resolve(["no-id", "not-object", "bad-items", "a", "b"], str(file_path))
+
+    assert result == {"no-id": "7", "not-object": None, "bad-items": None, "a": "id-a", "b": "id-b"}
+    assert json.loads(file_path.read_text(encoding="utf-8")) == result
+
+
+def test_resolver_skips_known_companies(hh_server, tmp_path):
+    hh_server.handler = _employers_handler
+    file_path = tmp_path / "company_ids.json"
+    file_path.write_text(json.dumps({"a": "1", "b": None}), encoding="utf-8")
+
+    result = _resolver(hh_server).resolve(["a", "b"], str(file_path), skip_known=True)
+
+    assert result == {"a": "1", "b": "id-b"}
+    assert [query["text"] for _, query, _ in hh_server.requests] == ["b"]
+
+
+def test_load_company_names(tmp_path):
+    txt = tmp_path / "companies.txt"
+    txt.write_text("Яндекс\n# комментарий\n\n  Ozon  \n", encoding="utf-8")
+    assert load_company_names(str(txt)) == ["Яндекс", "Ozon"]
+    ids = tmp_path / "company_ids.json"
+    ids.write_text(json.dumps({"Сбер": "1"}), encoding="utf-8")
+    assert load_company_names(str(ids)) == ["Сбер"]
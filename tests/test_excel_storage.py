@@ -32,4 +32,31 @@ def test_excel_delete_vacancy(tmp_path):
     v = Vacancy("X", "url", {"from": 100000}, "desc", "req")
     storage.add_vacancy(v)
     storage.delete_vacancy({"title": "X"})
-    assert storage.get_vacancies({}) == []
\ No newline at end of file
+    assert storage.get_vacancies({}) == []
+def test_excel_add_vacancies_batch(tmp_path):
+    file_path = tmp_path / "vac.xlsx"
+    storage = ExcelVacancyStorage(str(file_path))
+    storage.add_vacancies([Vacancy(f"Dev{i}", "url", None, "desc", "req") for i in range(3)])
+    assert [v.title for v in storage.get_vacancies({})] == ["Dev0", "Dev1", "Dev2"]
+
+def test_excel_buffers_until_flush(tmp_path):
+    file_path = tmp_path / "vac.xlsx"
+    with ExcelVacancyStorage(str(file_path)) as storage:
+        storage.add_vacancy(Vacancy("A", "url", None, "desc", "req"))
+        # до flush вакансия видна через хранилище, но еще не записана в файл
+        assert [v.title for v in storage.get_vacancies({})] == ["A"]
+        assert ExcelVacancyStorage(str(file_path)).get_vacancies({}) == []
+
+    assert [v.title for v in ExcelVacancyStorage(str(file_path)).get_vacancies({})] == ["A"]
+
+
+def test_excel_flushes_when_buffer_is_full(tmp_path):
+    file_path = tmp_path / "vac.xlsx"
+    storage = ExcelVacancyStorage(str(file_path), buffer_size=2)
+    storage.add_vacancies([Vacancy(f"Dev{i}", "url", None, "desc", "req") for i in range(2)])
+    storage.add_vacancy(Vacancy("Dev2", "url", None, "desc", "req"))
+
+    on_disk = ExcelVacancyStorage(str(file_path)).get_vacancies({})
+    assert [v.title for v in on_disk] == ["Dev0", "Dev1"]
+    storage.flush()
+    assert len(ExcelVacancyStorage(str(file_path)).get_vacancies({})) == 3
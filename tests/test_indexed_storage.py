@@ -0,0 +1,53 @@
+from src.models import Vacancy
+from src.storage.indexed_storage import IndexedVacancyStorage
+from src.storage.jsonl_storage import JSONLVacancyStorage
+
+
+def _storage():
+    storage = IndexedVacancyStorage()
+    storage.add_vacancies([
+        Vacancy("Python разработчик", "l1", {"from": 150000, "to": 250000}, "Backend на Django",
+                "Опыт <highlighttext>разработки</highlighttext>", hh_id="1", employer_hh_id="80"),
+        Vacancy("Java Dev", "l2", {"from": 120000}, "Spring", "Java 17", hh_id="2", employer_hh_id="80"),
+        Vacancy("QA", "l3", None, "Тестирование", "Pytest, python", hh_id="3", employer_hh_id="3529"),
+    ])
+    return storage
+
+
+def test_keyword_matches_substrings_like_linear_scan():
+    storage = _storage()
+    assert [v.hh_id for v in storage.get_vacancies({"keyword": "PYTHON"})] == ["1", "3"]
+    assert [v.hh_id for v in storage.get_vacancies({"keyword": "разработ"})] == ["1"]
+    assert [v.hh_id for v in storage.get_vacancies({"keyword": "java 17"})] == ["2"]
+    assert storage.get_vacancies({"keyword": "highlighttext"}) == []
+
+
+def test_min_salary_and_equality_indexes():
+    storage = _storage()
+    assert [v.hh_id for v in storage.get_vacancies({"min_salary": 150000})] == ["1"]
+    assert [v.hh_id for v in storage.get_vacancies({"min_salary": 100000})] == ["1", "2"]
+    assert [v.hh_id for v in storage.get_vacancies({"employer_hh_id": "80", "keyword": "java"})] == ["2"]
+    assert storage.get_vacancies({"employer_hh_id": "unknown"}) == []
+
+
+def test_upsert_and_delete_keep_indexes_consistent():
+    storage = _storage()
+    storage.add_vacancy(Vacancy("Go Dev", "l2", {"from": 300000}, "Go", "Kubernetes", hh_id="2"))
+    assert len(storage) == 3
+    assert storage.get_vacancies({"keyword": "java"}) == []
+    assert [v.hh_id for v in storage.get_vacancies({"min_salary": 250000})] == ["2"]
+
+    storage.delete_vacancy({"keyword": "python"})
+    assert [v.hh_id for v in storage.get_vacancies({})] == ["2"]
+    assert storage.get_vacancies({"min_salary": 0}) == storage.get_vacancies({})
+
+
+def test_indexed_storage_loads_from_and_writes_to_backing(tmp_path):
+    backing = JSONLVacancyStorage(str(tmp_path / "vac.jsonl"))
+    backing.add_vacancy(Vacancy("Python Dev", "l1", None, "desc", "req", hh_id="1"))
+
+    storage = IndexedVacancyStorage(backing)
+    assert len(storage) == 1
+    storage.add_vacancy(Vacancy("Java Dev", "l2", None, "desc", "req", hh_id="2"))
+
+    assert [v.hh_id for v in JSONLVacancyStorage(str(tmp_path / "vac.jsonl")).get_vacancies({})] == ["1", "2"]
@@ -68,3 +68,15 @@ def test_json_storage_delete_vacancy(tmp_path):
     results = storage.get_vacancies({})
     assert len(results) == 1
     assert results[0].title == "Dev2"
+
+
+def test_json_storage_salary_report(tmp_path):
+    storage = JSONVacancyStorage(str(tmp_path / "vacancies.json"))
+    storage.add_vacancies([
+        Vacancy("Low", "url", {"from": 50000}, "desc", "req"),
+        Vacancy("High", "url", {"from": 150000}, "desc", "req"),
+        Vacancy("None", "url", None, "desc", "req"),
+    ])
+
+    assert storage.get_salary_stats()["avg"] == 100000
+    assert [v.title for v in storage.get_vacancies_with_higher_salary()] == ["High"]
@@ -0,0 +1,67 @@
+import json
+
+from src.models import Vacancy
+from src.storage.jsonl_storage import JSONLVacancyStorage, migrate_json_to_jsonl
+
+
+def test_jsonl_add_is_append_only(tmp_path):
+    file_path = tmp_path / "vacancies.jsonl"
+    storage = JSONLVacancyStorage(str(file_path))
+
+    storage.add_vacancy(Vacancy("Dev1", "link1", {"from": 100000}, "desc", "req", hh_id="1"))
+    first_line = file_path.read_text(encoding="utf-8").splitlines()[0]
+    storage.add_vacancy(Vacancy("Dev2", "link2", None, "desc", "req", hh_id="2"))
+
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[0] == first_line
+    assert json.loads(lines[1])["_rid"] == 1
+
+
+def test_jsonl_get_and_persist(tmp_path):
+    file_path = tmp_path / "vacancies.jsonl"
+    storage = JSONLVacancyStorage(str(file_path))
+    storage.add_vacancy(Vacancy("Python Dev", "link", None, "Python backend", "Django", hh_id="1"))
+    storage.add_vacancy(Vacancy("Java Dev", "link", None, "Java backend", "Spring", hh_id="2"))
+
+    reopened = JSONLVacancyStorage(str(file_path))
+    results = reopened.get_vacancies({"keyword": "python"})
+    assert [v.title for v in results] == ["Python Dev"]
+    assert results[0].hh_id == "1"
+    assert len(reopened.get_vacancies({})) == 2
+
+
+def test_jsonl_delete_writes_tombstone_and_compacts(tmp_path):
+    file_path = tmp_path / "vacancies.jsonl"
+    storage = JSONLVacancyStorage(str(file_path), compaction_ratio=0.5)
+    for i in range(4):
+        storage.add_vacancy(Vacancy(f"Dev{i}", "link", None, "desc", "req"))
+
+    storage.delete_vacancy({"title": "Dev0"})
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1]) == {"_deleted": 0}
+    assert [v.title for v in storage.get_vacancies({})] == ["Dev1", "Dev2", "Dev3"]
+    assert [v.title for v in JSONLVacancyStorage(str(file_path)).get_vacancies({})] == ["Dev1", "Dev2", "Dev3"]
+
+    storage.delete_vacancy({"title": "Dev1"})
+    storage.delete_vacancy({"title": "Dev2"})
+    # надгробий больше половины записей — файл уплотнен
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["title"] == "Dev3"
+
+
+def test_migrate_json_to_jsonl(tmp_path):
+    source = tmp_path / "vacancies.json"
+    source.write_text(json.dumps([
+        Vacancy("A", "link", None, "desc", "req", hh_id="1").to_dict(),
+        Vacancy("B", "link", None, "desc", "req", hh_id="2").to_dict(),
+    ]), encoding="utf-8")
+    target = tmp_path / "vacancies.jsonl"
+
+    assert migrate_json_to_jsonl(str(source), str(target)) == 2
+
+    storage = JSONLVacancyStorage(str(target))
+    assert [v.hh_id for v in storage.get_vacancies({})] == ["1", "2"]
+    storage.add_vacancy(Vacancy("C", "link", None, "desc", "req"))
+    assert json.loads(target.read_text(encoding="utf-8").splitlines()[-1])["_rid"] == 2
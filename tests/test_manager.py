@@ -1,6 +1,5 @@
 import pytest
 from src.managers.vacancy_manager import VacancyManager, Vacancy, VacancyStorage
-from typing import Dict, Any, List
 
 
 class FakeAPI:
@@ -36,34 +35,6 @@ class InMemoryStorage(VacancyStorage):
     def delete_vacancy(self, criteria):
         self.vacancies.clear()
 
-    def _filter_vacancies(self, vacancies: List[Vacancy], criteria: Dict[str, Any]) -> List[Vacancy]:
-        if not criteria:
-            return vacancies
-
-        filtered = []
-        for vacancy in vacancies:
-            matches = True
-            for key, value in criteria.items():
-                if key == "keyword":
-                    keyword_lower = value.lower()
-                    title_match = keyword_lower in vacancy.title.lower()
-                    desc_match = keyword_lower in vacancy.description.lower()
-                    req_match = keyword_lower in vacancy.requirements.lower()
-
-                    if not (title_match or desc_match or req_match):
-                        matches = False
-                        break
-                elif key == "min_salary":
-                    if vacancy.get_salary() < value:
-                        matches = False
-                        break
-                elif getattr(vacancy, key, None) != value:
-                    matches = False
-                    break
-            if matches:
-                filtered.append(vacancy)
-        return filtered
-
 
 def test_fetch_and_store_vacancies():
     manager = VacancyManager(api=FakeAPI(), storage=InMemoryStorage())
@@ -110,3 +81,51 @@ def test_fetch_and_store_invalid_vacancy(mocker):
 
     manager.fetch_and_store_vacancies("bad")
     assert len(storage.vacancies) == 0
+
+
+def test_fetch_and_store_uses_single_batch_write():
+    class BatchStorage(InMemoryStorage):
+        def __init__(self):
+            super().__init__()
+            self.batches = 0
+
+        def add_vacancies(self, vacancies):
+            self.batches += 1
+            self.vacancies.extend(vacancies)
+
+    storage = BatchStorage()
+    VacancyManager(api=FakeAPI(), storage=storage).fetch_and_store_vacancies("Python")
+    assert storage.batches == 1
+    assert len(storage.vacancies) == 2
+
+
+def test_get_vacancies_with_keyword_limit():
+    storage = InMemoryStorage()
+    storage.vacancies = [Vacancy(f"Python {i}", "link", None, "Python developer", "Python") for i in range(5)]
+
+    manager = VacancyManager(api=None, storage=storage)
+    results = manager.get_vacancies_with_keyword("Python", limit=2)
+    assert [v.title for v in results] == ["Python 0", "Python 1"]
+
+
+def test_get_top_vacancies_by_salary_normalizes_currency():
+    storage = InMemoryStorage()
+    storage.vacancies = [
+        Vacancy("Rub", "link", {"from": 200_000, "to": 300_000, "currency": "RUR"}, "desc", "req"),
+        Vacancy("Usd", "link", {"from": 5_000, "currency": "USD"}, "desc", "req"),
+        Vacancy("None", "link", None, "desc", "req"),
+    ]
+    manager = VacancyManager(api=None, storage=storage)
+
+    assert [v.title for v in manager.get_top_vacancies_by_salary(3)] == ["Usd", "Rub", "None"]
+
+
+def test_get_top_vacancies_by_salary_uses_storage_pushdown(mocker):
+    storage = InMemoryStorage()
+    storage.get_top_vacancies_by_salary = mocker.Mock(return_value=["top"])
+    mocker.patch.object(storage, "iter_vacancies")
+    manager = VacancyManager(api=None, storage=storage)
+
+    assert manager.get_top_vacancies_by_salary(5) == ["top"]
+    storage.get_top_vacancies_by_salary.assert_called_once_with(5)
+    storage.iter_vacancies.assert_not_called()
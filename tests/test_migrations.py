@@ -0,0 +1,89 @@
+from src.bd_sql import migrations
+from src.bd_sql.migrations import Migration, ensure_schema
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.db.queries.append(query)
+        if "to_regclass" in query:
+            self._result = (self.db.has_version_table,)
+        elif "MAX(version)" in query:
+            self._result = (max(self.db.versions, default=0),)
+        elif "SELECT 1 FROM schema_version" in query:
+            self._result = (1,) if params[0] in self.db.versions else None
+        elif "INSERT INTO schema_version" in query:
+            self.db.versions.add(params[0])
+        elif "CREATE TABLE IF NOT EXISTS schema_version" in query:
+            self.db.has_version_table = True
+
+    def fetchone(self):
+        return self._result
+
+
+class FakeDB:
+    def __init__(self, versions=()):
+        self.versions = set(versions)
+        self.has_version_table = bool(versions)
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+class FakePool:
+    def __init__(self, db):
+        self.db = db
+
+    def connection(self):
+        db = self.db
+
+        class Ctx:
+            def __enter__(self):
+                return db
+
+            def __exit__(self, *args):
+                pass
+        return Ctx()
+
+
+TEST_MIGRATIONS = [
+    Migration(1, "first", ["CREATE TABLE a (id int)"]),
+    Migration(2, "second", ["CREATE INDEX a_idx ON a (id)"]),
+]
+
+
+def test_ensure_schema_applies_pending_migrations(mocker):
+    mocker.patch.object(migrations, "_checked", set())
+    mocker.patch("builtins.print")
+    db = FakeDB(versions={1})
+
+    ensure_schema(FakePool(db), {"dbname": "fresh"}, TEST_MIGRATIONS)
+
+    assert db.versions == {1, 2}
+    assert "CREATE INDEX a_idx ON a (id)" in db.queries
+    assert "CREATE TABLE a (id int)" not in db.queries
+
+
+def test_ensure_schema_fast_path_runs_no_ddl(mocker):
+    mocker.patch.object(migrations, "_checked", set())
+    db = FakeDB(versions={1, 2})
+
+    ensure_schema(FakePool(db), {"dbname": "current"}, TEST_MIGRATIONS)
+    assert not any("CREATE" in q for q in db.queries)
+
+    db.queries.clear()
+    ensure_schema(FakePool(db), {"dbname": "current"}, TEST_MIGRATIONS)
+    assert db.queries == []
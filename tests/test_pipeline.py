@@ -0,0 +1,258 @@
+from src.api.http_client import HTTPClient
+from src.api.response_cache import ResponseCache
+from src.api.rate_limiter import NoRateLimiter
+from src.bd_sql.pipeline import VacancyIngestionPipeline, vacancy_from_hh_item
+from src.bd_sql.sync_state import FileSyncState, later_timestamp
+
+
+class FakeDBStorage:
+    def __init__(self):
+        self.employers = []
+        self.vacancies = []
+
+    def add_employer(self, employer, source_id=1):
+        self.employers.append(employer["id"])
+
+    def add_vacancies(self, vacancies, batch_size=500):
+        vacancies = list(vacancies)
+        self.vacancies.extend(vacancies)
+        return len(vacancies)
+
+
+def _hh_handler(pages_by_employer):
+    def handler(path, query):
+        if path.startswith("/employers/"):
+            emp_id = path.rsplit("/", 1)[1]
+            return 200, {}, {"id": emp_id, "name": f"Employer {emp_id}"}
+        emp_id = query["employer_id"]
+        page = int(query["page"])
+        items = [
+            {"id": f"{emp_id}-{page}-{i}", "name": "Dev", "alternate_url": "url",
+             "snippet": {"requirement": "req", "responsibility": "resp"}, "employer": {"id": emp_id}}
+            for i in range(3)
+        ]
+        return 200, {}, {"items": items, "pages": pages_by_employer[emp_id], "page": page}
+    return handler
+
+
+def test_pipeline_loads_all_employers_and_pages(hh_server):
+    hh_server.handler = _hh_handler({"1": 4, "2": 2})
+    storage = FakeDBStorage()
+    pipeline = VacancyIngestionPipeline(
+        storage, client=HTTPClient(), rate_limiter=NoRateLimiter(), base_url=hh_server.url,
+        batch_size=5, queue_size=4
+    )
+
+    stats = pipeline.run_sync(["1", "2"])
+
+    assert sorted(storage.employers) == ["1", "2"]
+    assert len(storage.vacancies) == 18
+    assert len({v.hh_id for v in storage.vacancies}) == 18
+    assert stats.pages == 6
+    assert stats.written == 18
+    assert stats.employers == 2
+    assert stats.batches >= 4
+    assert stats.max_queue_depth <= 4
+    assert stats.vacancies_per_second > 0
+
+
+def test_pipeline_counts_failed_employer(hh_server):
+    def handler(path, query):
+        if query.get("employer_id") == "bad":
+            return 404, {}, {}
+        return _hh_handler({"ok": 1})(path, query)
+
+    hh_server.handler = handler
+    storage = FakeDBStorage()
+    pipeline = VacancyIngestionPipeline(
+        storage, client=HTTPClient(retries=0), rate_limiter=NoRateLimiter(), base_url=hh_server.url,
+        load_employers=False
+    )
+
+    stats = pipeline.run_sync(["ok", "bad"])
+
+    assert stats.written == 3
+    assert stats.failed == 1
+
+
+def test_vacancy_from_hh_item():
+    vacancy = vacancy_from_hh_item({
+        "id": "42", "name": "Dev", "alternate_url": "url", "salary": None,
+        "snippet": {"requirement": "req", "responsibility": "resp"}, "employer": {"id": "7"}
+    })
+    assert vacancy.hh_id == "42"
+    assert vacancy.description == "resp"
+    assert vacancy.employer_hh_id == "7"
+
+
+class FakeSyncedStorage(FakeDBStorage):
+    def __init__(self):
+        super().__init__()
+        self.by_id = {}
+
+    def add_vacancies(self, vacancies, batch_size=500):
+        vacancies = list(vacancies)
+        self.by_id.update((v.hh_id, v) for v in vacancies)
+        return super().add_vacancies(vacancies, batch_size)
+
+    def count_vacancies(self, employer_hh_id):
+        return sum(v.employer_hh_id == employer_hh_id for v in self.by_id.values())
+
+    def expire_vacancies(self, employer_hh_id, active_ids):
+        expired = [k for k, v in self.by_id.items() if v.employer_hh_id == employer_hh_id and k not in active_ids]
+        for key in expired:
+            del self.by_id[key]
+        return len(expired)
+
+
+def _published_handler(published):
+    """Выдача /vacancies работодателя "1" из словаря {id: published_at} с учетом date_from и per_page."""
+    def handler(path, query):
+        items = [
+            {"id": hh_id, "name": "Dev", "alternate_url": "url", "published_at": published_at,
+             "employer": {"id": "1"}}
+            for hh_id, published_at in sorted(published.items(), key=lambda item: item[1], reverse=True)
+            if published_at >= query.get("date_from", "")
+        ]
+        per_page, page = int(query.get("per_page", 20)), int(query.get("page", 0))
+        return 200, {}, {"items": items[page * per_page:(page + 1) * per_page], "found": len(items),
+                         "pages": max(1, -(-len(items) // per_page)), "page": page}
+    return handler
+
+
+def test_incremental_sync_fetches_delta_and_expires_removed(hh_server, tmp_path):
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    storage = FakeSyncedStorage()
+
+    def run():
+        pipeline = VacancyIngestionPipeline(storage, client=HTTPClient(), rate_limiter=NoRateLimiter(),
+                                            base_url=hh_server.url, load_employers=False, sync_state=state, expire=True)
+        return pipeline.run_sync(["1"])
+
+    hh_server.handler = _published_handler({"a": "2024-05-01T10:00:00+0300", "b": "2024-05-01T11:00:00+0300"})
+    stats = run()
+    assert (stats.written, stats.expired) == (2, 0)
+    assert FileSyncState(state.file_path).get("employer_id=1") == "2024-05-01T11:00:00+0300"
+
+    # "a" сняли с публикации, появилась "c": загружается только дельта, "a" удаляется
+    hh_server.requests.clear()
+    hh_server.handler = _published_handler({"b": "2024-05-01T11:00:00+0300", "c": "2024-05-01T12:00:00+0300"})
+    stats = run()
+    assert hh_server.requests[0][1]["date_from"] == "2024-05-01T11:00:00+0300"
+    assert (stats.written, stats.expired) == (2, 1)
+    assert sorted(storage.by_id) == ["b", "c"]
+    assert state.get("employer_id=1") == "2024-05-01T12:00:00+0300"
+
+    # Ничего не изменилось: одна страница дельты и одна проверка количества
+    hh_server.requests.clear()
+    stats = run()
+    assert (stats.written, stats.expired, len(hh_server.requests)) == (1, 0, 2)
+
+
+def test_incremental_sync_ignores_fresh_cached_pages(hh_server, tmp_path):
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    storage = FakeSyncedStorage()
+    client = HTTPClient(cache=ResponseCache(str(tmp_path / "cache.sqlite")))
+
+    def run():
+        pipeline = VacancyIngestionPipeline(storage, client=client, rate_limiter=NoRateLimiter(),
+                                            base_url=hh_server.url, load_employers=False, sync_state=state, expire=True)
+        return pipeline.run_sync(["1"])
+
+    hh_server.handler = _published_handler({"a": "2024-05-01T10:00:00+0300", "b": "2024-05-01T11:00:00+0300"})
+    run()
+
+    # Второй запуск в пределах TTL кеша: проверка на удаление не должна видеть прошлую выдачу
+    hh_server.handler = _published_handler({"b": "2024-05-01T11:00:00+0300", "c": "2024-05-01T12:00:00+0300"})
+    stats = run()
+    client.close()
+
+    assert (stats.written, stats.expired) == (2, 1)
+    assert sorted(storage.by_id) == ["b", "c"]
+    assert state.get("employer_id=1") == "2024-05-01T12:00:00+0300"
+
+
+def test_incremental_sync_keeps_watermark_on_write_error(hh_server, tmp_path):
+    class BrokenStorage(FakeDBStorage):
+        def add_vacancies(self, vacancies, batch_size=500):
+            raise RuntimeError("db down")
+
+    hh_server.handler = _published_handler({"a": "2024-05-01T10:00:00+0300"})
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    pipeline = VacancyIngestionPipeline(BrokenStorage(), client=HTTPClient(), rate_limiter=NoRateLimiter(),
+                                        base_url=hh_server.url, load_employers=False, sync_state=state)
+
+    stats = pipeline.run_sync(queries=[{"text": "python"}])
+
+    assert stats.failed == 1
+    assert state.get("text=python") is None
+
+
+def test_incremental_sync_keeps_watermark_when_rows_are_skipped(hh_server, tmp_path):
+    class MissingEmployerStorage(FakeDBStorage):
+        def add_vacancies(self, vacancies, batch_size=500):
+            return 0  # работодатель еще не загружен — вакансии пропущены
+
+    hh_server.handler = _published_handler({"a": "2024-05-01T10:00:00+0300"})
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    pipeline = VacancyIngestionPipeline(MissingEmployerStorage(), client=HTTPClient(), rate_limiter=NoRateLimiter(),
+                                        base_url=hh_server.url, load_employers=False, sync_state=state)
+
+    stats = pipeline.run_sync(["1"])
+
+    assert (stats.written, stats.failed) == (0, 1)
+    assert state.get("employer_id=1") is None
+
+
+def test_incremental_sync_isolates_malformed_response(hh_server, tmp_path):
+    good = _published_handler({"a": "2024-05-01T10:00:00+0300"})
+    bad = _published_handler({"b": "2024-05-01T11:00:00+0300", "c": "вчера"})
+    hh_server.handler = lambda path, query: (bad if query.get("text") == "bad" else good)(path, query)
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    pipeline = VacancyIngestionPipeline(FakeDBStorage(), client=HTTPClient(), rate_limiter=NoRateLimiter(),
+                                        base_url=hh_server.url, load_employers=False, sync_state=state)
+
+    stats = pipeline.run_sync(queries=[{"text": "bad"}, {"text": "good"}])
+
+    assert stats.failed == 1
+    assert state.get("text=bad") is None
+    assert state.get("text=good") == "2024-05-01T10:00:00+0300"
+
+
+def test_incremental_sync_isolates_storage_errors(hh_server, tmp_path):
+    class FlakyStorage(FakeSyncedStorage):
+        def add_employer(self, employer, source_id=1):
+            if employer["id"] == "2":
+                raise RuntimeError("db down")
+            super().add_employer(employer, source_id)
+
+        def expire_vacancies(self, employer_hh_id, active_ids):
+            if employer_hh_id == "3":
+                raise RuntimeError("db down")
+            return super().expire_vacancies(employer_hh_id, active_ids)
+
+    published = _published_handler({"a": "2024-05-01T10:00:00+0300"})
+
+    def handler(path, query):
+        if path.startswith("/employers/"):
+            emp_id = path.rsplit("/", 1)[1]
+            return 200, {}, {"id": emp_id, "name": f"Employer {emp_id}"}
+        return published(path, query)
+
+    hh_server.handler = handler
+    state = FileSyncState(str(tmp_path / "sync.json"))
+    pipeline = VacancyIngestionPipeline(FlakyStorage(), client=HTTPClient(), rate_limiter=NoRateLimiter(),
+                                        base_url=hh_server.url, sync_state=state, expire=True)
+
+    stats = pipeline.run_sync(["1", "2", "3"])
+
+    assert (stats.employers, stats.failed) == (2, 2)
+    assert state.get("employer_id=1") == "2024-05-01T10:00:00+0300"
+    assert state.get("employer_id=2") is None
+    assert state.get("employer_id=3") is None
+
+
+def test_later_timestamp_compares_time_zones():
+    assert later_timestamp(None, "2024-05-01T10:00:00+0300") == "2024-05-01T10:00:00+0300"
+    assert later_timestamp("2024-05-01T10:00:00+0300", "2024-05-01T08:30:00+0000") == "2024-05-01T08:30:00+0000"
+    assert later_timestamp("2024-05-01T10:00:00+0300", None) == "2024-05-01T10:00:00+0300"
@@ -0,0 +1,88 @@
+import pytest
+
+from src.bd_sql import pool as pool_module
+from src.bd_sql.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def get_transaction_status(self):
+        return 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeThreadedPool:
+    def __init__(self, minconn, maxconn, **params):
+        self.free = []
+        self.created = 0
+        self.discarded = 0
+
+    def getconn(self):
+        if self.free:
+            return self.free.pop()
+        self.created += 1
+        return FakeConnection()
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.discarded += 1
+        else:
+            self.free.append(conn)
+
+    def closeall(self):
+        self.free.clear()
+
+
+@pytest.fixture
+def fake_pool(mocker):
+    mocker.patch.object(pool_module, "ThreadedConnectionPool", FakeThreadedPool)
+    return ConnectionPool(1, 2, dbname="test")
+
+
+def test_pool_reuses_connection_and_commits(fake_pool):
+    with fake_pool.connection() as first:
+        pass
+    with fake_pool.connection() as second:
+        pass
+
+    assert first is second
+    assert first.commits == 2
+    assert fake_pool._pool.created == 1
+
+
+def test_pool_rolls_back_on_error(fake_pool):
+    with pytest.raises(ValueError):
+        with fake_pool.connection() as conn:
+            raise ValueError("boom")
+    assert conn.rollbacks == 1
+    assert conn.commits == 0
+
+
+def test_pool_discards_closed_connection(fake_pool):
+    with fake_pool.connection() as conn:
+        pass
+    conn.closed = 1
+
+    with fake_pool.connection() as fresh:
+        pass
+
+    assert fresh is not conn
+    assert fake_pool._pool.discarded == 1
+
+
+def test_get_pool_is_shared_per_params(mocker):
+    mocker.patch.object(pool_module, "ThreadedConnectionPool", FakeThreadedPool)
+    try:
+        assert pool_module.get_pool(dbname="a") is pool_module.get_pool(dbname="a")
+        assert pool_module.get_pool(dbname="a") is not pool_module.get_pool(dbname="b")
+    finally:
+        pool_module.close_all_pools()
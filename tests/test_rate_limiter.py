@@ -0,0 +1,89 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+from src.api.http_client import HTTPClient, parse_retry_after
+from src.api.rate_limiter import AdaptiveRateLimiter
+
+
+def _throttling_handler(failures, status=429, headers=None):
+    """Первые `failures` запросов получают `status`, остальные — 200."""
+    calls = []
+
+    def handler(path, query):
+        calls.append(path)
+        if len(calls) <= failures:
+            return status, headers or {}, {"errors": [{"type": "too_many_requests"}]}
+        return 200, {}, {"ok": True}
+
+    return handler
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("0.5") == 0.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_backoff_is_jittered_and_bounded():
+    limiter = AdaptiveRateLimiter(backoff_base=0.5, backoff_max=4)
+    delays = [limiter.backoff(attempt) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(limiter.backoff(0) <= 0.5 for _ in range(20))
+
+
+def test_adaptive_limiter_decreases_on_throttle_and_recovers():
+    limiter = AdaptiveRateLimiter(rate=8, min_rate=1, max_rate=10, increase=1)
+    limiter.on_throttle(retry_after=0)
+    limiter.on_throttle(retry_after=0)  # второй отказ в той же волне скорость не снижает
+    metrics = limiter.metrics()
+    assert metrics.rate == 4
+    assert (metrics.throttled, metrics.retry_after, metrics.decreases) == (2, 2, 1)
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.metrics().rate == 5
+    assert limiter.metrics().increases == 1
+
+
+def test_adaptive_limiter_pauses_after_retry_after():
+    limiter = AdaptiveRateLimiter(rate=100)
+    limiter.on_throttle(retry_after=0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+    limiter.on_throttle(retry_after=0.1)
+    start = time.monotonic()
+    asyncio.run(limiter.acquire_async())
+    assert time.monotonic() - start >= 0.09
+    assert limiter.metrics().waited >= 0.18
+
+
+def test_http_client_retries_throttled_request_with_retry_after(hh_server):
+    hh_server.handler = _throttling_handler(failures=1, headers={"Retry-After": "0.1"})
+    limiter = AdaptiveRateLimiter(rate=10)
+    with HTTPClient(rate_limiter=limiter) as client:
+        start = time.monotonic()
+        assert client.get_json(hh_server.url + "/vacancies") == {"ok": True}
+        assert time.monotonic() - start >= 0.09
+
+    metrics = limiter.metrics()
+    assert len(hh_server.requests) == 2
+    assert (metrics.throttled, metrics.retry_after, metrics.decreases) == (1, 1, 1)
+    assert metrics.rate == 5
+
+
+def test_http_client_backs_off_on_503_without_retry_after(hh_server):
+    hh_server.handler = _throttling_handler(failures=2, status=503)
+    limiter = AdaptiveRateLimiter(rate=10, backoff_base=0.01)
+    with HTTPClient(rate_limiter=limiter) as client:
+        assert client.get_json(hh_server.url + "/vacancies") == {"ok": True}
+
+    metrics = limiter.metrics()
+    assert len(hh_server.requests) == 3
+    assert metrics.throttled == 2
+    assert metrics.retry_after == 0
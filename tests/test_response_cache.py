@@ -0,0 +1,90 @@
+import pytest
+
+from src.api.http_client import HTTPClient, OfflineCacheMiss
+from src.api.response_cache import ResponseCache
+
+
+def _client(tmp_path, offline=False, **cache_options):
+    return HTTPClient(retries=0, cache=ResponseCache(str(tmp_path / "cache.sqlite"), **cache_options), offline=offline)
+
+
+def test_fresh_response_is_served_from_cache(hh_server, tmp_path):
+    hh_server.handler = lambda path, query: (200, {}, {"id": path.rsplit("/", 1)[1]})
+    with _client(tmp_path) as client:
+        assert client.get_json(hh_server.url + "/employers/1") == {"id": "1"}
+        assert client.get_json(hh_server.url + "/employers/1") == {"id": "1"}
+        assert client.get_cached_json(hh_server.url + "/employers/1") == {"id": "1"}
+        assert client.get_cached_json(hh_server.url + "/employers/2") is None
+        assert (client.cache.stats.hits, client.cache.stats.misses) == (2, 1)
+    assert len(hh_server.requests) == 1
+
+
+def test_params_order_does_not_change_key():
+    assert ResponseCache.key("u", {"b": 2, "a": 1}) == ResponseCache.key("u", {"a": 1, "b": 2}) == "u?a=1&b=2"
+
+
+def test_stale_response_is_revalidated_with_etag(hh_server, tmp_path):
+    def handler(path, query):
+        if hh_server.requests[-1][2].get("If-None-Match") == '"v1"':
+            return 304, {}, None
+        return 200, {"ETag": '"v1"'}, {"items": [1]}
+
+    hh_server.handler = handler
+    with _client(tmp_path, ttls=[(".*", 0)]) as client:
+        url = hh_server.url + "/vacancies"
+        assert client.get_json(url, {"employer_id": 1}) == {"items": [1]}
+        assert client.get_json(url, {"employer_id": 1}) == {"items": [1]}
+        assert client.cache.stats.revalidated == 1
+    assert "If-None-Match" not in hh_server.requests[0][2]
+
+
+def test_revalidate_checks_fresh_response_on_server(hh_server, tmp_path):
+    hh_server.handler = lambda path, query: (200, {"ETag": f'"v{len(hh_server.requests)}"'},
+                                             {"version": len(hh_server.requests)})
+    with _client(tmp_path) as client:
+        url = hh_server.url + "/vacancies"
+        assert client.get_json(url) == {"version": 1}
+        assert client.get_json(url, revalidate=True) == {"version": 2}
+        assert client.get_json(url) == {"version": 2}
+    assert hh_server.requests[1][2].get("If-None-Match") == '"v1"'
+    assert len(hh_server.requests) == 2
+
+
+def test_offline_mode_uses_only_cache(hh_server, tmp_path):
+    hh_server.handler = lambda path, query: (200, {}, {"ok": True})
+    with _client(tmp_path, ttls=[(".*", 0)]) as client:
+        client.get_json(hh_server.url + "/employers", {"text": "Сбер"})
+
+    with _client(tmp_path, offline=True) as client:
+        assert client.get_json(hh_server.url + "/employers", {"text": "Сбер"}) == {"ok": True}
+        with pytest.raises(OfflineCacheMiss):
+            client.get_json(hh_server.url + "/employers", {"text": "ВТБ"})
+        assert (client.cache.stats.stale_hits, client.cache.stats.misses) == (1, 1)
+    assert len(hh_server.requests) == 1
+
+
+def test_errors_are_not_cached(hh_server, tmp_path):
+    hh_server.handler = lambda path, query: (404, {}, {})
+    with _client(tmp_path) as client:
+        with pytest.raises(Exception):
+            client.get_json(hh_server.url + "/employers/1")
+        assert len(client.cache) == 0
+
+
+def test_lru_eviction_keeps_cache_under_limit(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=25)
+    for key in "abc":
+        cache.put(key, "https://api.hh.ru/employers/1", b"x" * 10)
+        if key == "b":
+            cache.get("a")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size() == 20
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_depends_on_endpoint(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    assert cache.ttl("https://api.hh.ru/employers/1740") == 7 * 24 * 3600
+    assert cache.ttl("https://api.hh.ru/employers") == 24 * 3600
+    assert cache.ttl("https://api.hh.ru/vacancies") == 15 * 60
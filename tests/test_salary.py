@@ -0,0 +1,53 @@
+import math
+import sqlite3
+
+import pytest
+
+from src.bd_sql.salary import SALARY_MID_SQL, SALARY_RUB_SQL, fetch_salary_stats, salary_threshold_column
+from src.models import Vacancy, VacancyBatch
+
+
+class FakeCursor:
+    def __init__(self, row):
+        self.row = row
+
+    def execute(self, query, params=None):
+        self.query = query
+
+    def fetchone(self):
+        return self.row
+
+
+def test_salary_threshold_column():
+    assert salary_threshold_column("avg") == "avg_salary"
+    assert salary_threshold_column("p90") == "p90"
+    with pytest.raises(ValueError):
+        salary_threshold_column("p99; DROP TABLE vacancies")
+
+
+def test_fetch_salary_stats():
+    stats = fetch_salary_stats(FakeCursor((3, 123456.789, 100000, 150000, 200000, None)))
+    assert stats["avg"] == 123456.79
+    assert stats["p75"] == 150000.0
+    assert fetch_salary_stats(FakeCursor((0, None, None, None, None, None))) is None
+
+
+def test_salary_rub_sql_uses_vacancy_rates():
+    assert SALARY_RUB_SQL.startswith("salary_mid * CASE UPPER(currency)")
+    assert "WHEN 'USD' THEN 90.0" in SALARY_RUB_SQL
+    assert SALARY_RUB_SQL.endswith("ELSE 1 END")
+
+
+@pytest.mark.parametrize("salary_from, salary_to", [
+    (100000, 200000), (100000, None), (None, 150000), (0, 150000), (100000, 0), (0, 0), (0, None), (None, None),
+])
+def test_salary_mid_sql_matches_vacancy_and_batch(salary_from, salary_to):
+    # Выражение переносимое (CASE / NULLIF / COALESCE), поэтому проверяется в SQLite
+    with sqlite3.connect(":memory:") as conn:
+        sql_mid = conn.execute(f"SELECT {SALARY_MID_SQL} FROM (SELECT ? AS salary_from, ? AS salary_to)",
+                               (salary_from, salary_to)).fetchone()[0]
+    vacancy = Vacancy("Dev", "l", {"from": salary_from, "to": salary_to, "currency": "RUR"}, "", "")
+    batch_mid = VacancyBatch.from_vacancies([vacancy]).salary_mid[0]
+
+    assert sql_mid == vacancy.salary_mid
+    assert (math.isnan(batch_mid) and sql_mid is None) or batch_mid == sql_mid
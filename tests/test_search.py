@@ -0,0 +1,57 @@
+import pytest
+
+from src.bd_sql.search import search_clause
+
+
+def test_fts_clause_uses_both_configurations():
+    where, rank, params = search_clause("python", "fts")
+    assert "search_vector @@" in where
+    assert "'russian'" in where and "'english'" in where
+    assert rank.startswith("ts_rank_cd")
+    assert params == ["python"] * 4
+
+
+def test_substring_clause_escapes_like_wildcards():
+    where, rank, params = search_clause("100%_done", "substring")
+    assert "ILIKE" in where
+    assert params[0] == "%100\\%\\_done%"
+    assert params[1] == "100%_done"
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        search_clause("python", "regex")
+
+
+def test_keyword_search_keeps_one_mode_across_pages(mocker):
+    from src.bd_sql.db import DatabaseVacancyStorage
+
+    db = object.__new__(DatabaseVacancyStorage)
+    mode_check = mocker.patch.object(db, "keyword_search_mode", return_value="fts")
+    search = mocker.patch.object(db, "search_vacancies", return_value=[])
+
+    # Страница после последней полнотекстовой пуста, а не подменяется поиском по подстроке
+    assert db.get_vacancies_with_keyword("python", limit=20, offset=40) == []
+    db.get_vacancies_with_keyword("python", limit=20, offset=60, mode="fts")
+
+    assert mode_check.call_count == 1
+    assert [call.args[1] for call in search.call_args_list] == ["fts", "fts"]
+
+
+def test_db_manager_keyword_search_falls_back_to_substring(mocker):
+    from src.bd_sql.db_manager import DBManager
+
+    cursor = mocker.MagicMock()
+    cursor.fetchone.return_value = (False,)  # полнотекстовых совпадений нет
+    cursor.fetchall.return_value = []
+    cursor.__enter__.return_value = cursor
+    manager = object.__new__(DBManager)
+    conn = mocker.patch.object(manager, "_get_connection").return_value.__enter__.return_value
+    conn.cursor.return_value = cursor
+
+    assert manager.get_vacancies_with_keyword("pyth") == []
+    manager.get_vacancies_with_keyword("pyth", mode="fts")
+
+    queries = [call.args[0] for call in cursor.execute.call_args_list]
+    assert "SELECT EXISTS" in queries[0] and "ILIKE" in queries[1]
+    assert len(queries) == 3 and "search_vector @@" in queries[2]
@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+
+from src.bd_sql.streaming import keyset_page, stream_rows
+
+
+class FakeCursor:
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+        self.itersize = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.log.append((query, params))
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.rows = rows
+        self.log = []
+        self.cursor_names = []
+
+    @contextmanager
+    def connection(self):
+        pool = self
+
+        class Conn:
+            def cursor(self, name=None):
+                pool.cursor_names.append(name)
+                pool.last_cursor = FakeCursor(pool.rows, pool.log)
+                return pool.last_cursor
+        yield Conn()
+
+
+def test_stream_rows_uses_named_cursor_lazily():
+    pool = FakePool([(1,), (2,), (3,)])
+    rows = stream_rows(pool, "SELECT 1", itersize=2)
+    assert pool.log == []  # до первого next() запрос не выполняется
+
+    assert next(rows) == (1,)
+    assert pool.cursor_names[0].startswith("stream_")
+    assert pool.last_cursor.itersize == 2
+    assert list(rows) == [(2,), (3,)]
+
+
+def test_keyset_page_returns_next_key_for_full_page():
+    pool = FakePool([("a", "2024-01-02", 5), ("b", "2024-01-01", 4)])
+    rows, next_key = keyset_page(pool, "v.title", limit=2)
+    assert rows == [("a",), ("b",)]
+    assert next_key == ("2024-01-01", 4)
+    assert pool.log[0][1] == (2,)
+
+    keyset_page(pool, "v.title", limit=2, after=next_key)
+    query, params = pool.log[1]
+    assert "(v.created_at, v.id) < (%s, %s)" in query
+    assert params == ("2024-01-01", 4, 2)
+
+
+def test_keyset_page_last_page_has_no_next_key():
+    pool = FakePool([("a", "2024-01-02", 5)])
+    _, next_key = keyset_page(pool, "v.title", limit=2)
+    assert next_key is None
@@ -48,3 +48,13 @@ def test_txt_delete_vacancy(tmp_path):
     storage.add_vacancy(v)
     storage.delete_vacancy({"title": "Dev"})
     assert storage.get_vacancies({}) == []
+
+
+def test_txt_reads_legacy_lines_and_stores_search_text(tmp_path):
+    file_path = tmp_path / "vac.txt"
+    file_path.write_text("Old\turl\t\tDesc Ёж\treq\n", encoding="utf-8")
+    storage = TXTVacancyStorage(str(file_path))
+    storage.add_vacancy(Vacancy("New", "url", None, "ЁЖИК", "req"))
+
+    assert file_path.read_text(encoding="utf-8").splitlines()[1].endswith("\tnew | ежик | req")
+    assert [v.title for v in storage.get_vacancies({"keyword": "ЕЖ"})] == ["Old", "New"]
@@ -53,12 +53,43 @@ def test_vacancy_comparison_operators():
     v2 = Vacancy("B", "link", {"from": 100000}, "desc", "req")
     v3 = Vacancy("C", "link", {"from": 150000}, "desc", "req")
 
-    assert v1 == v2
+    # Одинаковая зарплата — равный ранг при сортировке, но не равные вакансии
+    assert v1 != v2
+    assert not v1 < v2 and not v2 < v1
     assert v1 <= v2
     assert v1 >= v2
     assert v3 > v1
     assert v1 < v3
 
+
+def test_vacancy_identity_equality_and_hash():
+    v1 = Vacancy("A", "link", None, "desc", "req")
+    v2 = Vacancy("B", "link", None, "desc", "req")
+    vacancies = [v1, v2]
+    vacancies.remove(v2)
+    assert vacancies == [v1]
+    assert vacancies.index(v1) == 0
+    assert v2 not in vacancies
+    assert len({v1, v2}) == 2
+    assert {v1: "a"}[v1] == "a"
+
+
+def test_vacancy_ordering_uses_salary_in_rubles():
+    rub = Vacancy("RUB", "link", {"from": 150, "currency": "RUR"}, "desc", "req")
+    usd = Vacancy("USD", "link", {"from": 150, "currency": "USD"}, "desc", "req")
+    none = Vacancy("None", "link", None, "desc", "req")
+    assert rub < usd
+    assert [v.title for v in sorted([usd, none, rub])] == ["None", "RUB", "USD"]
+
+
+def test_vacancy_keeps_extra_salary_keys():
+    salary = {"from": 100000, "to": None, "currency": "RUR", "gross": True}
+    v = Vacancy("Dev", "link", salary, "desc", "req")
+    assert v.salary == salary
+    assert Vacancy.validate_and_create(v.to_dict()).salary == salary
+    v.salary = {"from": 1}
+    assert v.salary == {"from": 1, "to": None, "currency": None}
+
 def test_vacancy_to_dict_fields():
     v = Vacancy("X", "link", {"from": 100000, "to": 150000}, "desc", "req")
     d = v.to_dict()
@@ -69,3 +100,43 @@ def test_vacancy_ge_operator():
     v1 = Vacancy("A", "link", {"from": 100000}, "desc", "req")
     v2 = Vacancy("B", "link", {"from": 90000}, "desc", "req")
     assert v1 >= v2
+
+
+def test_vacancy_from_row_and_flat_salary():
+    v = Vacancy.from_row(("Dev", "link", 100000, 200000, "RUR", "desc", "req", "42"))
+    assert v.salary_mid == 150000
+    assert v.salary == {"from": 100000, "to": 200000, "currency": "RUR"}
+    assert v.hh_id == "42"
+    assert v.employer_hh_id is None
+    assert not hasattr(v, "__dict__")
+
+
+def test_vacancy_salary_setter_updates_mid():
+    v = Vacancy("Dev", "link", None, "desc", "req")
+    assert v.salary is None
+    v.salary = {"from": "90000", "currency": "RUR"}
+    assert (v.salary_from, v.salary_to, v.salary_mid) == (90000, None, 90000)
+
+
+def test_vacancy_search_text_normalized():
+    v = Vacancy("Senior <highlighttext>Python</highlighttext>", "link", None, "Опыт с Ёлкой", "Straße")
+    assert v.search_text == "senior python | опыт с елкой | strasse"
+    assert Vacancy("Dev", "link", None, "desc", "req", search_text="stored").search_text == "stored"
+
+
+@pytest.mark.parametrize("factory, name", [
+    ("JSONVacancyStorage", "v.json"),
+    ("JSONLVacancyStorage", "v.jsonl"),
+    ("CSVVacancyStorage", "v.csv"),
+    ("TXTVacancyStorage", "v.txt"),
+    ("ExcelVacancyStorage", "v.xlsx"),
+])
+def test_gross_survives_storage_round_trip(tmp_path, factory, name):
+    import src.storage as storages
+
+    storage = getattr(storages, factory)(str(tmp_path / name))
+    storage.add_vacancy(Vacancy("Dev", "link", {"from": 1000, "currency": "USD", "gross": False}, "d", "r",
+                                hh_id="1"))
+    if hasattr(storage, "flush"):
+        storage.flush()
+    assert storage.get_vacancies({})[0].salary["gross"] is False